@@ -0,0 +1,5 @@
+from pandas import set_option
+
+# Copy-on-write, the default from pandas 3: selections such as the projections of rename_and_select_columns share the
+# input's buffers until either frame is modified, instead of copying every column
+set_option("mode.copy_on_write", True)
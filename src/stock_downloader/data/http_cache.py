@@ -0,0 +1,150 @@
+from pandas import DataFrame, read_parquet
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path, PosixPath, WindowsPath
+from typing import Callable
+import hashlib
+import json
+
+from stock_downloader.data.http_session import PooledSession
+
+
+@dataclass
+class CachedResponse:
+    content: bytes
+    content_hash: str
+    from_cache: bool
+
+
+class HttpCache:
+    """
+    On-disk cache of raw HTTP response bodies. Bodies are served from disk while younger than the TTL and
+    revalidated with If-None-Match/If-Modified-Since afterwards. Parsed DataFrames are stored alongside and
+    reused for as long as both the content hash they were parsed from and the parser that produced them are unchanged.
+    """
+
+    NOT_MODIFIED: int = 304
+
+    def __init__(self, path: str | PosixPath | WindowsPath, session: PooledSession, ttl_hours: float = 24) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.session = session
+        self.ttl = timedelta(hours=ttl_hours)
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha1(url.encode()).hexdigest()
+
+    def _body_file(self, url: str) -> Path:
+        return self.path / f"{self._key(url)}.body"
+
+    def _meta_file(self, url: str) -> Path:
+        return self.path / f"{self._key(url)}.json"
+
+    def _parsed_file(self, url: str, name: str) -> Path:
+        return self.path / f"{self._key(url)}.{name}.parquet"
+
+    def _load_meta(self, url: str) -> dict | None:
+        if not (self._meta_file(url).exists() and self._body_file(url).exists()):
+            return None
+        with self._meta_file(url).open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_meta(self, url: str, meta: dict) -> None:
+        with self._meta_file(url).open("w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def get(self, url: str, headers: dict = None) -> CachedResponse:
+        """Return the body for a URL, from disk when it is fresh or the server reports it unchanged."""
+        now = datetime.now(timezone.utc)
+        meta = self._load_meta(url)
+        if meta is not None and now - datetime.fromisoformat(meta["fetched_at"]) < self.ttl:
+            return CachedResponse(content=self._body_file(url).read_bytes(), content_hash=meta["content_hash"], from_cache=True)
+
+        request_headers = dict(headers or {})
+        if meta is not None:
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self.session.get(url, headers=request_headers)
+        if meta is not None and response.status_code == self.NOT_MODIFIED:
+            meta["fetched_at"] = now.isoformat()
+            self._save_meta(url, meta)
+            return CachedResponse(content=self._body_file(url).read_bytes(), content_hash=meta["content_hash"], from_cache=True)
+        response.raise_for_status()
+
+        content = response.content
+        content_hash = hashlib.sha256(content).hexdigest()
+        self._body_file(url).write_bytes(content)
+        self._save_meta(
+            url,
+            {
+                "url": url,
+                "fetched_at": now.isoformat(),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_hash": content_hash,
+            },
+        )
+        return CachedResponse(content=content, content_hash=content_hash, from_cache=False)
+
+    def load_parsed(self, url: str, content_hash: str, name: str = "data", parser: str = None) -> DataFrame | None:
+        """Return the DataFrame previously parsed from this exact content by the same parser, if there is one."""
+        meta = self._load_meta(url)
+        parsed_file = self._parsed_file(url, name)
+        if meta is None or meta.get("parsed", {}).get(name) != {"content_hash": content_hash, "parser": parser}:
+            return None
+        if not parsed_file.exists():
+            return None
+        return read_parquet(parsed_file)
+
+    def save_parsed(self, url: str, content_hash: str, df: DataFrame, name: str = "data", parser: str = None) -> None:
+        try:
+            df.to_parquet(self._parsed_file(url, name))
+        except Exception as e:
+            print(f"Unable to cache parsed table {name} for {url}: {e}")
+            return
+        meta = self._load_meta(url)
+        meta.setdefault("parsed", {})[name] = {"content_hash": content_hash, "parser": parser}
+        self._save_meta(url, meta)
+
+
+def parser_name(parse: Callable, version: int = 1) -> str:
+    """Name a parse function and its version; bump the version when the parsing code changes."""
+    return f"{parse.__module__}.{parse.__qualname__}@{version}"
+
+
+def fetch_and_parse(
+    url: str,
+    parse: Callable[[bytes], DataFrame],
+    session: PooledSession,
+    cache: HttpCache = None,
+    name: str = "data",
+    headers: dict = None,
+    version: int = 1,
+) -> DataFrame:
+    """
+    Download a URL and parse it, skipping both steps when the cache already holds the result of the same parser and
+    version (see parser_name).
+    """
+    if cache is None:
+        response = session.get(url, headers=headers)
+        response.raise_for_status()
+        return parse(response.content)
+
+    response = cache.get(url, headers=headers)
+    parser = parser_name(parse, version=version)
+    df = cache.load_parsed(url, response.content_hash, name=name, parser=parser)
+    if df is None:
+        df = parse(response.content)
+        cache.save_parsed(url, response.content_hash, df, name=name, parser=parser)
+    return df
+
+
+def load_http_cache(config: dict, session: PooledSession) -> HttpCache | None:
+    """Build the HTTP cache from the [http_cache] config section, or None if it is disabled."""
+    cache_config = config.get("http_cache", {})
+    if not cache_config.get("enabled", False):
+        return None
+    return HttpCache(path=cache_config.get("cache_folder"), session=session, ttl_hours=cache_config.get("ttl_hours", 24))
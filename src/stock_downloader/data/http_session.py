@@ -0,0 +1,82 @@
+from curl_cffi import requests, CurlInfo, CurlOpt
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import BoundedSemaphore, Lock
+from typing import Iterator
+from urllib.parse import urlsplit
+
+from stock_downloader.data.loaders import load_config
+
+
+@dataclass
+class HostMetrics:
+    requests: int = 0
+    new_connections: int = 0
+
+    @property
+    def reused_connections(self) -> int:
+        return self.requests - min(self.new_connections, self.requests)
+
+
+class PooledSession(requests.Session):
+    """
+    curl_cffi session shared by every downloader. Connections are kept alive and pooled up to max_connections,
+    concurrent requests are capped per host, and each response records whether it reused a connection.
+    """
+
+    def __init__(self, max_connections: int = 10, per_host_limit: int = 4, **kwargs) -> None:
+        super().__init__(curl_options={CurlOpt.MAXCONNECTS: max_connections}, curl_infos=[CurlInfo.NUM_CONNECTS], **kwargs)
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.metrics: dict[str, HostMetrics] = {}
+        self._host_limits: dict[str, BoundedSemaphore] = {}
+        self._lock = Lock()
+
+    @contextmanager
+    def _host_slot(self, host: str) -> Iterator[None]:
+        with self._lock:
+            limit = self._host_limits.setdefault(host, BoundedSemaphore(self.per_host_limit))
+        with limit:
+            yield
+
+    def request(self, method, url: str, *args, **kwargs):
+        host = urlsplit(url).netloc
+        with self._host_slot(host):
+            response = super().request(method, url, *args, **kwargs)
+        # NUM_CONNECTS is the number of new connections the transfer had to open; 0 means a pooled one was reused
+        new_connections = response.infos.get(CurlInfo.NUM_CONNECTS, 1)
+        with self._lock:
+            metrics = self.metrics.setdefault(host, HostMetrics())
+            metrics.requests += 1
+            metrics.new_connections += new_connections
+        return response
+
+    def metrics_summary(self) -> dict:
+        with self._lock:
+            return {
+                host: {
+                    "requests": m.requests,
+                    "new_connections": m.new_connections,
+                    "reused_connections": m.reused_connections,
+                }
+                for host, m in self.metrics.items()
+            }
+
+
+_session: PooledSession = None
+_session_lock = Lock()
+
+
+def get_session(config: dict = None) -> PooledSession:
+    """Return the process-wide session, creating it from the [http] config section on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            http_config = (config or load_config()).get("http", {})
+            _session = PooledSession(
+                max_connections=http_config.get("max_connections", 10),
+                per_host_limit=http_config.get("per_host_limit", 4),
+                impersonate=http_config.get("impersonate", "chrome"),
+                timeout=http_config.get("timeout", 30),
+            )
+        return _session
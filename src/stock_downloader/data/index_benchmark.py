@@ -0,0 +1,81 @@
+from dataclasses import dataclass, field
+from io import BytesIO
+from pandas import read_html
+from statistics import median
+from time import perf_counter, sleep
+
+from stock_downloader.data.index_symbols import GetIndexSymbols, extract_table
+
+
+def synthetic_page(tables: int = 20, rows: int = 250, target: int = 10) -> bytes:
+    """An index page of filler tables with the constituents table (Symbol, Company Name) at position target."""
+    parts = ["<html><body>"]
+    for t in range(tables):
+        if t == target:
+            body = "".join(f"<tr><td>S{i:03d}</td><td>Company {i}</td><td>Sector {i % 11}</td></tr>" for i in range(rows))
+            parts.append(f'<table id="constituents"><tr><th>Symbol</th><th>Company Name</th><th>Sector</th></tr>{body}</table>')
+        else:
+            body = "".join(f"<tr><td>{t}-{i}</td><td>{'filler text ' * 8}</td><td>{i * 1.5}</td></tr>" for i in range(rows))
+            parts.append(f"<table><tr><th>Key</th><th>Text</th><th>Value</th></tr>{body}</table>")
+    parts.append("</body></html>")
+    return "".join(parts).encode()
+
+
+@dataclass
+class FixtureResponse:
+    content: bytes
+    status_code: int = 200
+    headers: dict = field(default_factory=dict)
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class FixtureSession:
+    """Serves one local page for every URL after a fixed delay that stands in for server latency."""
+
+    def __init__(self, content: bytes, latency: float = 0.3) -> None:
+        self.content = content
+        self.latency = latency
+
+    def get(self, url: str, headers: dict = None) -> FixtureResponse:
+        sleep(self.latency)
+        return FixtureResponse(content=self.content)
+
+
+def parse_latency(content: bytes, repeats: int = 5) -> dict:
+    """Median seconds to extract the constituents table alone versus parsing every table on the page with read_html."""
+    extract, full = [], []
+    for _ in range(repeats):
+        began = perf_counter()
+        extract_table(content, selector={"id": "constituents"})
+        extract.append(perf_counter() - began)
+        began = perf_counter()
+        read_html(BytesIO(content))
+        full.append(perf_counter() - began)
+    return {"extract_s": round(median(extract), 4), "read_html_s": round(median(full), 4)}
+
+
+def fetch_latency(content: bytes, latency: float = 0.3) -> dict:
+    """Seconds to load the three index pages concurrently, as GetIndexSymbols does, and one after another."""
+    began = perf_counter()
+    index_symbols = GetIndexSymbols(session=FixtureSession(content=content, latency=latency))
+    concurrent = perf_counter() - began
+    began = perf_counter()
+    for index in GetIndexSymbols.INDEX_LIST.values():
+        index_symbols.get_table(index["url"], index["table_index"], selector=index.get("selector"))
+    sequential = perf_counter() - began
+    return {"concurrent_s": round(concurrent, 3), "sequential_s": round(sequential, 3)}
+
+
+def run_benchmark(tables: int = 20, rows: int = 250, latency: float = 0.3, repeats: int = 5) -> dict:
+    """Parse and fetch timings of GetIndexSymbols on a local fixture page, without the network."""
+    content = synthetic_page(tables=tables, rows=rows)
+    return {"page_mb": round(len(content) / 1e6, 2), **parse_latency(content, repeats=repeats), **fetch_latency(content, latency=latency)}
+
+
+if __name__ == "__main__":
+    results = run_benchmark()
+    print(f"page: {results['page_mb']} MB")
+    print(f"parse: constituents table {results['extract_s']} s, read_html over the page {results['read_html_s']} s")
+    print(f"fetch: three pages concurrently {results['concurrent_s']} s, sequentially {results['sequential_s']} s")
@@ -1,5 +1,12 @@
 from pandas import read_html, DataFrame
 from pathlib import Path, PosixPath, WindowsPath
+from io import BytesIO, StringIO
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+import json
+import zlib
+from stock_downloader.data.http_session import PooledSession, get_session
+from stock_downloader.data.http_cache import HttpCache, fetch_and_parse
 
 
 class GetIndexSymbols:
@@ -18,22 +25,44 @@ class GetIndexSymbols:
         "nasdaq100": {"Symbol": "symbol", "Company Name": "company_name", "No.": "number", "% Change": "_%_Change"},
     }
 
+    # Bump when the table parsing (get_table, extract_table) changes, so cached parsed tables are not reused
+    PARSER_VERSION = 1
+
+    # Tables are selected by id, caption or a text match; table_index is only used if the selector finds nothing
     INDEX_LIST = {
-        "sp500": {"url": "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies", "table_index": 0},
-        "dowjones": {"url": "https://en.wikipedia.org/wiki/Dow_Jones_Industrial_Average", "table_index": 1},
-        "nasdaq100": {"url": "https://stockanalysis.com/list/nasdaq-100-stocks/", "table_index": 0},
+        "sp500": {
+            "url": "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies",
+            "selector": {"id": "constituents"},
+            "table_index": 0,
+        },
+        "dowjones": {
+            "url": "https://en.wikipedia.org/wiki/Dow_Jones_Industrial_Average",
+            "selector": {"id": "constituents"},
+            "table_index": 1,
+        },
+        "nasdaq100": {
+            "url": "https://stockanalysis.com/list/nasdaq-100-stocks/",
+            "selector": {"match": "Company Name"},
+            "table_index": 0,
+        },
     }
 
-    def __init__(self):
-        self.sp500_df = self.get_table(self.INDEX_LIST["sp500"]["url"], self.INDEX_LIST["sp500"]["table_index"]).rename(
-            columns=self.COLUMN_RENAME.get("sp500")
-        )
-        self.dowjones_df = self.get_table(self.INDEX_LIST["dowjones"]["url"], self.INDEX_LIST["dowjones"]["table_index"]).rename(
-            columns=self.COLUMN_RENAME.get("dowjones")
-        )
-        self.nasdaq100_df = self.get_table(self.INDEX_LIST["nasdaq100"]["url"], self.INDEX_LIST["nasdaq100"]["table_index"]).rename(
-            columns=self.COLUMN_RENAME.get("nasdaq100")
-        )
+    def __init__(self, session: PooledSession = None, cache: HttpCache = None):
+        self.session = session or get_session()
+        self.cache = cache
+        with ThreadPoolExecutor(max_workers=len(self.INDEX_LIST)) as executor:
+            tables = dict(
+                zip(
+                    self.INDEX_LIST,
+                    executor.map(
+                        lambda index: self.get_table(index["url"], index["table_index"], selector=index.get("selector")),
+                        self.INDEX_LIST.values(),
+                    ),
+                )
+            )
+        self.sp500_df = tables["sp500"].rename(columns=self.COLUMN_RENAME.get("sp500"))
+        self.dowjones_df = tables["dowjones"].rename(columns=self.COLUMN_RENAME.get("dowjones"))
+        self.nasdaq100_df = tables["nasdaq100"].rename(columns=self.COLUMN_RENAME.get("nasdaq100"))
         self.df = self.merge_tables()
 
     def merge_tables(self) -> DataFrame:
@@ -56,15 +85,59 @@ class GetIndexSymbols:
         self.dowjones_df.to_parquet(Path(path) / "dowjones.parquet")
         self.nasdaq100_df.to_parquet(Path(path) / "nasdaq100.parquet")
 
-    def get_table(self, url: str, table: int) -> DataFrame:
+    def get_table(self, url: str, table: int, selector: dict = None) -> DataFrame:
         """
-        Fetch the first table from the Wikipedia page and return it as a DataFrame.
+        Fetch a table from a web page and return it as a DataFrame.
         """
-        try:
-            tables = read_html(url, storage_options=self.HTTP_HEADERS)  # Extract all tables
+
+        def parse(content: bytes) -> DataFrame:
+            if selector:
+                df = extract_table(content, selector=selector)
+                if df is not None:
+                    return df
+            tables = read_html(BytesIO(content))  # Extract all tables
             if not tables:
                 raise ValueError("No tables found on the page.")
-            return tables[table]  # First table
+            return tables[table]
+
+        name = f"table_{table}" if not selector else f"table_{zlib.crc32(json.dumps(selector, sort_keys=True).encode()):08x}"
+        try:
+            return fetch_and_parse(
+                url=url,
+                parse=parse,
+                session=self.session,
+                cache=self.cache,
+                name=name,
+                headers=self.HTTP_HEADERS,
+                version=self.PARSER_VERSION,
+            )
         except Exception as e:
             print(f"Error fetching table: {e}")
             return DataFrame()  # Return empty DataFrame on error
+
+
+def _table_matches(element: etree._Element, selector: dict) -> bool:
+    if "id" in selector and element.get("id") != selector["id"]:
+        return False
+    if "caption" in selector:
+        caption = element.find("caption")
+        if caption is None or selector["caption"] not in "".join(caption.itertext()):
+            return False
+    if "match" in selector and selector["match"] not in "".join(element.itertext()):
+        return False
+    return True
+
+
+def extract_table(content: bytes, selector: dict) -> DataFrame | None:
+    """
+    Stream an HTML page through lxml and parse only the first <table> matching the selector, which may give
+    an id, caption text and/or a text match. Tables are cleared once checked, so at most one is held in full.
+    Returns None if no table matches.
+    """
+    for _, element in etree.iterparse(BytesIO(content), events=("end",), tag="table", html=True, recover=True):
+        if _table_matches(element, selector):
+            return read_html(StringIO(etree.tostring(element, encoding="unicode", method="html")))[0]
+        # Free each table that did not match; nested tables are kept until their outer table has been checked
+        if next(element.iterancestors("table"), None) is None:
+            element.clear()
+    return None
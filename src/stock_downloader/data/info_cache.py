@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path, PosixPath, WindowsPath
+import json
+
+from stock_downloader.data.loaders import load_mappings
+from stock_downloader.data.providers import provider_name
+
+
+class TickerInfoCache:
+    """On-disk cache of ticker info records, keyed by symbol, with per-field-group TTLs."""
+
+    FILE_SUFFIX: str = "json"
+    DEFAULT_GROUP: str = "other"
+    # Unlisted fields include quote fields such as currentPrice and volume, so their group expires within a day
+    DEFAULT_TTL_DAYS: float = 0.5
+
+    def __init__(
+        self,
+        path: str | PosixPath | WindowsPath,
+        ttl_days: dict,
+        field_groups: dict,
+    ) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.ttl = {group: timedelta(days=days) for group, days in {self.DEFAULT_GROUP: self.DEFAULT_TTL_DAYS, **ttl_days}.items()}
+        self.field_to_group = {field: group for group, values in field_groups.items() for field in values.get("fields", [])}
+
+    def _cache_file(self, symbol: str) -> Path:
+        return self.path / f"{symbol.upper()}.{self.FILE_SUFFIX}"
+
+    def _groups(self, records: list) -> set:
+        return {self.field_to_group.get(field, self.DEFAULT_GROUP) for record in records for field in record.keys()}
+
+    def stale_groups(self, entry: dict, now: datetime = None) -> list:
+        """Return the field groups of a cache entry whose TTL has expired. An entry without records is always stale."""
+        if not entry["records"]:
+            return [self.DEFAULT_GROUP]
+        now = now or datetime.now(timezone.utc)
+        age = now - datetime.fromisoformat(entry["fetched_at"])
+        return sorted(group for group in self._groups(entry["records"]) if group in self.ttl and age > self.ttl[group])
+
+    def get(self, symbol: str) -> list | None:
+        """Return the cached records for a symbol, or None if missing, unreadable or stale."""
+        cache_file = self._cache_file(symbol)
+        if not cache_file.exists():
+            return None
+        try:
+            with cache_file.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Unable to read cached info for {symbol}: {e}")
+            return None
+        if self.stale_groups(entry):
+            return None
+        return entry["records"]
+
+    def put(self, symbol: str, records: list) -> None:
+        entry = {"symbol": symbol, "fetched_at": datetime.now(timezone.utc).isoformat(), "records": records}
+        temp_file = self._cache_file(symbol).with_suffix(".tmp")
+        with temp_file.open("w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        temp_file.replace(self._cache_file(symbol))
+
+
+def load_info_cache(config: dict) -> TickerInfoCache | None:
+    """
+    Build the ticker info cache from the [info_cache] config section, or None if it is disabled. Each provider has its own
+    folder, so records replayed or generated offline are never served to a yfinance run.
+    """
+    cache_config = config.get("info_cache", {})
+    if not cache_config.get("enabled", False):
+        return None
+    return TickerInfoCache(
+        path=Path(cache_config.get("cache_folder")) / provider_name(config),
+        ttl_days=cache_config.get("ttl_days", {}),
+        field_groups=load_mappings(name="info_field_groups"),
+    )
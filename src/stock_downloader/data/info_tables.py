@@ -0,0 +1,165 @@
+from pandas import DataFrame, isna
+import numpy as np
+import pyarrow as pa
+
+from stock_downloader.utilities import camel_to_snake
+
+# Info tables split by split_info_tables, keyed by table name
+INFO_TABLES: list = ["equity_info", "etf_info"]
+
+# Nested list columns, each moved to a <table>__<column> child table with one row per element
+CHILD_COLUMNS: list = ["company_officers", "executive_team", "corporate_actions"]
+
+# Long free text, moved to a <table>__text side table
+TEXT_COLUMNS: list = ["long_business_summary"]
+
+# Low-cardinality strings, held as categoricals
+CATEGORY_COLUMNS: list = [
+    "sector",
+    "sector_key",
+    "sector_disp",
+    "industry",
+    "industry_key",
+    "industry_disp",
+    "category",
+    "fund_family",
+    "legal_type",
+    "exchange",
+    "full_exchange_name",
+    "exchange_timezone_name",
+    "exchange_timezone_short_name",
+    "market",
+    "market_state",
+    "currency",
+    "financial_currency",
+    "quote_type",
+    "type_disp",
+    "country",
+    "region",
+    "language",
+    "recommendation_key",
+]
+
+# Columns most queries read, also kept in a narrow <table>__core table
+CORE_COLUMNS: list = [
+    "sector",
+    "industry",
+    "category",
+    "exchange",
+    "currency",
+    "quote_type",
+    "market_cap",
+    "enterprise_value",
+    "total_assets",
+    "net_assets",
+    "regular_market_price",
+    "previous_close",
+    "volume",
+    "average_volume",
+    "trailing_pe",
+    "forward_pe",
+    "price_to_book",
+    "beta",
+    "dividend_yield",
+    "fifty_two_week_low",
+    "fifty_two_week_high",
+    "fifty_day_average",
+    "two_hundred_day_average",
+    "ytd_return",
+    "net_expense_ratio",
+]
+
+
+# Quote fields that move with the market every day; info history leaves them out so versions only track real changes
+QUOTE_PREFIXES: tuple = (
+    "regular_market_",
+    "post_market_",
+    "pre_market_",
+    "fifty_two_week_",
+    "fifty_day_average",
+    "two_hundred_day_average",
+    "average_volume",
+    "average_daily_volume",
+    "day_",
+    "bid",
+    "ask",
+)
+QUOTE_COLUMNS: list = [
+    "previous_close",
+    "open",
+    "volume",
+    "current_price",
+    "market_cap",
+    "enterprise_value",
+    "market_state",
+    "trailing_pe",
+    "forward_pe",
+    "price_to_book",
+    "price_to_sales_trailing12_months",
+    "price_eps_current_year",
+    "trailing_peg_ratio",
+    "enterprise_to_revenue",
+    "enterprise_to_ebitda",
+    "dividend_yield",
+    "trailing_annual_dividend_yield",
+    "52_week_change",
+    "sand_p52_week_change",
+    "ytd_return",
+    "nav_price",
+    "yield",
+    "total_assets",
+    "net_assets",
+]
+
+
+def is_quote_column(column: str) -> bool:
+    return column in QUOTE_COLUMNS or column.startswith(QUOTE_PREFIXES)
+
+
+def child_table(df: DataFrame, column: str) -> DataFrame:
+    """
+    One row per element of a nested list column: the symbol, the element's position and its fields in snake case. Without
+    any element the frame still has typed symbol and position columns, so writing it clears the stored rows.
+    """
+    records = []
+    for symbol, values in zip(df["symbol"], df[column]):
+        if not isinstance(values, (list, tuple, np.ndarray)):
+            continue
+        for position, value in enumerate(values):
+            if isinstance(value, dict):
+                records.append({"symbol": symbol, "position": position, **{camel_to_snake(k): v for k, v in value.items()}})
+    if not records:
+        return DataFrame(columns=["symbol", "position"]).astype({"symbol": "string", "position": "int64"})
+    return DataFrame(records)
+
+
+def split_info(df: DataFrame, table: str) -> list:
+    """
+    Split an info frame into (table, schema, df) entries: the main table without the nested and long text columns
+    and with categorical low-cardinality strings, a child table per nested column, the text side table and the
+    narrow core table. Every part is a snapshot of the frame's symbols (see SNAPSHOT_TABLES), so each child table is
+    written even when it is empty, and elements, texts and symbols that disappeared are deleted.
+    """
+    categories = {col: "category" for col in CATEGORY_COLUMNS if col in df and str(df[col].dtype) != "category"}
+    df = df.astype(categories) if categories else df
+    tables = [(table, table, df.drop(columns=[col for col in CHILD_COLUMNS + TEXT_COLUMNS if col in df]))]
+    for column in CHILD_COLUMNS:
+        if column in df:
+            tables.append((f"{table}__{column}", None, child_table(df=df, column=column)))
+    text_columns = [col for col in TEXT_COLUMNS if col in df]
+    if text_columns:
+        text = df[["symbol"] + text_columns]
+        tables.append((f"{table}__text", None, text[~isna(text[text_columns]).all(axis=1)]))
+    tables.append((f"{table}__core", None, df[["symbol"] + [col for col in CORE_COLUMNS if col in df]]))
+    return tables
+
+
+def split_info_tables(tables: list) -> list:
+    """Replace the info tables among (table, schema, df) entries with their split tables; other entries pass through."""
+    split = []
+    for table, schema, df in tables:
+        if table not in INFO_TABLES:
+            split.append((table, schema, df))
+            continue
+        split.extend(split_info(df=df.to_pandas() if isinstance(df, pa.Table) else df, table=table))
+    return split
@@ -1,5 +1,8 @@
 from pandas import read_csv, DataFrame  # , #read_parquet,  to_datetime, concat
 from pathlib import Path  # , PosixPath, WindowsPath
+from io import BytesIO
+from stock_downloader.data.http_session import PooledSession, get_session
+from stock_downloader.data.http_cache import HttpCache, fetch_and_parse
 # import yfinance as yf
 # from yfinance.exceptions import YFRateLimitError
 # import json
@@ -12,20 +15,24 @@ class StockSymbolDownloader:
     VALID_TEST_ISSUE = ["N"]
     VALID_FINANCIAL_STATUS = ["N"]
     FILE_NAME = "nyse_other_listed_symbols.parquet"
+    # Bump when parse_data changes, so cached parsed frames are not reused
+    PARSER_VERSION = 1
 
-    def __init__(self):
+    def __init__(self, session: PooledSession = None, cache: HttpCache = None):
+        self.session = session or get_session()
+        self.cache = cache
         self.df = self.download_data()
 
     def __call__(self) -> DataFrame:
         return self.df
 
     def download_data(self) -> DataFrame:
-        df = read_csv(self.URL).dropna(subset=["Company Name", "ACT Symbol"], how="any", axis=0)
-        df = (
-            df.query("`Test Issue`.isin(@self.VALID_TEST_ISSUE)")
-            .query('~`ACT Symbol`.str.contains("\\\\.")', engine="python")
-            .query('~`ACT Symbol`.str.contains("\\\\$")', engine="python")
-        )
+        return fetch_and_parse(url=self.URL, parse=self.parse_data, session=self.session, cache=self.cache, version=self.PARSER_VERSION)
+
+    def parse_data(self, content: bytes) -> DataFrame:
+        df = read_csv(BytesIO(content)).dropna(subset=["Company Name", "ACT Symbol"], how="any", axis=0)
+        # One vectorized mask: valid test issue and no share-class or preferred suffixes ("." or "$")
+        df = df.loc[df["Test Issue"].isin(self.VALID_TEST_ISSUE) & ~df["ACT Symbol"].str.contains(r"[.$]", regex=True)]
         df = df.rename(
             columns={
                 "ACT Symbol": "symbol",
@@ -1,12 +1,58 @@
 import toml
 from pathlib import Path
+from threading import Lock
 
+CONFIG_FOLDER: Path = Path(__file__).parents[1] / "config"
+MAPPINGS_FOLDER: Path = Path(__file__).parents[1] / "mappings"
 
-def load_config() -> dict:
-    path = Path(__file__).parents[1] / "config" / "config.toml"
-    return toml.load(open(path, "r"))
+# Parsed files keyed by path, with the modification time they were parsed at
+_toml_cache: dict = {}
+_toml_cache_lock = Lock()
 
 
-def load_mappings(name: str) -> dict:
-    path = Path(__file__).parents[1] / "mappings" / f"{name}.toml"
-    return toml.load(open(path, "r"))
+class FrozenDict(dict):
+    """Read-only dict returned by the loaders. It stays a dict so it pickles and serializes like the parsed TOML."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __hash__(self) -> int:
+        if not hasattr(self, "_hash"):
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def freeze(value):
+    """Recursively convert dicts to FrozenDicts and lists to tuples."""
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def load_toml(path: Path) -> FrozenDict:
+    """Parse a TOML file once per process, re-parsing only when its modification time changes."""
+    mtime = path.stat().st_mtime_ns
+    with _toml_cache_lock:
+        cached = _toml_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    with open(path, "r") as f:
+        data = freeze(toml.load(f))
+    with _toml_cache_lock:
+        _toml_cache[path] = (mtime, data)
+    return data
+
+
+def load_config() -> FrozenDict:
+    return load_toml(CONFIG_FOLDER / "config.toml")
+
+
+def load_mappings(name: str) -> FrozenDict:
+    return load_toml(MAPPINGS_FOLDER / f"{name}.toml")
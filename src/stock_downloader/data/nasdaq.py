@@ -1,5 +1,8 @@
 from pandas import read_csv, DataFrame
 from pathlib import Path #, PosixPath, WindowsPath
+from io import BytesIO
+from stock_downloader.data.http_session import PooledSession, get_session
+from stock_downloader.data.http_cache import HttpCache, fetch_and_parse
 # import yfinance as yf
 # from yfinance.exceptions import YFRateLimitError
 # import json
@@ -10,6 +13,8 @@ from pathlib import Path #, PosixPath, WindowsPath
 class NasdaqDownloader:
 
     URL="https://datahub.io/core/nasdaq-listings/_r/-/data/nasdaq-listed-symbols.csv"
+    # Bump when parse_data changes, so cached parsed frames are not reused
+    PARSER_VERSION = 1
     VALID_TEST_ISSUE = ["N"]
     VALID_FINANCIAL_STATUS = ["N"]
     FILE_NAME = 'nasdaq_listed_symbols.parquet'
@@ -21,14 +26,19 @@ class NasdaqDownloader:
             'ETF': 'ETF',
         }
 
-    def __init__(self):
+    def __init__(self, session: PooledSession = None, cache: HttpCache = None):
+        self.session = session or get_session()
+        self.cache = cache
         self.df = self.download_data()
 
     def __call__(self) -> DataFrame:
         return self.df
 
-    def download_data(self) -> DataFrame:    
-        df = read_csv(self.URL).dropna(subset=['Company Name', 'Symbol'], how='any', axis=0)
+    def download_data(self) -> DataFrame:
+        return fetch_and_parse(url=self.URL, parse=self.parse_data, session=self.session, cache=self.cache, version=self.PARSER_VERSION)
+
+    def parse_data(self, content: bytes) -> DataFrame:
+        df = read_csv(BytesIO(content)).dropna(subset=['Company Name', 'Symbol'], how='any', axis=0)
         df = df.query('`Test Issue`.isin(@self.VALID_TEST_ISSUE)').query('`Financial Status`.isin(@self.VALID_FINANCIAL_STATUS)')
         df['Symbol'] = df['Symbol'].str.upper()
         df['Company Name'] = df['Company Name'].str.strip()
@@ -0,0 +1,173 @@
+from pandas import DataFrame, Series, read_parquet, bdate_range, Timestamp
+from pathlib import Path, PosixPath, WindowsPath
+from typing import Protocol, runtime_checkable
+import json
+import random
+import time
+import zlib
+
+import numpy as np
+
+from stock_downloader.data.yfinance_info import YahooFinanceTickerInfo
+from stock_downloader.data.yfinance_price import YahooFinancePriceHistory
+from stock_downloader.data.http_session import PooledSession
+from stock_downloader.utilities import date_to_day_number
+
+
+class InjectedProviderError(Exception):
+    """Raised by the local replay provider to simulate a failed request."""
+
+
+@runtime_checkable
+class MarketDataProvider(Protocol):
+    """Source of price history and ticker info records for a single symbol."""
+
+    def price_history(self, symbol: str) -> list[dict]: ...
+
+    def ticker_info(self, symbol: str) -> list[dict]: ...
+
+
+class YahooFinanceProvider:
+    """Market data provider backed by the yfinance downloader classes."""
+
+    def __init__(self, interval: str = "1d", period: str = "10y", session: PooledSession = None) -> None:
+        self.interval = interval
+        self.period = period
+        self.session = session
+
+    def price_history(self, symbol: str) -> list[dict]:
+        history = YahooFinancePriceHistory(symbol, interval=self.interval, period=self.period, session=self.session)
+        return [] if history.data is None else history()
+
+    def ticker_info(self, symbol: str) -> list[dict]:
+        return YahooFinanceTickerInfo(symbol, session=self.session)()
+
+
+class LocalReplayProvider:
+    """
+    Market data provider that replays recorded fixtures from disk, or generates synthetic data,
+    with optional injected latency and error rates. Fixtures are laid out as
+    <path>/price/<SYMBOL>.parquet and <path>/info/<SYMBOL>.json.
+    """
+
+    PRICE_FOLDER: str = "price"
+    INFO_FOLDER: str = "info"
+    SYNTHETIC_DAYS: int = 2520  # roughly 10 years of trading days
+
+    def __init__(
+        self,
+        path: str | PosixPath | WindowsPath = None,
+        synthetic: bool = False,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = None,
+    ) -> None:
+        if path is None and not synthetic:
+            raise ValueError("A fixture path is required unless synthetic data is enabled.")
+        self.path = Path(path) if path is not None else None
+        self.synthetic = synthetic
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+
+    def _simulate_request(self, symbol: str) -> None:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if self.error_rate > 0 and self.random.random() < self.error_rate:
+            raise InjectedProviderError(f"Injected error for {symbol}")
+
+    def _fixture(self, folder: str, symbol: str, suffix: str) -> Path:
+        return self.path / folder / f"{symbol.upper()}.{suffix}"
+
+    def price_history(self, symbol: str) -> list[dict]:
+        self._simulate_request(symbol)
+        if self.synthetic:
+            return self._synthetic_price(symbol).to_dict(orient="records")
+        fixture = self._fixture(self.PRICE_FOLDER, symbol, "parquet")
+        if not fixture.exists():
+            return []
+        return read_parquet(fixture).to_dict(orient="records")
+
+    def ticker_info(self, symbol: str) -> list[dict]:
+        self._simulate_request(symbol)
+        if self.synthetic:
+            return [self._synthetic_info(symbol)]
+        fixture = self._fixture(self.INFO_FOLDER, symbol, "json")
+        if not fixture.exists():
+            return []
+        with fixture.open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _synthetic_price(self, symbol: str) -> DataFrame:
+        """Generate a deterministic random-walk price history for a symbol."""
+        rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+        dates = bdate_range(end=Timestamp.today().normalize(), periods=self.SYNTHETIC_DAYS)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+        open_ = close * (1 + rng.normal(0, 0.005, len(dates)))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, len(dates))))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, len(dates))))
+        return DataFrame(
+            {
+                "Date": date_to_day_number(Series(dates)),
+                "Open": open_,
+                "High": high,
+                "Low": low,
+                "Close": close,
+                "Volume": rng.integers(100_000, 10_000_000, len(dates)),
+                "Dividends": 0.0,
+                "stock_splits": 0.0,
+            }
+        )
+
+    def _synthetic_info(self, symbol: str) -> dict:
+        return {
+            "symbol": symbol,
+            "shortName": f"{symbol} Synthetic",
+            "longName": f"{symbol} Synthetic Holdings",
+            "sector": "Synthetic",
+            "industry": "Synthetic",
+            "currency": "USD",
+            "quoteType": "EQUITY",
+            "marketCap": 1_000_000_000,
+        }
+
+
+def record_fixtures(
+    symbols: list, path: str | PosixPath | WindowsPath, provider: MarketDataProvider = None, price: bool = True, info: bool = True
+) -> None:
+    """Record price and info responses from a provider as fixtures for the LocalReplayProvider."""
+    provider = provider or YahooFinanceProvider()
+    price_folder = Path(path) / LocalReplayProvider.PRICE_FOLDER
+    info_folder = Path(path) / LocalReplayProvider.INFO_FOLDER
+    price_folder.mkdir(parents=True, exist_ok=True)
+    info_folder.mkdir(parents=True, exist_ok=True)
+    for symbol in symbols:
+        if price:
+            DataFrame(provider.price_history(symbol)).to_parquet(price_folder / f"{symbol.upper()}.parquet", index=False)
+        if info:
+            with (info_folder / f"{symbol.upper()}.json").open("w", encoding="utf-8") as f:
+                json.dump(provider.ticker_info(symbol), f)
+
+
+def provider_name(config: dict) -> str:
+    """Name of the provider in the [provider] config section, with synthetic replay told apart from recorded fixtures."""
+    provider_config = config.get("provider", {})
+    name = provider_config.get("name", "yfinance")
+    return f"{name}_synthetic" if name == "replay" and provider_config.get("synthetic", False) else name
+
+
+def load_provider(config: dict, session: PooledSession = None, period: str = None) -> MarketDataProvider:
+    """Build the market data provider named in the [provider] config section, optionally with a shorter price period."""
+    provider_config = config.get("provider", {})
+    name = provider_config.get("name", "yfinance")
+    if name == "yfinance":
+        return YahooFinanceProvider(session=session) if period is None else YahooFinanceProvider(period=period, session=session)
+    if name == "replay":
+        return LocalReplayProvider(
+            path=provider_config.get("replay_folder"),
+            synthetic=provider_config.get("synthetic", False),
+            latency=provider_config.get("latency", 0.0),
+            error_rate=provider_config.get("error_rate", 0.0),
+            seed=provider_config.get("seed"),
+        )
+    raise ValueError(f"Unknown market data provider: {name}")
@@ -17,6 +17,40 @@ class symbolLists:
     etf: list
 
 
+def build_symbol_table(
+    nasdaq_df: DataFrame,
+    other_df: DataFrame,
+    index_symbols_df: DataFrame,
+    sector_etfs: dict,
+    market_etfs: dict,
+    technical_etfs: dict,
+) -> DataFrame:
+    """Build one row per listed symbol with a categorical symbol and boolean membership columns."""
+    symbols_df: DataFrame = concat([nasdaq_df, other_df], axis=0).merge(index_symbols_df, how="left", on="symbol")
+    symbol = symbols_df["symbol"]
+    return DataFrame(
+        {
+            "symbol": symbol.astype("category"),
+            "is_etf": symbols_df["etf"].eq("Y"),
+            "is_equity": symbols_df["etf"].eq("N"),
+            "sp500": symbols_df["sp500"].eq(True),
+            "dowjones": symbols_df["dowjones"].eq(True),
+            "nasdaq100": symbols_df["nasdaq100"].eq(True),
+            "sector_etf": symbol.isin(list(sector_etfs.values())),
+            "market_etf": symbol.isin(list(market_etfs.values())),
+            "technical_etf": symbol.isin(list(technical_etfs.values())),
+        }
+    ).reset_index(drop=True)
+
+
+def sample_symbols(symbols: list, sample: int | float = None, seed: int = None) -> list:
+    """Draw a reproducible sample of symbols; an int is a count and a float below 1 is a fraction."""
+    if not sample or not symbols:
+        return symbols
+    n = round(len(symbols) * sample) if isinstance(sample, float) and sample < 1 else min(int(sample), len(symbols))
+    return Series(symbols).sample(n=n, random_state=seed).sort_values().to_list()
+
+
 def select_symbols(
     nasdaq_df: DataFrame,
     other_df: DataFrame,
@@ -34,30 +68,33 @@ def select_symbols(
     get_dowjones: bool = False,
     get_nasdaq100: bool = False,
     sample: int | float = None,
+    sample_seed: int = None,
 ) -> symbolLists:
-    equity_symbol_list: list = []
-    etf_symbol_list: list = []
-    symbols_df: DataFrame = concat([nasdaq_df, other_df], axis=0).merge(index_symbols_df, how="left", on="symbol")
+    symbol_table = build_symbol_table(
+        nasdaq_df=nasdaq_df,
+        other_df=other_df,
+        index_symbols_df=index_symbols_df,
+        sector_etfs=sector_etfs,
+        market_etfs=market_etfs,
+        technical_etfs=technical_etfs,
+    )
+
+    # The get_* flags are plain bools, so each list resolves to a single vectorized mask
+    etf_mask = symbol_table["is_etf"] & (
+        bool(get_etfs)
+        | (bool(get_sector_etfs) & symbol_table["sector_etf"])
+        | (bool(get_market_etfs) & symbol_table["market_etf"])
+        | (bool(get_technical_etfs) & symbol_table["technical_etf"])
+    )
+    equity_mask = symbol_table["is_equity"] & (
+        (bool(get_sp500) & symbol_table["sp500"])
+        | (bool(get_dowjones) & symbol_table["dowjones"])
+        | (bool(get_nasdaq100) & symbol_table["nasdaq100"])
+    )
 
-    if get_etfs:
-        etf_symbol_list.append(symbols_df.query('etf == "Y"').symbol)
-    if get_sector_etfs:
-        etf_symbol_list.append(symbols_df.loc[symbols_df["symbol"].isin(sector_etfs.values())].query('etf == "Y"').symbol)
-    if get_market_etfs:
-        etf_symbol_list.append(symbols_df.loc[symbols_df["symbol"].isin(market_etfs.values())].query('etf == "Y"').symbol)
-    if get_technical_etfs:
-        etf_symbol_list.append(symbols_df.loc[symbols_df["symbol"].isin(technical_etfs.values())].query('etf == "Y"').symbol)
-    if get_indicies:
-        etf_symbol_list.append(Series(list(indicies.values()), name="symbol"))
-    if get_sp500:
-        equity_symbol_list.append(symbols_df.query("sp500 == True").query('etf == "N"').symbol)
-    if get_dowjones:
-        equity_symbol_list.append(symbols_df.query("dowjones == True").query('etf == "N"').symbol)
-    if get_nasdaq100:
-        equity_symbol_list.append(symbols_df.query("nasdaq100 == True").query('etf == "N"').symbol)
-
-    equity_symbols: list = concat(equity_symbol_list, axis=0).sort_values().drop_duplicates().to_list()
-    etf_symbols: list = concat(etf_symbol_list, axis=0).sort_values().drop_duplicates().to_list()
-    if sample:
-        return symbolLists(equity=equity_symbols[:sample], etf=etf_symbols[:sample])
-    return symbolLists(equity=equity_symbols, etf=etf_symbols)
+    equity_symbols: list = sorted(set(symbol_table.loc[equity_mask, "symbol"].astype(str)))
+    etf_symbols: list = sorted(set(symbol_table.loc[etf_mask, "symbol"].astype(str)) | (set(indicies.values()) if get_indicies else set()))
+    return symbolLists(
+        equity=sample_symbols(equity_symbols, sample=sample, seed=sample_seed),
+        etf=sample_symbols(etf_symbols, sample=sample, seed=sample_seed),
+    )
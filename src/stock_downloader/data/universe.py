@@ -0,0 +1,236 @@
+from pandas import DataFrame, NaT, Series, Timestamp, concat, read_parquet
+from dataclasses import dataclass, field
+from pathlib import Path, PosixPath, WindowsPath
+from typing import Callable
+import re
+
+from stock_downloader.data.select_symbols import symbolLists
+from stock_downloader.data.yfinance_batch import YahooFinanceBatchDownloader
+from stock_downloader.schemas.dtype_plans import dtype_plan
+from stock_downloader.utilities import date_to_day_number
+
+
+@dataclass
+class UniverseDiff:
+    version: int
+    added: list
+    removed: list
+    unchanged: list
+    membership_changes: DataFrame = field(default_factory=DataFrame)
+
+    @property
+    def is_initial(self) -> bool:
+        return self.version == 1
+
+
+class UniverseSnapshotStore:
+    """
+    Versioned snapshots of the selected symbol universe. Each save writes universe_v<N>.parquet, returns the
+    diff against the previous snapshot and updates the index membership history with effective dates.
+    """
+
+    SNAPSHOT_PREFIX: str = "universe_v"
+    HISTORY_FILE: str = "index_membership_history.parquet"
+    INDEX_COLUMNS: list = ["sp500", "dowjones", "nasdaq100"]
+    HISTORY_COLUMNS: list = ["symbol", "index", "effective_from", "effective_to"]
+
+    def __init__(self, path: str | PosixPath | WindowsPath) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _snapshot_file(self, version: int) -> Path:
+        return self.path / f"{self.SNAPSHOT_PREFIX}{version:05d}.parquet"
+
+    def versions(self) -> list:
+        pattern = re.compile(rf"{self.SNAPSHOT_PREFIX}(\d+)\.parquet")
+        return sorted(int(match.group(1)) for file in self.path.iterdir() if (match := pattern.fullmatch(file.name)))
+
+    def load(self, version: int = None) -> DataFrame | None:
+        """Load a snapshot by version, or the latest one if no version is given."""
+        versions = self.versions()
+        if not versions:
+            return None
+        return read_parquet(self._snapshot_file(version or versions[-1]))
+
+    def membership_history(self) -> DataFrame:
+        history_file = self.path / self.HISTORY_FILE
+        if not history_file.exists():
+            return DataFrame(columns=self.HISTORY_COLUMNS)
+        return read_parquet(history_file)
+
+    @classmethod
+    def build_snapshot(cls, symbol_lists: symbolLists, index_symbols_df: DataFrame) -> DataFrame:
+        """One row per selected symbol with its asset type and index membership flags."""
+        snapshot = concat(
+            [
+                DataFrame({"symbol": symbol_lists.equity, "asset_type": "equity"}),
+                DataFrame({"symbol": symbol_lists.etf, "asset_type": "etf"}),
+            ]
+        ).drop_duplicates(subset="symbol", keep="first")
+        snapshot = snapshot.merge(index_symbols_df.loc[:, ["symbol"] + cls.INDEX_COLUMNS], how="left", on="symbol")
+        snapshot[cls.INDEX_COLUMNS] = snapshot[cls.INDEX_COLUMNS].eq(True)
+        return snapshot.sort_values("symbol").reset_index(drop=True)
+
+    def save(self, snapshot: DataFrame, index_symbols_df: DataFrame = None, as_of: Timestamp = None) -> UniverseDiff:
+        """
+        Persist a new snapshot version and return its diff against the previous one. Index membership is taken
+        from index_symbols_df when given, so it covers every index constituent rather than only selected symbols.
+        """
+        as_of = (as_of or Timestamp.today()).normalize()
+        previous = self.load()
+        version = (self.versions() or [0])[-1] + 1
+        snapshot.assign(as_of=as_of).to_parquet(self._snapshot_file(version), index=False)
+
+        current_symbols = set(snapshot["symbol"])
+        previous_symbols = set() if previous is None else set(previous["symbol"])
+        membership_changes = self._update_membership_history(
+            memberships=snapshot if index_symbols_df is None else index_symbols_df, as_of=as_of
+        )
+        return UniverseDiff(
+            version=version,
+            added=sorted(current_symbols - previous_symbols),
+            removed=sorted(previous_symbols - current_symbols),
+            unchanged=sorted(current_symbols & previous_symbols),
+            membership_changes=membership_changes,
+        )
+
+    def _update_membership_history(self, memberships: DataFrame, as_of: Timestamp) -> DataFrame:
+        """Close memberships that ended and open new ones, returning the changes made at as_of."""
+        history = self.membership_history()
+        current = {(symbol, index) for index in self.INDEX_COLUMNS for symbol in memberships.loc[memberships[index].eq(True), "symbol"]}
+        open_rows = history["effective_to"].isna()
+        active = set(zip(history.loc[open_rows, "symbol"], history.loc[open_rows, "index"]))
+
+        ended = active - current
+        started = current - active
+        history.loc[open_rows & history.set_index(["symbol", "index"]).index.isin(list(ended)), "effective_to"] = as_of
+        new_rows = DataFrame(sorted(started), columns=["symbol", "index"]).assign(effective_from=as_of, effective_to=NaT)
+        history = concat([history, new_rows], ignore_index=True) if not history.empty else new_rows
+        history.loc[:, self.HISTORY_COLUMNS].to_parquet(self.path / self.HISTORY_FILE, index=False)
+
+        return concat(
+            [
+                DataFrame(sorted(started), columns=["symbol", "index"]).assign(member=True),
+                DataFrame(sorted(ended), columns=["symbol", "index"]).assign(member=False),
+            ],
+            ignore_index=True,
+        ).assign(effective_date=as_of)
+
+
+def download_price_history(
+    symbols: list,
+    path: str | PosixPath | WindowsPath,
+    full_fetch: Callable[[str], list],
+    incremental_fetch: Callable[[str], list] = None,
+    diff: UniverseDiff = None,
+    previous_price: DataFrame = None,
+    retry_time: int = None,
+) -> DataFrame:
+    """
+    Download prices using the universe diff: added symbols (and any without stored history) get their full
+    history, removed symbols are skipped and unchanged symbols only fetch the recent window, which is merged
+    onto their stored history. Unchanged symbols whose window does not reach back to their last stored date, such as
+    after a paused job or a failed fetch, are downloaded in full instead. Without a diff or previous prices every symbol is downloaded in full.
+    """
+    if diff is None or previous_price is None or previous_price.empty or incremental_fetch is None:
+        return YahooFinanceBatchDownloader(
+            symbols=symbols, path=path, fetch=full_fetch, retry_time=retry_time, dtypes=dtype_plan("price")
+        ).data
+
+    stored = set(previous_price["symbol"])
+    incremental_symbols = [symbol for symbol in symbols if symbol in stored and symbol in diff.unchanged]
+    full_symbols = [symbol for symbol in symbols if symbol not in incremental_symbols]
+
+    incremental = None
+    if incremental_symbols:
+        incremental = YahooFinanceBatchDownloader(
+            symbols=incremental_symbols, path=path, fetch=incremental_fetch, retry_time=retry_time, dtypes=dtype_plan("price")
+        ).data
+        # Prices are auto-adjusted, so a new dividend or split rewrites the stored history of that symbol, and a window
+        # that starts after the last stored date would leave a gap
+        refetch = sorted(
+            set(_symbols_with_new_actions(previous_price=previous_price, recent_price=incremental))
+            | set(_symbols_with_gaps(symbols=incremental_symbols, previous_price=previous_price, recent_price=incremental))
+        )
+        if refetch:
+            incremental = incremental.loc[~incremental["symbol"].isin(refetch)]
+            incremental_symbols = [symbol for symbol in incremental_symbols if symbol not in refetch]
+            full_symbols = sorted(full_symbols + refetch)
+
+    frames = [previous_price.loc[previous_price["symbol"].isin(incremental_symbols)], incremental]
+    if full_symbols:
+        frames.append(
+            YahooFinanceBatchDownloader(
+                symbols=full_symbols, path=path, fetch=full_fetch, retry_time=retry_time, dtypes=dtype_plan("price")
+            ).data
+        )
+    return (
+        concat([frame for frame in frames if frame is not None and not frame.empty], ignore_index=True)
+        .drop_duplicates(subset=["symbol", "Date"], keep="last")
+        .sort_values(["symbol", "Date"])
+        .reset_index(drop=True)
+    )
+
+
+class IncrementalPriceFetch:
+    """
+    A per-symbol price fetch for streaming downloads that splits symbols as download_price_history does: unchanged
+    symbols with stored history fetch only the recent window, merged onto their stored rows, and fall back to a full
+    fetch when the window has a new dividend or split or leaves a gap. Every other symbol is fetched in full, so each
+    call returns the symbol's complete history as records.
+    """
+
+    def __init__(
+        self, full_fetch: Callable[[str], list], incremental_fetch: Callable[[str], list], diff: UniverseDiff, previous_price: DataFrame
+    ) -> None:
+        self.full_fetch = full_fetch
+        self.incremental_fetch = incremental_fetch
+        self.unchanged = set(diff.unchanged)
+        self.previous = {symbol: df for symbol, df in previous_price.groupby("symbol", observed=True, sort=False)}
+        self.full_symbols: list = []
+        self.incremental_symbols: list = []
+
+    def __call__(self, symbol: str) -> list:
+        stored = self.previous.get(symbol)
+        if stored is None or symbol not in self.unchanged:
+            self.full_symbols.append(symbol)
+            return self.full_fetch(symbol)
+        records = self.incremental_fetch(symbol)
+        recent = YahooFinanceBatchDownloader.records_to_frame([{"symbol": symbol, **record} for record in records])
+        if (
+            recent.empty
+            or _symbols_with_new_actions(previous_price=stored, recent_price=recent)
+            or _symbols_with_gaps(symbols=[symbol], previous_price=stored, recent_price=recent)
+        ):
+            self.full_symbols.append(symbol)
+            return self.full_fetch(symbol)
+        self.incremental_symbols.append(symbol)
+        kept = stored.loc[~stored["Date"].isin(recent["Date"])].drop(columns="symbol")
+        return kept.assign(Date=date_to_day_number(kept["Date"])).to_dict(orient="records") + records
+
+
+def _symbols_with_new_actions(previous_price: DataFrame, recent_price: DataFrame) -> list:
+    """Symbols whose recent window has a dividend or split after the last stored date."""
+    if recent_price is None or recent_price.empty:
+        return []
+    action_columns = [col for col in ["Dividends", "stock_splits"] if col in recent_price]
+    if not action_columns:
+        return []
+    last_stored = previous_price.groupby("symbol")["Date"].max()
+    new_rows = recent_price.loc[recent_price["Date"] > recent_price["symbol"].map(last_stored)]
+    return sorted(new_rows.loc[(new_rows[action_columns].fillna(0) != 0).any(axis=1), "symbol"].unique())
+
+
+def _symbols_with_gaps(symbols: list, previous_price: DataFrame, recent_price: DataFrame) -> list:
+    """Symbols whose recent window is missing or starts after their last stored date, so merging it would leave a gap."""
+    last_stored = previous_price.groupby("symbol", observed=True)["Date"].max()
+    first_recent = recent_price.groupby("symbol", observed=True)["Date"].min() if recent_price is not None else Series(dtype=object)
+    return sorted(symbol for symbol in symbols if symbol not in first_recent.index or first_recent[symbol] > last_stored[symbol])
+
+
+def load_universe_store(config: dict) -> UniverseSnapshotStore | None:
+    """Build the universe snapshot store from the [universe] config section, or None if it is disabled."""
+    universe_config = config.get("universe", {})
+    if not universe_config.get("enabled", False):
+        return None
+    return UniverseSnapshotStore(path=universe_config.get("snapshot_folder"))
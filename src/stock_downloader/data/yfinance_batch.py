@@ -1,15 +1,18 @@
-from pandas import DataFrame, to_datetime  # , #read_csv, read_parquet, , to_datetime
+from pandas import DataFrame  # , #read_csv, read_parquet, , to_datetime
 from pathlib import Path, PosixPath, WindowsPath
 
 # import yfinance as yf
 from yfinance.exceptions import YFRateLimitError
+from typing import Callable, Iterator
 import json
 import time
 from tqdm.auto import tqdm
 import os
 import uuid
 
-from stock_downloader.utilities import downcast_numeric_columns
+from stock_downloader.utilities import day_number_to_date
+from stock_downloader.schemas.dtype_plans import apply_dtype_plan
+from stock_downloader.data.info_cache import TickerInfoCache
 
 
 class YahooFinanceBatchDownloader:
@@ -19,28 +22,38 @@ class YahooFinanceBatchDownloader:
 
     def __init__(
         self,
-        cls,
         symbols: list,
         path: str | PosixPath | WindowsPath,
+        cls=None,
+        fetch: Callable[[str], list] = None,
         #  filename: str,
         delete_temp: bool = True,
+        cache: TickerInfoCache = None,
+        retry_time: int = None,
+        lazy: bool = False,
+        dtypes: dict = None,
     ) -> None:
+        if cls is None and fetch is None:
+            raise ValueError("Either a downloader class or a fetch function must be provided.")
         self.symbols = symbols
         self.temp_file = Path(path) / self.make_temp_filename()
         # self.filename = filename
         self.cls = cls
+        self.fetch = fetch if fetch is not None else self._fetch_with_cls
+        self.retry_time = self.RETRY_TIME if retry_time is None else retry_time
+        self.cache = cache
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self.delete_temp = delete_temp
+        self.dtypes = dtypes
+        self.data: DataFrame = None
 
         if not self.temp_file.exists():
             self.temp_file.touch()
 
-        self.data = self.run()
-        for col in ["Date", "date"]:
-            if col in self.data:
-                self.data[col] = to_datetime(self.data[col])
-        # self._save_parquet(output_path=Path(path))
-
-        if delete_temp:
-            self._delete_temp_file()
+        # Lazy downloaders are driven through stream() and finalize() by the caller
+        if not lazy:
+            self.data = self.run()
 
     def make_temp_filename(self) -> str:
         return f"{str(uuid.uuid4())}.{self.TEMP_FILE_SUFFIX}"
@@ -48,10 +61,14 @@ class YahooFinanceBatchDownloader:
     def __call__(self) -> DataFrame:
         return self.data
 
+    def _fetch_with_cls(self, symbol: str) -> list:
+        info = self.cls(symbol)
+        return info()
+
     def _load_completed_symbols(self) -> list:
         if not self.temp_file.exists():
             return list()
-        completed = list()
+        completed = set()
         with self.temp_file.open("r", encoding="utf-8") as f:
             for line in f:
                 try:
@@ -60,7 +77,7 @@ class YahooFinanceBatchDownloader:
                 except Exception as e:
                     print(e)
                     continue
-        return sorted(set(completed))
+        return sorted(completed)
 
     def _append_to_temp(self, symbol, info) -> None:
         with self.temp_file.open("a", encoding="utf-8") as f:
@@ -71,24 +88,50 @@ class YahooFinanceBatchDownloader:
     #     self.data.to_parquet(output_path / self.filename, index=False)
 
     def run(self) -> DataFrame:
+        for _ in self.stream():
+            pass
+        return self.finalize()
+
+    def stream(self) -> Iterator[tuple[str, list]]:
+        """Download each symbol in turn, checkpointing to the temp file, and yield its records as soon as they arrive."""
         completed: list = self._load_completed_symbols()
         for symbol in tqdm(self.symbols):
             if symbol in completed:
                 continue
-            while True:
-                try:
-                    info = self.cls(symbol)
-                    for record in info():
-                        self._append_to_temp(symbol, record)
-                    break  # Exit the while loop if successful
-                except YFRateLimitError:
-                    print(f"Rate limit exceeded for {symbol}. Retrying in {self.RETRY_TIME} seconds.")
-                    time.sleep(self.RETRY_TIME)
-                except Exception as e:
-                    print(f"Other error for symbol {symbol}: {e}. Retrying in {self.RETRY_TIME} seconds.")
-                    time.sleep(self.RETRY_TIME)
+            yield symbol, self._download_symbol(symbol)
+
+    def _download_symbol(self, symbol: str) -> list:
+        if self.cache is not None:
+            cached = self.cache.get(symbol)
+            if cached is not None:
+                for record in cached:
+                    self._append_to_temp(symbol, record)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+        while True:
+            try:
+                records = self.fetch(symbol)
+                for record in records:
+                    self._append_to_temp(symbol, record)
+                if self.cache is not None:
+                    self.cache.put(symbol, records)
+                return records
+            except YFRateLimitError:
+                print(f"Rate limit exceeded for {symbol}. Retrying in {self.retry_time} seconds.")
+                time.sleep(self.retry_time)
+            except Exception as e:
+                print(f"Other error for symbol {symbol}: {e}. Retrying in {self.retry_time} seconds.")
+                time.sleep(self.retry_time)
+
+    def finalize(self) -> DataFrame:
+        """Load everything downloaded so far from the temp file and remove it if requested."""
+        self.data = self._temp_to_parquet(output_path=self.temp_file)
+        # self._save_parquet(output_path=Path(path))
 
-        return self._temp_to_parquet(output_path=self.temp_file)
+        if self.delete_temp:
+            self._delete_temp_file()
+        return self.data
 
     def _delete_temp_file(self) -> None:
         try:
@@ -112,7 +155,12 @@ class YahooFinanceBatchDownloader:
                     records.append(flat_info)
                 except Exception:
                     continue
-        return downcast_numeric_columns(
+        return self.records_to_frame(records, dtypes=self.dtypes)
+
+    @staticmethod
+    def records_to_frame(records: list, dtypes: dict = None) -> DataFrame:
+        """Build a DataFrame from flat records that carry their own symbol, cast to the dtype plan if one is given."""
+        df = (
             DataFrame(records)
             # .drop_duplicates(subset='symbol', keep='first')
             # .drop_duplicates()
@@ -120,3 +168,7 @@ class YahooFinanceBatchDownloader:
             .reset_index(drop=True)
             .replace("Infinity", None)
         )
+        for col in ["Date", "date"]:
+            if col in df:
+                df[col] = day_number_to_date(df[col])
+        return apply_dtype_plan(df, dtypes) if dtypes else df
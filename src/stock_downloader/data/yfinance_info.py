@@ -1,6 +1,7 @@
 # from pandas import read_csv, read_parquet, DataFrame, to_datetime, concat
 # from pathlib import Path, PosixPath, WindowsPath
 import yfinance as yf
+from stock_downloader.data.http_session import PooledSession, get_session
 # from yfinance.exceptions import YFRateLimitError
 # import json
 # import time
@@ -12,8 +13,9 @@ class YahooFinanceTickerInfo:
 
     """Fetch sector and industry information for a stock symbol using Yahoo Finance."""
 
-    def __init__(self, symbol: str) -> None:
+    def __init__(self, symbol: str, session: PooledSession = None) -> None:
         self.symbol = symbol
+        self.session = session or get_session()
         self.data = self.get_info()
         self.data = self._column_rename()
 
@@ -31,7 +33,7 @@ class YahooFinanceTickerInfo:
     def get_info(self) -> dict:
         """Fetch sector and industry information for the given symbols."""
 
-        ticker = yf.Ticker(self.symbol.upper())
+        ticker = yf.Ticker(self.symbol.upper(), session=self.session)
         info = ticker.info
         # sector = info.get('sector', None)
         # industry = info.get('industry', None)
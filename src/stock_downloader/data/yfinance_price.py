@@ -7,7 +7,9 @@ import yfinance as yf
 # import json
 # import time
 # from tqdm.auto import tqdm
-from stock_downloader.utilities import downcast_numeric_columns
+from stock_downloader.utilities import date_to_day_number
+from stock_downloader.schemas.dtype_plans import apply_dtype_plan, dtype_plan
+from stock_downloader.data.http_session import PooledSession, get_session
 
 
 class YahooFinancePriceHistory:
@@ -15,22 +17,22 @@ class YahooFinancePriceHistory:
 
     RENAME_COLUMNS = {"Stock Splits": "stock_splits"}
 
-    DATE_FORMAT = "%Y-%m-%d"
-
-    def __init__(self, symbol: str, interval: str = "1d", period: str = "10y") -> None:
+    def __init__(self, symbol: str, interval: str = "1d", period: str = "10y", session: PooledSession = None) -> None:
         self.symbol = symbol
+        self.session = session or get_session()
         self.interval = interval
         self.period = period
 
         self.data = self.get_info()
 
     def __call__(self) -> dict:
-        return self.data.to_dict(orient="records")
+        # Records carry the date as int32 days since the epoch so they serialize without string formatting
+        return self.data.assign(Date=date_to_day_number(self.data["Date"])).to_dict(orient="records")
 
     def get_info(self) -> DataFrame:
         """Fetch sector and industry information for the given symbols."""
 
-        ticker = yf.Ticker(self.symbol.upper())
+        ticker = yf.Ticker(self.symbol.upper(), session=self.session)
         price_data = ticker.history(period=self.period, interval=self.interval, auto_adjust=True, actions=True)
         if price_data.empty:
             return None
@@ -39,6 +41,7 @@ class YahooFinancePriceHistory:
             .rename(columns=self.RENAME_COLUMNS)
             .reset_index(drop=False)
         )
-        price_data["Date"] = price_data["Date"].apply(lambda x: x.tz_localize(None).strftime(self.DATE_FORMAT))
+        # Drop the exchange timezone but keep the local trading date
+        price_data["Date"] = price_data["Date"].dt.tz_localize(None).dt.normalize()
 
-        return downcast_numeric_columns(price_data)
+        return apply_dtype_plan(price_data, dtype_plan("price"))
@@ -0,0 +1,96 @@
+from duckdb import DuckDBPyConnection, IOException
+from pathlib import Path, PosixPath, WindowsPath
+from threading import Lock, local
+from time import sleep
+import os
+
+from stock_downloader.database.db import connect_database
+from stock_downloader.database.sql_schema import quote
+
+# [database] keys passed to DuckDB as settings when the connection is opened
+DATABASE_SETTINGS: list = ["threads", "memory_limit", "temp_directory"]
+
+
+def connect_with_retry(
+    db_path: str | PosixPath | WindowsPath, row_group_size: int = None, settings: dict = None, attempts: int = 60, wait: float = 1.0
+) -> DuckDBPyConnection:
+    """Connect to a database file (see connect_database), waiting while another process holds its write lock."""
+    for attempt in range(attempts):
+        try:
+            return connect_database(Path(db_path), row_group_size=row_group_size, settings=settings)
+        except IOException:
+            if attempt == attempts - 1:
+                raise
+            sleep(wait)
+
+
+class DatabaseManager:
+    """
+    The one DuckDB connection a process keeps to a database file, opened on first use. Each thread works through its
+    own cursor, so registered frames and transactions stay per thread while the database instance, its buffer
+    cache and its file lock are shared.
+    """
+
+    def __init__(self, db_path: str | PosixPath | WindowsPath, row_group_size: int = None, settings: dict = None) -> None:
+        self.db_path = Path(db_path)
+        self.row_group_size = row_group_size
+        self.settings = settings or {}
+        self._connection = None
+        self._catalog = None
+        self._lock = Lock()
+        self._local = local()
+
+    @property
+    def connection(self) -> DuckDBPyConnection:
+        with self._lock:
+            if self._connection is None:
+                self._connection = connect_with_retry(self.db_path, row_group_size=self.row_group_size, settings=self.settings)
+                # fetchall finishes the result; a pending one keeps a transaction open on the connection, and its
+                # snapshot makes later writes to rows deleted and reinserted by cursors conflict
+                self._catalog = self._connection.execute("SELECT current_database()").fetchall()[0][0]
+            return self._connection
+
+    def check(self) -> bool:
+        """Open the connection, reporting whether the database could be opened."""
+        try:
+            self.connection
+            return True
+        except IOException as e:
+            print(f"Database connection error: {e}")
+            return False
+
+    def cursor(self) -> DuckDBPyConnection:
+        """The calling thread's cursor, created on its first use."""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self.connection.cursor()
+            # Cursors start in the default catalog, not the one the connection USEs (see connect_database)
+            cursor.execute(f"USE {quote(self._catalog)}")
+            self._local.cursor = cursor
+        return cursor
+
+    def close(self) -> None:
+        """Close the connection and every cursor; the next use reconnects."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._local = local()
+
+
+_managers: dict = {}
+
+
+def get_database(config: dict) -> DatabaseManager:
+    """The process's manager for the database in the [database] config section."""
+    database_config = config.get("database")
+    db_path = Path(database_config.get("database_folder")) / f"{database_config.get('database_name')}.db"
+    # A forked process must not reuse its parent's connection
+    key = (os.getpid(), db_path.as_posix())
+    if key not in _managers:
+        _managers[key] = DatabaseManager(
+            db_path=db_path,
+            row_group_size=database_config.get("row_group_size"),
+            settings={name: database_config.get(name) for name in DATABASE_SETTINGS if database_config.get(name) is not None},
+        )
+    return _managers[key]
@@ -1,18 +1,342 @@
-from duckdb import DuckDBPyConnection, IOException, connect
+from duckdb import DuckDBPyConnection, connect
+from contextlib import contextmanager, nullcontext
 from pandas import DataFrame
+from pathlib import Path, PosixPath, WindowsPath
+from typing import Iterator
+from pandera.errors import SchemaError, SchemaWarning
+import pyarrow as pa
+import warnings
 
+from stock_downloader.data.info_tables import CHILD_COLUMNS, INFO_TABLES
+from stock_downloader.database.sql_schema import SQL_VALIDATION_MODES, SqlSchema, quote, sql_schema
+from stock_downloader.utilities import to_arrow
 
-def write_table(db: DuckDBPyConnection, df: DataFrame, table: str) -> None:
-    db.execute(f"DROP TABLE IF EXISTS {table}")
-    db.register("df", df)
-    db.execute(f"CREATE TABLE {table} AS SELECT * FROM df")
+WRITE_MODES: list = ["replace", "upsert"]
+
+# Primary key of each table, used by upsert writes
+PRIMARY_KEYS: dict = {
+    "nasdaq_symbols": ["symbol"],
+    "other_symbols": ["symbol"],
+    "indicies": ["symbol"],
+    "equity_info": ["symbol"],
+    "etf_info": ["symbol"],
+    "price": ["symbol", "date"],
+    "talib": ["symbol", "date"],
+    "ta__change": ["symbol", "date"],
+    "ta__ma_ratio": ["symbol", "date"],
+    "regression": ["symbol", "date"],
+    "regression_indicators": ["symbol", "date"],
+    "regression_indicators_ma": ["symbol", "date"],
+    "ma_future": ["symbol", "date"],
+    # Parts of the split info tables (see split_info)
+    **{f"{table}__{column}": ["symbol", "position"] for table in INFO_TABLES for column in CHILD_COLUMNS},
+    **{f"{table}__{part}": ["symbol"] for table in INFO_TABLES for part in ["text", "core"]},
+}
+
+# Tables downloaded whole on every run: an upsert also deletes the stored rows whose keys are missing from the frame,
+# so delisted symbols and stale index memberships do not linger. The (symbol, date) tables only ever gain rows.
+# The parts of a split info table are snapshots of the same symbols, so officers who left and lists that became
+# empty are deleted along with the symbols that left.
+SNAPSHOT_TABLES: list = [
+    "nasdaq_symbols",
+    "other_symbols",
+    "indicies",
+    *INFO_TABLES,
+    *[f"{table}__{part}" for table in INFO_TABLES for part in CHILD_COLUMNS + ["text", "core"]],
+]
+
+# Time-series tables are written sorted on these columns so DuckDB's row group min-max zone maps prune symbol and date filters
+CLUSTER_COLUMNS: list = ["symbol", "date"]
+
+# Upserts append their rows after the sorted ones, in row groups that span every symbol, so clustering decays with each
+# incremental write. This table counts the rows each upsert actually inserted or changed in a clustered table since it
+# was last sorted, so rewriting an unchanged frame never forces a re-sort.
+CLUSTERING_TABLE: str = "table_clustering"
 
 
-def check_database(db_path: str) -> bool:
+def connect_database(db_path: str | PosixPath | WindowsPath, row_group_size: int = None, settings: dict = None) -> DuckDBPyConnection:
+    """
+    Connect to a database file with DuckDB settings such as threads or memory_limit. DuckDB only takes a row group size
+    when a file is attached, and does not store it, so with row_group_size the file is attached to an in-memory
+    connection and made the default database.
+    """
+    if row_group_size is None:
+        return connect(Path(db_path), config=settings or {})
+    db = connect(config=settings or {})
     try:
-        db = connect(db_path)
+        db.execute(f"ATTACH '{Path(db_path).as_posix()}' AS {quote(Path(db_path).stem)} (ROW_GROUP_SIZE {int(row_group_size)})")
+        db.execute(f"USE {quote(Path(db_path).stem)}")
+    except Exception:
         db.close()
-        return True
-    except IOException as e:
-        print(f"Database connection error: {e}")
-        return False
+        raise
+    return db
+
+
+def cluster_columns(columns: list) -> list:
+    """The columns a table is sorted on before insertion, empty for tables without both symbol and date."""
+    return CLUSTER_COLUMNS if all(col in columns for col in CLUSTER_COLUMNS) else []
+
+
+def write_table(
+    db: DuckDBPyConnection,
+    df: DataFrame | pa.Table,
+    table: str,
+    schema: str = None,
+    validation: str = None,
+    mode: str = "replace",
+    keys: list = None,
+    arrow: bool = False,
+    index: bool = False,
+    compact_ratio: float = None,
+) -> None:
+    """
+    Write a frame to a table in its own transaction. "replace" recreates the table; "upsert" inserts or replaces the
+    frame's rows that are new or differ from the stored ones on the table's primary key (keys, or PRIMARY_KEYS), and
+    deletes the rows of SNAPSHOT_TABLES whose keys are not in the frame. With a schema (its columns.toml section) and a validation mode from
+    SQL_VALIDATION_MODES, the columns are cast to the schema types and validated by DuckDB while loading. With arrow,
+    DataFrames are registered as Arrow tables (see to_arrow). Time-series tables are sorted by CLUSTER_COLUMNS, and with
+    index an ART index is created on them when the table has no primary key. With compact_ratio, an upserted time-series
+    table is re-sorted after the write once the rows upserts inserted or changed since its last sort pass that fraction
+    of the table (see compact_tables).
+    """
+    write_tables(
+        db=db,
+        tables=[(table, schema, df)],
+        validation=validation,
+        mode=mode,
+        keys={table: keys} if keys else None,
+        arrow=arrow,
+        index=index,
+        compact_ratio=compact_ratio,
+    )
+
+
+@contextmanager
+def transaction(db: DuckDBPyConnection) -> Iterator[DuckDBPyConnection]:
+    """Run a block in one transaction, rolled back if the block raises."""
+    db.execute("BEGIN TRANSACTION")
+    try:
+        yield db
+    except Exception:
+        db.execute("ROLLBACK")
+        raise
+    # Outside the try: a COMMIT that fails has already ended the transaction, and a ROLLBACK would hide its error
+    db.execute("COMMIT")
+
+
+def write_tables(
+    db: DuckDBPyConnection,
+    tables: list,
+    validation: str = None,
+    mode: str = "replace",
+    keys: dict = None,
+    arrow: bool = False,
+    index: bool = False,
+    compact_ratio: float = None,
+    begin: bool = True,
+) -> None:
+    """
+    Write (table, schema, df) entries in a single transaction, so readers see either the previous version of every
+    table or the new one and never a missing table. If any write fails, all of them are rolled back. Without begin the
+    entries are written in the caller's open transaction, and the caller runs compact_tables once it has committed.
+    """
+    if mode not in WRITE_MODES:
+        raise ValueError(f"Unknown write mode {mode}, expected one of {WRITE_MODES}")
+    with transaction(db) if begin else nullcontext():
+        for table, schema, df in tables:
+            _write(
+                db=db,
+                df=df,
+                table=table,
+                schema=sql_schema(schema) if schema is not None and validation in SQL_VALIDATION_MODES else None,
+                validation=validation,
+                mode=mode,
+                keys=(keys or {}).get(table) or PRIMARY_KEYS.get(table),
+                arrow=arrow,
+                index=index,
+            )
+    if begin and compact_ratio:
+        compact_tables(db=db, compact_ratio=compact_ratio)
+
+
+def run_validation_query(db: DuckDBPyConnection, schema: SqlSchema, source: str, columns: list, warnings_only: bool = False) -> None:
+    """Count the failures of every check in one scan, warning for raise_warning checks and raising SchemaError for the rest."""
+    query, labels = schema.validation_sql(source=source, columns=columns, warnings_only=warnings_only)
+    if query is None:
+        return
+    failures = [(label, count) for label, count in zip(labels, db.execute(query).fetchone()) if count]
+    for (col, check_name, _), count in [(label, count) for label, count in failures if label[2]]:
+        warnings.warn(f"{schema.name}: {check_name} failed for {count} rows of column {col}", SchemaWarning)
+    errors = [(label, count) for label, count in failures if not label[2]]
+    if errors:
+        message = ", ".join(f"{check_name} failed for {count} rows of column {col}" for (col, check_name, _), count in errors)
+        raise SchemaError(schema.schema, None, f"{schema.name}: {message}", column_name=errors[0][0][0])
+
+
+def relation_types(db: DuckDBPyConnection, relation: str) -> dict:
+    """Column name to DuckDB type of a registered frame, table or view."""
+    return dict(db.execute(f"SELECT column_name, column_type FROM (DESCRIBE SELECT * FROM {relation})").fetchall())
+
+
+def enums_as_varchar(relation: str, types: dict) -> str:
+    """
+    The relation with its ENUM columns (registered categoricals) cast to VARCHAR, which DuckDB dictionary-compresses,
+    since an ENUM column rejects categories added by later writes.
+    """
+    enums = [col for col, col_type in types.items() if col_type.startswith("ENUM")]
+    if not enums:
+        return relation
+    return f"(SELECT * REPLACE ({', '.join(f'CAST({quote(col)} AS VARCHAR) AS {quote(col)}' for col in enums)}) FROM {relation})"
+
+
+def table_columns(db: DuckDBPyConnection, table: str) -> dict:
+    """Column name to DuckDB type of an existing table, empty if the table does not exist."""
+    return dict(
+        db.execute("SELECT column_name, data_type FROM duckdb_columns() WHERE table_name = ? ORDER BY column_index", [table]).fetchall()
+    )
+
+
+def primary_key(db: DuckDBPyConnection, table: str) -> list:
+    constraints = db.execute(
+        "SELECT constraint_column_names FROM duckdb_constraints() WHERE table_name = ? AND constraint_type = 'PRIMARY KEY'", [table]
+    ).fetchall()
+    return list(constraints[0][0]) if constraints else []
+
+
+def _write(
+    db: DuckDBPyConnection,
+    df: DataFrame | pa.Table,
+    table: str,
+    schema: SqlSchema = None,
+    validation: str = None,
+    mode: str = "replace",
+    keys: list = None,
+    arrow: bool = False,
+    index: bool = False,
+) -> None:
+    """Write one frame inside the caller's transaction."""
+    if arrow and isinstance(df, DataFrame):
+        try:
+            df = to_arrow(df)
+        except pa.ArrowException as e:
+            print(f"Arrow conversion failed for {table}, registering the DataFrame instead: {e}")
+    db.register("df", df)
+    try:
+        source_types = relation_types(db=db, relation="df")
+        columns = list(source_types)
+        source = enums_as_varchar(relation="df", types=source_types)
+        select = f"SELECT * FROM {source}"
+        if schema is not None:
+            missing_columns = schema.missing_columns(columns)
+            if missing_columns:
+                raise SchemaError(schema.schema, None, f"{schema.name}: missing required columns {missing_columns}")
+            select = schema.select_sql(source=source, columns=columns)
+        cluster = cluster_columns(columns)
+        insert_select = f"{select} ORDER BY {', '.join(quote(col) for col in cluster)}" if cluster else select
+
+        if db.execute("SELECT 1 FROM duckdb_views() WHERE view_name = ? AND NOT internal", [table]).fetchall():
+            # Left by info_history or the lake when the table was last stored another way
+            db.execute(f"DROP VIEW {quote(table)}")
+        existing = table_columns(db=db, table=table) if mode == "upsert" else {}
+        if schema is not None:
+            # Constraints only cover tables created here, so an upsert into an existing table is checked by the query
+            constrained = validation == "constraints" and not existing
+            run_validation_query(db=db, schema=schema, source=f"({select})", columns=columns, warnings_only=constrained)
+
+        if mode == "replace" or not existing:
+            db.execute(f"DROP TABLE IF EXISTS {quote(table)}")
+            if cluster and table_columns(db=db, table=CLUSTERING_TABLE):
+                # The new table is written sorted
+                db.execute(f"DELETE FROM {CLUSTERING_TABLE} WHERE table_name = ?", [table])
+            if schema is not None and validation == "constraints":
+                db.execute(schema.create_table_sql(table=table, columns=source_types, primary_key=keys if mode == "upsert" else None))
+                db.execute(f"INSERT INTO {quote(table)} {insert_select}")
+            else:
+                db.execute(f"CREATE TABLE {quote(table)} AS {insert_select}")
+                if mode == "upsert" and keys:
+                    db.execute(f"ALTER TABLE {quote(table)} ADD PRIMARY KEY ({', '.join(quote(key) for key in keys)})")
+            if index and cluster and not (mode == "upsert" and keys):
+                # A primary key is already an ART index, so only keyless tables get one
+                db.execute(f"CREATE INDEX {quote(f'{table}__symbol_date')} ON {quote(table)} ({', '.join(quote(col) for col in cluster)})")
+            return
+
+        if not keys:
+            raise ValueError(f"Upsert into {table} needs a primary key")
+        if not primary_key(db=db, table=table):
+            # Tables written by replace have no key yet
+            db.execute(f"ALTER TABLE {quote(table)} ADD PRIMARY KEY ({', '.join(quote(key) for key in keys)})")
+        target_types = schema.types if schema is not None else {}
+        for col in columns:
+            if col not in existing:
+                db.execute(f"ALTER TABLE {quote(table)} ADD COLUMN {quote(col)} {target_types.get(col, source_types[col])}")
+        if table in SNAPSHOT_TABLES:
+            matches = " AND ".join(f"new.{quote(key)} = {quote(table)}.{quote(key)}" for key in keys)
+            db.execute(f"DELETE FROM {quote(table)} WHERE NOT EXISTS (SELECT 1 FROM {source} AS new WHERE {matches})")
+        # Frames usually hold every row again, so only the rows that are new or changed are written
+        matches = " AND ".join(f"old.{quote(key)} = new.{quote(key)}" for key in keys)
+        unchanged = " AND ".join(f"old.{quote(col)} IS NOT DISTINCT FROM new.{quote(col)}" for col in columns if col not in keys)
+        db.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE upsert_df AS
+            SELECT new.* FROM ({select}) AS new LEFT JOIN {quote(table)} AS old ON {matches}
+            WHERE old.{quote(keys[0])} IS NULL {f"OR NOT ({unchanged})" if unchanged else ""}
+            """
+        )
+        rows = db.execute("SELECT count(*) FROM upsert_df").fetchall()[0][0]
+        if rows:
+            order = f" ORDER BY {', '.join(quote(col) for col in cluster)}" if cluster else ""
+            db.execute(f"INSERT OR REPLACE INTO {quote(table)} BY NAME SELECT * FROM upsert_df{order}")
+            if cluster:
+                count_unsorted_rows(db=db, table=table, rows=rows)
+        # Not in a finally: after a failed statement the transaction only accepts a ROLLBACK, and the next upsert replaces it
+        db.execute("DROP TABLE upsert_df")
+    finally:
+        db.unregister("df")
+
+
+def compact_table(db: DuckDBPyConnection, table: str) -> None:
+    """
+    Re-sort a table by CLUSTER_COLUMNS. The table is recreated from its own DDL, so its primary key and check
+    constraints are kept, and filled in order; views over it bind by name and keep working. Rebuilding is several
+    times faster than deleting and reinserting the rows, which updates the primary key index row by row.
+    """
+    ddl = db.execute("SELECT sql FROM duckdb_tables() WHERE table_name = ?", [table]).fetchall()[0][0]
+    unsorted = f"{table}__unsorted"
+    db.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(unsorted)}")
+    db.execute(ddl)
+    db.execute(f"INSERT INTO {quote(table)} SELECT * FROM {quote(unsorted)} ORDER BY {', '.join(quote(col) for col in CLUSTER_COLUMNS)}")
+    db.execute(f"DROP TABLE {quote(unsorted)}")
+
+
+def count_unsorted_rows(db: DuckDBPyConnection, table: str, rows: int) -> None:
+    """Add the rows an upsert just inserted or changed in a clustered table to its count in CLUSTERING_TABLE."""
+    db.execute(f"CREATE TABLE IF NOT EXISTS {CLUSTERING_TABLE} (table_name VARCHAR PRIMARY KEY, unsorted_rows BIGINT)")
+    db.execute(
+        f"""
+        INSERT INTO {CLUSTERING_TABLE} VALUES (?, ?)
+        ON CONFLICT (table_name) DO UPDATE SET unsorted_rows = {CLUSTERING_TABLE}.unsorted_rows + EXCLUDED.unsorted_rows
+        """,
+        [table, rows],
+    )
+
+
+def compact_tables(db: DuckDBPyConnection, compact_ratio: float) -> list:
+    """
+    Re-sort every table whose rows inserted or changed by upserts since its last sort pass compact_ratio of its rows,
+    each in its own transaction, and return their names. DuckDB cannot commit a transaction that both writes a table
+    and drops it, so this runs after the write has committed.
+    """
+    if not table_columns(db=db, table=CLUSTERING_TABLE):
+        return []
+    compacted = []
+    for table, unsorted in db.execute(f"SELECT table_name, unsorted_rows FROM {CLUSTERING_TABLE} WHERE unsorted_rows > 0").fetchall():
+        if (
+            not table_columns(db=db, table=table)
+            or unsorted <= compact_ratio * db.execute(f"SELECT count(*) FROM {quote(table)}").fetchall()[0][0]
+        ):
+            continue
+        with transaction(db):
+            compact_table(db=db, table=table)
+            db.execute(f"UPDATE {CLUSTERING_TABLE} SET unsorted_rows = 0 WHERE table_name = ?", [table])
+        compacted.append(table)
+    return compacted
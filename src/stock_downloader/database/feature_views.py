@@ -0,0 +1,69 @@
+from duckdb import DuckDBPyConnection
+
+from stock_downloader.database.db import table_columns
+from stock_downloader.database.sql_schema import quote
+from stock_downloader.technical_analysis.custom_functions import SQL_WINDOW
+from stock_downloader.technical_analysis.ta_definitions import (
+    custom_ta_sets__ma_ratio,
+    custom_ta_sets__change_ratio,
+    custom_ta_sets__future,
+    custom_ta_sets__regression_channel,
+    custom_ta_sets__regression_channel_ma,
+)
+
+# Custom TA tables that can be views over the stored tables, in dependency order. Sources are (table, columns.toml
+# section) pairs joined on (symbol, date), the same inner merges the pandas path runs the functions on.
+FEATURE_VIEWS: dict = {
+    "ta__ma_ratio": {"functions": custom_ta_sets__ma_ratio, "sources": [("price", "price"), ("talib", "ta__talib")]},
+    "ta__change": {"functions": custom_ta_sets__change_ratio, "sources": [("price", "price")]},
+    "ma_future": {"functions": custom_ta_sets__future, "sources": [("price", "price")]},
+    "regression_indicators": {
+        "functions": custom_ta_sets__regression_channel,
+        "sources": [("price", "price"), ("regression", "regression")],
+    },
+    "regression_indicators_ma": {
+        "functions": custom_ta_sets__regression_channel_ma,
+        "sources": [("regression_indicators", "regression_indicators")],
+    },
+}
+
+
+def feature_view_sql(view: str, column_mappings: dict, available: dict = None) -> str:
+    """
+    SELECT computing a custom TA table from its sources with window functions over each symbol's rows in date order.
+    Function inputs are found through the sources' column mappings; with available (table to its columns), functions
+    whose inputs are missing are skipped, as the pandas path skips them.
+    """
+    spec = FEATURE_VIEWS[view]
+    first = quote(spec["sources"][0][0])
+    outputs = column_mappings.get(view)
+    expressions = [f"{first}.symbol AS symbol", f"{first}.date AS date"]
+    for function_set in spec["functions"]:
+        output_name = function_set.get("output")
+        if output_name not in outputs:
+            continue
+        columns = {}
+        for arg, name in function_set.get("columns").items():
+            for table, section in spec["sources"]:
+                column = column_mappings.get(section).get(name)
+                if column is not None and (available is None or column in available.get(table, ())):
+                    columns[arg] = f"{quote(table)}.{quote(column)}"
+                    break
+        if len(columns) < len(function_set.get("columns")):
+            print(f"# Skipped column {output_name}: inputs not found")
+            continue
+        expressions.append(f"CAST({function_set.get('func').to_sql(columns)} AS FLOAT) AS {quote(outputs[output_name])}")
+    joins = "".join(f" JOIN {quote(table)} USING (symbol, date)" for table, _ in spec["sources"][1:])
+    return (
+        f"SELECT {', '.join(expressions)} FROM {first}{joins} "
+        f"WINDOW {SQL_WINDOW} AS (PARTITION BY {first}.symbol ORDER BY {first}.date)"
+    )
+
+
+def create_feature_views(db: DuckDBPyConnection, column_mappings: dict, views: list = None) -> None:
+    """Create (or replace) the custom TA views, dropping stored tables of the same names."""
+    for view in views or FEATURE_VIEWS:
+        available = {table: table_columns(db=db, table=table) for table, _ in FEATURE_VIEWS[view]["sources"]}
+        if db.execute("SELECT 1 FROM duckdb_tables() WHERE table_name = ?", [view]).fetchone():
+            db.execute(f"DROP TABLE {quote(view)}")
+        db.execute(f"CREATE OR REPLACE VIEW {quote(view)} AS {feature_view_sql(view, column_mappings, available)}")
@@ -0,0 +1,109 @@
+from duckdb import DuckDBPyConnection
+from contextlib import nullcontext
+from pandas import DataFrame, Timestamp
+import pyarrow as pa
+
+from stock_downloader.data.info_tables import INFO_TABLES, is_quote_column
+from stock_downloader.database.db import enums_as_varchar, relation_types, table_columns, transaction
+from stock_downloader.database.sql_schema import quote
+
+HISTORY_SUFFIX: str = "__history"
+HISTORY_COLUMNS: list = ["record_hash", "valid_from", "valid_to"]
+
+
+def history_table(table: str) -> str:
+    return f"{table}{HISTORY_SUFFIX}"
+
+
+def write_history(db: DuckDBPyConnection, df: DataFrame | pa.Table, table: str, as_of: Timestamp = None, begin: bool = True) -> int:
+    """
+    Record a frame of info records as slowly changing (type 2) history in <table>__history and return the number of
+    symbols that changed. Each record is hashed without its quote fields (see is_quote_column); only symbols whose
+    hash differs from their current version get a new row valid from as_of, and the version it replaces is closed
+    with valid_to = as_of. Quote fields are stored too: the current version of every other symbol takes their new
+    values in place, so a version keeps the last quote seen while it was current. The frame is a snapshot, so the
+    current versions of symbols missing from it are closed too. The table itself becomes a view of the current
+    versions with every column written. Without begin it runs in the caller's open transaction.
+    """
+    as_of = (as_of or Timestamp.now()).to_pydatetime()
+    history = history_table(table)
+    with transaction(db) if begin else nullcontext():
+        db.register("history_df", df)
+        try:
+            source_types = relation_types(db=db, relation="history_df")
+            columns = [col for col in source_types if col != "symbol"]
+            fields = ", ".join(f"{quote(col)} := {quote(col)}" for col in sorted(columns) if not is_quote_column(col))
+            db.execute(
+                f"""
+                CREATE OR REPLACE TEMP TABLE history_new AS
+                SELECT symbol, md5(to_json(struct_pack({fields}))) AS record_hash, {', '.join(quote(col) for col in columns)}
+                FROM {enums_as_varchar(relation="history_df", types=source_types)}
+                """
+            )
+        finally:
+            db.unregister("history_df")
+
+        existing = table_columns(db=db, table=history)
+        new_types = relation_types(db=db, relation="history_new")
+        if not existing:
+            db.execute(
+                f"CREATE TABLE {quote(history)} AS SELECT *, NULL::TIMESTAMP AS valid_from, NULL::TIMESTAMP AS valid_to "
+                "FROM history_new WHERE false"
+            )
+            db.execute(f"ALTER TABLE {quote(history)} ADD PRIMARY KEY (symbol, valid_from)")
+        for col in columns:
+            if existing and col not in existing:
+                db.execute(f"ALTER TABLE {quote(history)} ADD COLUMN {quote(col)} {new_types[col]}")
+        db.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE history_changed AS
+            SELECT history_new.* FROM history_new
+            LEFT JOIN {quote(history)} AS current ON current.symbol = history_new.symbol AND current.valid_to IS NULL
+            WHERE current.record_hash IS DISTINCT FROM history_new.record_hash
+            """
+        )
+        db.execute(
+            f"""
+            UPDATE {quote(history)} SET valid_to = ?
+            WHERE valid_to IS NULL
+            AND (symbol IN (SELECT symbol FROM history_changed) OR symbol NOT IN (SELECT symbol FROM history_new))
+            """,
+            [as_of],
+        )
+        quotes = [col for col in columns if is_quote_column(col)]
+        if quotes:
+            db.execute(
+                f"""
+                UPDATE {quote(history)} SET {', '.join(f'{quote(col)} = history_new.{quote(col)}' for col in quotes)}
+                FROM history_new
+                WHERE {quote(history)}.symbol = history_new.symbol AND {quote(history)}.valid_to IS NULL
+                AND history_new.symbol NOT IN (SELECT symbol FROM history_changed)
+                """
+            )
+        db.execute(f"INSERT INTO {quote(history)} BY NAME SELECT *, ?::TIMESTAMP AS valid_from FROM history_changed", [as_of])
+        changed = db.execute("SELECT count(*) FROM history_changed").fetchall()[0][0]
+        if db.execute("SELECT 1 FROM duckdb_tables() WHERE table_name = ?", [table]).fetchall():
+            db.execute(f"DROP TABLE {quote(table)}")
+        db.execute(
+            f"CREATE OR REPLACE VIEW {quote(table)} AS SELECT * EXCLUDE ({', '.join(HISTORY_COLUMNS)}) "
+            f"FROM {quote(history)} WHERE valid_to IS NULL"
+        )
+        # Not in a finally: after a failed statement the transaction only accepts a ROLLBACK, and the next write replaces them
+        db.execute("DROP TABLE history_new")
+        db.execute("DROP TABLE history_changed")
+    return changed
+
+
+def write_history_tables(db: DuckDBPyConnection, tables: list, as_of: Timestamp = None, begin: bool = True) -> list:
+    """
+    Write the info tables among (table, schema, df) entries as history and return the other entries. Each table is
+    written in its own transaction, or without begin in the caller's one.
+    """
+    as_of = as_of or Timestamp.now()
+    remaining = []
+    for table, schema, df in tables:
+        if table in INFO_TABLES:
+            write_history(db=db, df=df, table=table, as_of=as_of, begin=begin)
+        else:
+            remaining.append((table, schema, df))
+    return remaining
@@ -0,0 +1,217 @@
+from duckdb import DuckDBPyConnection
+from pandas import DataFrame
+from pathlib import Path, PosixPath, WindowsPath
+import pyarrow as pa
+import shutil
+import uuid
+
+from stock_downloader.data.info_tables import split_info_tables
+from stock_downloader.database.db import (
+    PRIMARY_KEYS,
+    SNAPSHOT_TABLES,
+    compact_tables,
+    relation_types,
+    run_validation_query,
+    transaction,
+    write_tables,
+)
+from stock_downloader.database.history import write_history_tables
+from stock_downloader.database.latest import refresh_latest_features
+from stock_downloader.database.sql_schema import SQL_VALIDATION_MODES, quote, sql_schema
+
+
+class ParquetLake:
+    """
+    Tables stored as hive-partitioned parquet under <path>/<table>/bucket=<n>/year=<yyyy>/, sorted by (symbol, date)
+    within each file. The bucket is a stable md5 hash of the symbol, so a symbol always lands in the same partition.
+    Incremental writes only rewrite the partitions the new rows touch, and the DuckDB database exposes each table as a view.
+    """
+
+    STAGING_FOLDER: str = "_staging"
+    FILE_PREFIX: str = "data_"
+    PARTITIONED_SUFFIX: str = "__partitioned"
+
+    def __init__(self, path: str | PosixPath | WindowsPath, buckets: int = 32, row_group_size: int = 122880) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.buckets = buckets
+        self.row_group_size = row_group_size
+
+    def table_path(self, table: str) -> Path:
+        return self.path / table
+
+    def bucket_sql(self, symbol_column: str = "symbol") -> str:
+        return f"CAST('0x' || md5({quote(symbol_column)})[1:8] AS BIGINT) % {self.buckets}"
+
+    @staticmethod
+    def partition_columns(columns: list) -> list:
+        return ["bucket", "year"] if "date" in columns else ["bucket"]
+
+    @staticmethod
+    def partition_path(root: Path, partition: tuple, partition_columns: list) -> Path:
+        return root.joinpath(*[f"{name}={value}" for name, value in zip(partition_columns, partition)])
+
+    def write(
+        self,
+        db: DuckDBPyConnection,
+        df: DataFrame | pa.Table,
+        table: str,
+        schema: str = None,
+        validation: str = None,
+        keys: list = None,
+        incremental: bool = True,
+    ) -> list:
+        """
+        Write a frame to the lake and return the partitions written. Incremental writes merge the new rows into the
+        partitions they touch, replacing rows with the same keys, and leave every other partition untouched.
+        """
+        keys = keys or PRIMARY_KEYS.get(table, ["symbol"])
+        db.register("lake_df", df)
+        try:
+            columns = [row[0] for row in db.execute("DESCRIBE SELECT * FROM lake_df").fetchall()]
+            partition_columns = self.partition_columns(columns)
+            select = "SELECT * FROM lake_df"
+            if schema is not None and validation in SQL_VALIDATION_MODES:
+                # Parquet carries no constraints, so the schema checks always run as one query
+                compiled = sql_schema(schema)
+                select = compiled.select_sql(source="lake_df", columns=columns)
+                run_validation_query(db=db, schema=compiled, source=f"({select})", columns=columns)
+            year = ", year(date) AS year" if "year" in partition_columns else ""
+            db.execute(f"CREATE OR REPLACE TEMP TABLE lake_new AS SELECT *, {self.bucket_sql()} AS bucket{year} FROM ({select})")
+        finally:
+            db.unregister("lake_df")
+
+        partitions = [tuple(row) for row in db.execute(f"SELECT DISTINCT {', '.join(partition_columns)} FROM lake_new").fetchall()]
+        existing_files = [
+            file.as_posix()
+            for partition in partitions
+            for file in self.partition_path(self.table_path(table), partition, partition_columns).glob("*.parquet")
+            if incremental
+        ]
+        source = "lake_new"
+        if existing_files:
+            join = " AND ".join(f"stored.{quote(key)} = lake_new.{quote(key)}" for key in keys)
+            db.execute(
+                f"""
+                CREATE OR REPLACE TEMP TABLE lake_merged AS
+                SELECT stored.* FROM read_parquet({existing_files}, hive_partitioning = true, union_by_name = true) AS stored
+                WHERE NOT EXISTS (SELECT 1 FROM lake_new WHERE {join})
+                UNION ALL BY NAME
+                SELECT * FROM lake_new
+                """
+            )
+            source = "lake_merged"
+
+        staging = self.path / self.STAGING_FOLDER / table
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.parent.mkdir(parents=True, exist_ok=True)
+        order = ", ".join(quote(col) for col in ["symbol", "date"] if col in columns)
+        if partitions:
+            db.execute(
+                f"COPY (SELECT * FROM {source}{f' ORDER BY {order}' if order else ''}) TO '{staging.as_posix()}' "
+                f"(FORMAT parquet, PARTITION_BY ({', '.join(partition_columns)}), ROW_GROUP_SIZE {self.row_group_size}, "
+                f"FILENAME_PATTERN '{self.FILE_PREFIX}{{uuid}}')"
+            )
+        elif not incremental:
+            # An empty snapshot still replaces the table, with one empty file that keeps the view's columns
+            partitions = [tuple(0 for _ in partition_columns)]
+            empty = self.partition_path(staging, partitions[0], partition_columns)
+            empty.mkdir(parents=True)
+            db.execute(
+                f"COPY (SELECT * EXCLUDE ({', '.join(partition_columns)}) FROM lake_new) "
+                f"TO '{(empty / f'{self.FILE_PREFIX}{uuid.uuid4()}.parquet').as_posix()}'"
+            )
+        db.execute("DROP TABLE IF EXISTS lake_new")
+        db.execute("DROP TABLE IF EXISTS lake_merged")
+
+        # New files have new names, so they are moved in next to the files they replace, which are deleted afterwards:
+        # readers never miss a partition, and a crash at worst leaves both versions of one on disk
+        replaced = list(self.table_path(table).glob("**/*.parquet")) if not incremental else [Path(file) for file in existing_files]
+        for partition in partitions:
+            target = self.partition_path(self.table_path(table), partition, partition_columns)
+            target.mkdir(parents=True, exist_ok=True)
+            for file in self.partition_path(staging, partition, partition_columns).glob("*.parquet"):
+                file.replace(target / file.name)
+        for file in replaced:
+            file.unlink(missing_ok=True)
+        for folder in sorted(self.table_path(table).glob("**/"), key=lambda folder: len(folder.parts), reverse=True):
+            if folder != self.table_path(table) and not any(folder.iterdir()):
+                folder.rmdir()
+        shutil.rmtree(staging, ignore_errors=True)
+        return partitions
+
+    def create_view(self, db: DuckDBPyConnection, table: str) -> None:
+        """
+        Expose a lake table in the database as a view of its own columns, replacing a table of the same name, and as
+        <table>__partitioned, which adds the bucket and year partition columns. Queries on the latter prune to the
+        partitions of one symbol with WHERE bucket = symbol_bucket('AAPL') and to a date range with the year column.
+        """
+        db.execute(f"CREATE OR REPLACE MACRO symbol_bucket(symbol) AS {self.bucket_sql()}")
+        if db.execute("SELECT 1 FROM duckdb_tables() WHERE table_name = ?", [table]).fetchall():
+            db.execute(f"DROP TABLE {quote(table)}")
+        files = (self.table_path(table) / "**" / "*.parquet").as_posix()
+        partitioned = f"{table}{self.PARTITIONED_SUFFIX}"
+        db.execute(
+            f"CREATE OR REPLACE VIEW {quote(partitioned)} AS "
+            f"SELECT * FROM read_parquet('{files}', hive_partitioning = true, union_by_name = true)"
+        )
+        partition_columns = [col for col in ["bucket", "year"] if col in relation_types(db=db, relation=quote(partitioned))]
+        db.execute(f"CREATE OR REPLACE VIEW {quote(table)} AS SELECT * EXCLUDE ({', '.join(partition_columns)}) FROM {quote(partitioned)}")
+
+    def write_tables(self, db: DuckDBPyConnection, tables: list, validation: str = None, incremental: bool = True) -> None:
+        """Write (table, schema, df) entries to the lake and point the database views at them. SNAPSHOT_TABLES are always rewritten whole."""
+        for table, schema, df in tables:
+            self.write(
+                db=db, df=df, table=table, schema=schema, validation=validation, incremental=incremental and table not in SNAPSHOT_TABLES
+            )
+            self.create_view(db=db, table=table)
+
+
+def load_lake(config: dict) -> ParquetLake | None:
+    """Build the parquet lake from the [lake] config section, or None if it is disabled."""
+    lake_config = config.get("lake", {})
+    if not lake_config.get("enabled", False):
+        return None
+    return ParquetLake(
+        path=lake_config.get("lake_folder"),
+        buckets=lake_config.get("buckets", 32),
+        row_group_size=lake_config.get("row_group_size", 122880),
+    )
+
+
+def write_to_store(db: DuckDBPyConnection, tables: list, config: dict) -> None:
+    """
+    Write (table, schema, df) entries to the configured store: the parquet lake, exposed as views, if [lake] is
+    enabled, otherwise DuckDB tables as set in [database]. Upsert mode makes lake writes incremental. With [database]
+    latest_features, the latest_features table is refreshed for the symbols written, and with split_info the info
+    tables are written as their normalized parts (see split_info). With info_history, the info tables are kept as
+    change-only history in DuckDB (see write_history) instead, in the same transaction as the other tables; parquet
+    files are outside any transaction, so with the lake the history is committed before the lake is written.
+    """
+    database_config = config.get("database", {})
+    history = database_config.get("info_history", False)
+    if database_config.get("split_info", False):
+        tables = split_info_tables(tables)
+    validation = config.get("validation", {}).get("engine")
+    lake = load_lake(config=config)
+    if lake is not None:
+        if history:
+            tables = write_history_tables(db=db, tables=tables)
+        lake.write_tables(db=db, tables=tables, validation=validation, incremental=database_config.get("write_mode") == "upsert")
+    else:
+        with transaction(db):
+            if history:
+                tables = write_history_tables(db=db, tables=tables, begin=False)
+            write_tables(
+                db=db,
+                tables=tables,
+                validation=validation,
+                mode=database_config.get("write_mode", "replace"),
+                arrow=database_config.get("arrow", False),
+                index=database_config.get("index", False),
+                begin=False,
+            )
+        if database_config.get("compact_ratio"):
+            compact_tables(db=db, compact_ratio=database_config.get("compact_ratio"))
+    if database_config.get("latest_features", False):
+        refresh_latest_features(db=db, tables=tables)
@@ -0,0 +1,78 @@
+from duckdb import DuckDBPyConnection
+
+from stock_downloader.database.db import table_columns, transaction
+from stock_downloader.database.sql_schema import quote
+
+LATEST_TABLE: str = "latest_features"
+
+# Tables whose newest row per symbol is kept in LATEST_TABLE, each source's columns updated only when it is written
+LATEST_SOURCES: list = ["price", "talib", "regression", "regression_indicators", "ta__ma_ratio"]
+
+
+def latest_column(table: str, column: str) -> str:
+    """Name of a source column in LATEST_TABLE; every source has a date, so dates are prefixed with their table."""
+    return f"{table}_date" if column == "date" else column
+
+
+def latest_source_columns(db: DuckDBPyConnection, table: str) -> dict:
+    """The columns of a source table kept in LATEST_TABLE and their types, empty for tables without a date."""
+    source_types = table_columns(db=db, table=table)
+    return {col: col_type for col, col_type in source_types.items() if col != "symbol"} if "date" in source_types else {}
+
+
+def add_latest_columns(db: DuckDBPyConnection, tables: list) -> None:
+    """Create LATEST_TABLE and add the columns of the source tables it does not have yet."""
+    existing = table_columns(db=db, table=LATEST_TABLE)
+    if not existing:
+        db.execute(f"CREATE TABLE {LATEST_TABLE} (symbol VARCHAR PRIMARY KEY)")
+    for table in tables:
+        for col, col_type in latest_source_columns(db=db, table=table).items():
+            name = latest_column(table, col)
+            if name not in existing:
+                db.execute(f"ALTER TABLE {LATEST_TABLE} ADD COLUMN {quote(name)} {col_type}")
+                existing[name] = col_type
+
+
+def refresh_latest(db: DuckDBPyConnection, table: str, symbols: str = None) -> None:
+    """
+    Upsert the newest row of each symbol of a source table into LATEST_TABLE, replacing only that table's columns,
+    which add_latest_columns must have added. symbols is a relation with a symbol column, such as the registered frame
+    just written; None refreshes every symbol.
+    """
+    columns = list(latest_source_columns(db=db, table=table))
+    if not columns:
+        return
+    names = [latest_column(table, col) for col in columns]
+    where = f"WHERE symbol IN (SELECT symbol FROM {symbols})" if symbols else ""
+    db.execute(
+        f"""
+        INSERT INTO {LATEST_TABLE} (symbol, {', '.join(quote(name) for name in names)})
+        SELECT symbol, {', '.join(quote(col) for col in columns)} FROM {quote(table)} {where}
+        QUALIFY row_number() OVER (PARTITION BY symbol ORDER BY date DESC NULLS LAST) = 1
+        ON CONFLICT (symbol) DO UPDATE SET {', '.join(f'{quote(name)} = EXCLUDED.{quote(name)}' for name in names)}
+        """
+    )
+
+
+def refresh_latest_features(db: DuckDBPyConnection, tables: list) -> None:
+    """
+    Refresh LATEST_TABLE for the (table, schema, df) entries just written, in one transaction. Only the symbols in
+    each frame are recomputed, which zone maps on the (symbol, date) sorted tables keep cheap; a None frame refreshes all.
+    The sources' new columns are added in a transaction of their own first, since DuckDB fails the commit of a
+    transaction that upserts into a table it altered for another source.
+    """
+    sources = [(table, df) for table, _, df in tables if table in LATEST_SOURCES]
+    if not sources:
+        return
+    with transaction(db):
+        add_latest_columns(db=db, tables=[table for table, _ in sources])
+    with transaction(db):
+        for table, df in sources:
+            if df is None:
+                refresh_latest(db=db, table=table)
+                continue
+            db.register("latest_df", df)
+            try:
+                refresh_latest(db=db, table=table, symbols="latest_df")
+            finally:
+                db.unregister("latest_df")
@@ -0,0 +1,108 @@
+from duckdb import DuckDBPyConnection
+from pandas import DataFrame, Timedelta, Timestamp, date_range
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import numpy as np
+
+from stock_downloader.database.db import connect_database, write_table
+
+
+def lookup_latency(db: DuckDBPyConnection, table: str, symbols: list, start: Timestamp, end: Timestamp, repeats: int = 20) -> dict:
+    """Median milliseconds of a point lookup (one symbol and date) and a range lookup (one symbol between two dates)."""
+    point, range_ = [], []
+    for i in range(repeats):
+        symbol = symbols[i % len(symbols)]
+        began = perf_counter()
+        db.execute(f"SELECT * FROM {table} WHERE symbol = ? AND date = ?", [symbol, end]).fetchall()
+        point.append(perf_counter() - began)
+        began = perf_counter()
+        db.execute(f"SELECT * FROM {table} WHERE symbol = ? AND date BETWEEN ? AND ?", [symbol, start, end]).fetchall()
+        range_.append(perf_counter() - began)
+    return {"point_ms": round(median(point) * 1000, 3), "range_ms": round(median(range_) * 1000, 3)}
+
+
+def synthetic_prices(symbols: int = 2000, days: int = 1000, seed: int = 42) -> DataFrame:
+    """Daily prices for a number of symbols, shuffled the way frames arrive from concurrent downloads."""
+    rng = np.random.default_rng(seed)
+    dates = date_range("2020-01-01", periods=days, freq="D")
+    df = DataFrame(
+        {
+            "symbol": np.repeat([f"S{i:04d}" for i in range(symbols)], days),
+            "date": np.tile(dates.values, symbols),
+            "close": rng.random(symbols * days).astype("float32"),
+            "volume": rng.integers(0, 1_000_000, symbols * days),
+        }
+    )
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def run_benchmark(symbols: int = 2000, days: int = 1000, row_group_size: int = 122880, repeats: int = 20) -> dict:
+    """Lookup latency of the same prices written unsorted, sorted by (symbol, date), and sorted with an ART index."""
+    df = synthetic_prices(symbols=symbols, days=days)
+    lookup_symbols = sorted(df["symbol"].unique())[:: max(symbols // repeats, 1)]
+    end = df["date"].max()
+    start = end - (end - df["date"].min()) / 10
+    results = {}
+    with TemporaryDirectory() as folder:
+        db = connect_database(Path(folder) / "benchmark.db", row_group_size=row_group_size)
+        db.register("df", df)
+        db.execute("CREATE TABLE unsorted AS SELECT * FROM df")
+        db.unregister("df")
+        write_table(db=db, df=df, table="clustered")
+        write_table(db=db, df=df, table="indexed", index=True)
+        for table in ["unsorted", "clustered", "indexed"]:
+            results[table] = lookup_latency(db=db, table=table, symbols=lookup_symbols, start=start, end=end, repeats=repeats)
+        db.close()
+    return results
+
+
+def incremental_prices(symbols: int, end: Timestamp, window: int = 30, seed: int = 42) -> DataFrame:
+    """The last window days of prices up to end for every symbol, as an incremental download returns them."""
+    dates = date_range(end=end, periods=window, freq="D")
+    df = DataFrame(
+        {
+            "symbol": np.repeat([f"S{i:04d}" for i in range(symbols)], window),
+            "date": np.tile(dates.values, symbols),
+            "close": np.random.default_rng(seed).random(symbols * window).astype("float32"),
+            "volume": 1,
+        }
+    )
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def run_upsert_benchmark(
+    symbols: int = 2000, days: int = 1000, runs: int = 30, window: int = 30, compact_ratio: float = 0.25, repeats: int = 20
+) -> dict:
+    """
+    Lookup latency of an upserted table when first written, after runs daily incremental upserts of window days each,
+    and after the same upserts with compact_ratio re-sorting (see track_clustering).
+    """
+    df = synthetic_prices(symbols=symbols, days=days)
+    lookup_symbols = sorted(df["symbol"].unique())[:: max(symbols // repeats, 1)]
+    results = {}
+    with TemporaryDirectory() as folder:
+        db = connect_database(Path(folder) / "benchmark.db")
+        end = df["date"].max()
+        write_table(db=db, df=df, table="decayed", mode="upsert", keys=["symbol", "date"])
+        write_table(db=db, df=df, table="compacted", mode="upsert", keys=["symbol", "date"], compact_ratio=compact_ratio)
+        results["fresh"] = lookup_latency(
+            db=db, table="decayed", symbols=lookup_symbols, start=end - (end - df["date"].min()) / 10, end=end
+        )
+        for run in range(runs):
+            end = end + Timedelta(days=1)
+            recent = incremental_prices(symbols=symbols, end=end, window=window, seed=run)
+            write_table(db=db, df=recent, table="decayed", mode="upsert", keys=["symbol", "date"])
+            write_table(db=db, df=recent, table="compacted", mode="upsert", keys=["symbol", "date"], compact_ratio=compact_ratio)
+        db.execute("CHECKPOINT")
+        start = end - (end - df["date"].min()) / 10
+        for table in ["decayed", "compacted"]:
+            results[f"{table} after {runs} upserts"] = lookup_latency(db=db, table=table, symbols=lookup_symbols, start=start, end=end)
+        db.close()
+    return results
+
+
+if __name__ == "__main__":
+    for table, latency in {**run_benchmark(), **run_upsert_benchmark()}.items():
+        print(f"{table}: point {latency['point_ms']} ms, range {latency['range_ms']} ms")
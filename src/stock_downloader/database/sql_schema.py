@@ -0,0 +1,132 @@
+from pandas import Timestamp
+from pandera.pandas import DataFrameSchema
+from functools import lru_cache
+
+from stock_downloader.schemas.dtype_plans import SCHEMAS
+
+# Pandera dtypes used by the schemas and the DuckDB column type each one is stored as
+DUCKDB_TYPES: dict = {
+    "object": "VARCHAR",
+    "bool": "BOOLEAN",
+    "Int8": "TINYINT",
+    "Int16": "SMALLINT",
+    "Int32": "INTEGER",
+    "Int64": "BIGINT",
+    "float32": "FLOAT",
+    "float64": "DOUBLE",
+    "datetime64[ns]": "TIMESTAMP",
+}
+
+# How the table is validated on load: "constraints" creates it with NOT NULL/UNIQUE/CHECK constraints that DuckDB
+# enforces on insert, "query" runs one aggregate query over the registered frame before creating the table
+SQL_VALIDATION_MODES: list = ["constraints", "query"]
+
+
+def quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def sql_literal(value) -> str:
+    if isinstance(value, Timestamp):
+        return f"TIMESTAMP '{value.isoformat(sep=' ')}'"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return repr(value)
+
+
+def check_condition(column: str, check) -> str:
+    """SQL boolean expression that is true for the values passing a pandera check."""
+    statistics = check.statistics
+    if check.name == "greater_than_or_equal_to":
+        condition = f"{quote(column)} >= {sql_literal(statistics['min_value'])}"
+    elif check.name == "less_than_or_equal_to":
+        condition = f"{quote(column)} <= {sql_literal(statistics['max_value'])}"
+    elif check.name == "str_length":
+        bounds = []
+        if statistics.get("min_value") is not None:
+            bounds.append(f"length({quote(column)}) >= {statistics['min_value']}")
+        if statistics.get("max_value") is not None:
+            bounds.append(f"length({quote(column)}) <= {statistics['max_value']}")
+        condition = " AND ".join(bounds) or "TRUE"
+    else:
+        raise ValueError(f"Check {check.name} on column {column} has no SQL equivalent")
+    # A CHECK constraint passes on NULL, so the condition only needs to reject nulls when they are not ignored
+    return condition if check.ignore_na else f"{quote(column)} IS NOT NULL AND {condition}"
+
+
+class SqlSchema:
+    """
+    A pandera DataFrameSchema compiled to DuckDB: typed columns with NOT NULL, UNIQUE and CHECK constraints,
+    a SELECT that casts a registered frame to those types, and one aggregate query counting the failures of every check.
+    Checks raised as warnings are left out of the constraints and only reported by the query.
+    """
+
+    def __init__(self, schema: DataFrameSchema, name: str = None) -> None:
+        self.schema = schema
+        self.name = name or schema.name
+        self.types = {col: DUCKDB_TYPES[str(column.dtype)] for col, column in schema.columns.items()}
+        self.required = [col for col, column in schema.columns.items() if column.required]
+        self.not_nullable = [col for col, column in schema.columns.items() if not column.nullable]
+        self.unique = [col for col, column in schema.columns.items() if column.unique]
+        self.checks = [
+            (col, check.name, check_condition(column=col, check=check), check.raise_warning)
+            for col, column in schema.columns.items()
+            for check in column.checks
+        ]
+
+    def missing_columns(self, columns: list) -> list:
+        return [col for col in self.required if col not in columns]
+
+    def column_definitions(self, columns: dict) -> list:
+        """Definitions for the given columns (name to the DuckDB type in the source); schema columns take the schema type."""
+        definitions = []
+        for col, source_type in columns.items():
+            definition = f"{quote(col)} {self.types.get(col, source_type)}"
+            if col in self.not_nullable:
+                definition += " NOT NULL"
+            if col in self.unique:
+                definition += " UNIQUE"
+            conditions = [condition for name, _, condition, raise_warning in self.checks if name == col and not raise_warning]
+            definition += "".join(f" CHECK ({condition})" for condition in conditions)
+            definitions.append(definition)
+        return definitions
+
+    def create_table_sql(self, table: str, columns: dict, primary_key: list = None) -> str:
+        definitions = self.column_definitions(columns)
+        if primary_key:
+            definitions.append(f"PRIMARY KEY ({', '.join(quote(col) for col in primary_key)})")
+        return f"CREATE TABLE {quote(table)} ({', '.join(definitions)})"
+
+    def select_sql(self, source: str, columns: list) -> str:
+        """SELECT from the source that casts each schema column to its DuckDB type and keeps the others as they are."""
+        expressions = [f"CAST({quote(col)} AS {self.types[col]}) AS {quote(col)}" if col in self.types else quote(col) for col in columns]
+        return f"SELECT {', '.join(expressions)} FROM {source}"
+
+    def validation_sql(self, source: str, columns: list, warnings_only: bool = False) -> tuple[str, list]:
+        """
+        One aggregate query over the source with a failure count per check, returned with the
+        (column, check, raise_warning) label of each count. None if there is nothing to check.
+        """
+        labels, counts = [], []
+        for col, check_name, condition, raise_warning in self.checks:
+            if col in columns and (raise_warning or not warnings_only):
+                labels.append((col, check_name, raise_warning))
+                counts.append(f"count_if(NOT coalesce({condition}, TRUE))")
+        if not warnings_only:
+            for col in self.not_nullable:
+                if col in columns:
+                    labels.append((col, "not_nullable", False))
+                    counts.append(f"count_if({quote(col)} IS NULL)")
+            for col in self.unique:
+                if col in columns:
+                    labels.append((col, "unique", False))
+                    counts.append(f"count({quote(col)}) - count(DISTINCT {quote(col)})")
+        if not counts:
+            return None, labels
+        return f"SELECT {', '.join(counts)} FROM {source}", labels
+
+
+@lru_cache(maxsize=None)
+def sql_schema(table: str) -> SqlSchema:
+    """Compiled SQL schema for a table, keyed by its columns.toml section."""
+    return SqlSchema(SCHEMAS[table], name=table)
@@ -0,0 +1,112 @@
+from pandas import DataFrame
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Empty, Queue
+from threading import Thread
+from time import perf_counter
+import pyarrow as pa
+
+from stock_downloader.database.connection import DatabaseManager
+from stock_downloader.database.lake import write_to_store
+from stock_downloader.utilities import to_arrow
+
+
+class TableWriter:
+    """
+    Writes tables as soon as they are submitted. Frames are prepared (converted to Arrow when [database] arrow is set)
+    on a thread pool, and one writer thread writes whatever is ready as a single transaction through its cursor of the
+    database. submit returns a future that resolves once the table is queryable.
+    """
+
+    def __init__(self, database: DatabaseManager, config: dict, workers: int = 4) -> None:
+        self.config = config
+        self.arrow = config.get("database", {}).get("arrow", False)
+        self.database = database
+        self.latency: dict = {}
+        self._closed = False
+        self._futures: list = []
+        self._queue: Queue = Queue()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="table-prepare")
+        self._thread = Thread(target=self._run, name="table-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def submit(self, table: str, schema: str, df: DataFrame | pa.Table) -> Future:
+        """Queue a frame for writing to table, validated against the schema (its columns.toml section)."""
+        done = Future()
+        submitted = perf_counter()
+        prepared = self._pool.submit(self._prepare, df)
+        prepared.add_done_callback(lambda future: self._queue.put((table, schema, future, done, submitted)))
+        self._futures.append(done)
+        return done
+
+    def _prepare(self, df: DataFrame | pa.Table) -> DataFrame | pa.Table:
+        if not self.arrow or not isinstance(df, DataFrame):
+            return df
+        try:
+            return to_arrow(df)
+        except pa.ArrowException as e:
+            print(f"Arrow conversion failed, writing the DataFrame instead: {e}")
+            return df
+
+    def _run(self) -> None:
+        self.db = self.database.cursor()
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            # Take everything else that is ready so it shares the transaction
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+            stop = None in batch
+            batch = [item for item in batch if item is not None]
+            if batch:
+                self._write_batch(batch)
+        self.db.close()
+
+    def _write_batch(self, batch: list) -> None:
+        ready = []
+        for table, schema, prepared, done, submitted in batch:
+            if prepared.exception() is not None:
+                done.set_exception(prepared.exception())
+            else:
+                ready.append((table, schema, prepared.result(), done, submitted))
+        if not ready:
+            return
+        try:
+            write_to_store(db=self.db, tables=[(table, schema, df) for table, schema, df, _, _ in ready], config=self.config)
+        except Exception as e:
+            if len(ready) == 1:
+                ready[0][3].set_exception(e)
+                return
+            # Write the tables one at a time so a failure only fails its own table
+            for item in ready:
+                self._write_batch([(item[0], item[1], _completed(item[2]), item[3], item[4])])
+            return
+        for table, _, _, done, submitted in ready:
+            self.latency[table] = perf_counter() - submitted
+            done.set_result(table)
+
+    def close(self) -> dict:
+        """Wait for every submitted table and return the seconds each table took to become queryable."""
+        if not self._closed:
+            self._closed = True
+            self._pool.shutdown(wait=True)
+            self._queue.put(None)
+            self._thread.join()
+        errors = [future.exception() for future in self._futures if future.exception() is not None]
+        if errors:
+            raise errors[0]
+        return self.latency
+
+
+def _completed(result) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
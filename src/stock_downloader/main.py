@@ -5,8 +5,11 @@ from stock_downloader.data.nasdaq import NasdaqDownloader
 from stock_downloader.data.index_symbols import GetIndexSymbols
 from stock_downloader.data.listed_symbols import StockSymbolDownloader
 from stock_downloader.data.yfinance_batch import YahooFinanceBatchDownloader
-from stock_downloader.data.yfinance_info import YahooFinanceTickerInfo
-from stock_downloader.data.yfinance_price import YahooFinancePriceHistory
+from stock_downloader.data.info_cache import load_info_cache
+from stock_downloader.data.providers import load_provider
+from stock_downloader.data.http_session import get_session
+from stock_downloader.data.http_cache import load_http_cache
+from stock_downloader.data.universe import IncrementalPriceFetch, UniverseSnapshotStore, load_universe_store, download_price_history
 from stock_downloader.technical_analysis.talib import (
     run_all_talib,
     run_all_custom_ta,
@@ -21,49 +24,66 @@ from stock_downloader.technical_analysis.ta_definitions import (
     custom_ta_sets__regression_channel_ma,
 )
 from stock_downloader.technical_analysis.regression import run_all_regression
-from stock_downloader.database.db import write_table, check_database
-from stock_downloader.schemas.indicies import indicies_schema
-from stock_downloader.schemas.equity_info import equity_info_schema
-from stock_downloader.schemas.etf_info import etf_info_schema
-from stock_downloader.schemas.price import price_schema
-from stock_downloader.schemas.nasdaq_symbols import nasdaq_symbols_schema
-from stock_downloader.schemas.other_symbols import other_symbols_schema
-from stock_downloader.schemas.talib import talib_schema
-from stock_downloader.schemas.ta__change import ta__change_schema
-from stock_downloader.schemas.ta__ma_ratio import ta__ma_ratio_schema
-from stock_downloader.schemas.regression import regression_schema
-from stock_downloader.schemas.regression_indicators import regression_indicators_schema
-from stock_downloader.schemas.regression_indicators_ma import regression_indicators_ma_schema
-from stock_downloader.schemas.ma_future import ma_future_schema
+from stock_downloader.pipeline import FEATURE_MAPPINGS, FeatureBatches, run_feature_pipeline
+from stock_downloader.database.connection import get_database
+from stock_downloader.database.writer import TableWriter
+from stock_downloader.database.feature_views import FEATURE_VIEWS, create_feature_views
+from stock_downloader.database.latest import refresh_latest_features
 
 from stock_downloader.data.loaders import load_mappings, load_config
 from stock_downloader.data.select_symbols import select_symbols, symbolLists
+from stock_downloader.schemas.dtype_plans import dtype_plan
+from stock_downloader.schemas.fast_validation import validate_table
+from stock_downloader.schemas.ta_layout import load_column_mappings
 
-import duckdb
+from pandas import read_parquet
 from loguru import logger
 
 
-def main(sample_num: int | float = None):
+def main(sample_num: int | float = None, pipelined: bool = None):
     logger.info("Running Stock Downloader!")
 
     logger.info("Load the configuration file")
     config = load_config()
+    if pipelined is None:
+        pipelined = config.get("pipeline", {}).get("enabled", False)
+    feature_views = config.get("feature_views", {}).get("enabled", False)
 
     logger.info("Load the data column mapping file")
-    column_mappings = load_mappings(name="columns")
+    column_mappings = load_column_mappings()
 
     logger.info("Validate the output and database folders")
     output_folder = validate_folder(path=config.get("data").get("output_folder"))
-    db_folder = validate_folder(path=config.get("database").get("database_folder"))
+    validate_folder(path=config.get("database").get("database_folder"))
 
-    logger.info("Check database connection")
-    if not check_database(db_path=db_folder / f"{config.get('database').get('database_name')}.db"):
+    logger.info("Open the database connection")
+    database = get_database(config=config)
+    if not database.check():
         raise ConnectionError("Unable to connect to the database. Please check the database path and try again.")
 
+    # Each table is written as soon as it is ready, instead of all of them at the end
+    logger.info("Start the database writer")
+    writer = TableWriter(database=database, config=config)
+
+    def queue_table(table: str, schema: str, df):
+        """Rename, validate and queue a table for the database writer."""
+        df = validate_table(config=config, table=schema, df=rename_and_select_columns(df=df, mappings=column_mappings.get(schema)))
+        writer.submit(table=table, schema=schema, df=df)
+
+    def queue_features(features: dict):
+        """Queue the feature tables of the pipeline, except those computed by database views."""
+        for table, df in features.items():
+            if not (feature_views and table in FEATURE_VIEWS):
+                queue_table(table=table, schema=FEATURE_MAPPINGS.get(table, table), df=df)
+
+    logger.info("Create the shared HTTP session")
+    session = get_session(config=config)
+    http_cache = load_http_cache(config=config, session=session)
+
     logger.info("Retrieve the symbol files")
-    nasdaq_symbols_df = NasdaqDownloader().df
-    other_symbols_df = StockSymbolDownloader().df
-    index_symbols_df = GetIndexSymbols().df
+    nasdaq_symbols_df = NasdaqDownloader(session=session, cache=http_cache).df
+    other_symbols_df = StockSymbolDownloader(session=session, cache=http_cache).df
+    index_symbols_df = GetIndexSymbols(session=session, cache=http_cache).df
 
     logger.info("Rename and select the symbol tables")
     nasdaq_symbols_df = rename_and_select_columns(df=nasdaq_symbols_df, mappings=column_mappings.get("nasdaq_symbols"))
@@ -72,20 +92,24 @@ def main(sample_num: int | float = None):
 
     # Validate symbol data
     logger.info("Validate the symbol tables")
-    nasdaq_symbols_df = nasdaq_symbols_schema.validate(nasdaq_symbols_df)
-    other_symbols_df = other_symbols_schema.validate(other_symbols_df)
-    index_symbols_df = indicies_schema.validate(index_symbols_df)
+    nasdaq_symbols_df = validate_table(config=config, table="nasdaq_symbols", df=nasdaq_symbols_df)
+    other_symbols_df = validate_table(config=config, table="other_symbols", df=other_symbols_df)
+    index_symbols_df = validate_table(config=config, table="indicies", df=index_symbols_df)
 
     logger.info("Save symbol tables to temporary files")
     nasdaq_symbols_df.to_parquet(output_folder / "nasdaq_symbols.parquet")
     other_symbols_df.to_parquet(output_folder / "other_symbols.parquet")
     index_symbols_df.to_parquet(output_folder / "index_symbols.parquet")
+    writer.submit(table="nasdaq_symbols", schema="nasdaq_symbols", df=nasdaq_symbols_df)
+    writer.submit(table="other_symbols", schema="other_symbols", df=other_symbols_df)
+    writer.submit(table="indicies", schema="indicies", df=index_symbols_df)
 
     logger.info("Load the sector ETF mappings")
-    sector_etfs = load_mappings(name="other_symbols").get("sector_etfs")
-    market_etfs = load_mappings(name="other_symbols").get("market_etfs")
-    technical_etfs = load_mappings(name="other_symbols").get("technical_etfs")
-    indicies = load_mappings(name="other_symbols").get("indicies")
+    other_symbols = load_mappings(name="other_symbols")
+    sector_etfs = other_symbols.get("sector_etfs")
+    market_etfs = other_symbols.get("market_etfs")
+    technical_etfs = other_symbols.get("technical_etfs")
+    indicies = other_symbols.get("indicies")
 
     logger.info("Create the equity and etf symbol lists")
     symbol_lists: symbolLists = select_symbols(
@@ -105,6 +129,7 @@ def main(sample_num: int | float = None):
         get_nasdaq100=config.get("symbols").get("get_nasdaq100"),
         get_sp500=config.get("symbols").get("get_sp500"),
         sample=sample_num,
+        sample_seed=config.get("symbols").get("sample_seed"),
     )
 
     logger.info("Create the list of symbols to process")
@@ -114,87 +139,195 @@ def main(sample_num: int | float = None):
     logger.info(f"ETF symbols to process: {len(symbol_lists.etf)}")
     logger.info(f"Total symbols to process: {len(all_symbols)}")
 
-    logger.info("Use yfinance to get the info and price data for all symbols")
-    equity_info = YahooFinanceBatchDownloader(symbols=symbol_lists.equity, path=output_folder, cls=YahooFinanceTickerInfo)
-    etf_info = YahooFinanceBatchDownloader(symbols=symbol_lists.etf, path=output_folder, cls=YahooFinanceTickerInfo)
-    all_price = YahooFinanceBatchDownloader(symbols=all_symbols, path=output_folder, cls=YahooFinancePriceHistory)
+    universe_diff = None
+    universe_store = load_universe_store(config=config)
+    if universe_store is not None:
+        logger.info("Save the symbol universe snapshot and compare it with the previous one")
+        universe_diff = universe_store.save(
+            UniverseSnapshotStore.build_snapshot(symbol_lists=symbol_lists, index_symbols_df=index_symbols_df),
+            index_symbols_df=index_symbols_df,
+        )
+        logger.info(
+            f"Universe v{universe_diff.version}: {len(universe_diff.added)} added, {len(universe_diff.removed)} removed, "
+            f"{len(universe_diff.unchanged)} unchanged, {len(universe_diff.membership_changes)} index membership changes"
+        )
+
+    logger.info("Use the market data provider to get the info and price data for all symbols")
+    provider = load_provider(config=config, session=session)
+    retry_time = config.get("provider").get("retry_time")
+    info_cache = load_info_cache(config=config)
+    incremental_provider = load_provider(config=config, session=session, period=config.get("universe").get("incremental_period"))
+    previous_price_file = output_folder / "yahoo_price.parquet"
+    previous_price = read_parquet(previous_price_file) if universe_diff is not None and previous_price_file.exists() else None
+    equity_info = YahooFinanceBatchDownloader(
+        symbols=symbol_lists.equity,
+        path=output_folder,
+        fetch=provider.ticker_info,
+        cache=info_cache,
+        retry_time=retry_time,
+        dtypes=dtype_plan("equity_info"),
+    )
+    etf_info = YahooFinanceBatchDownloader(
+        symbols=symbol_lists.etf,
+        path=output_folder,
+        fetch=provider.ticker_info,
+        cache=info_cache,
+        retry_time=retry_time,
+        dtypes=dtype_plan("etf_info"),
+    )
+    logger.info(f"Equity info cache hits: {equity_info.cache_hits}, misses: {equity_info.cache_misses}")
+    logger.info(f"ETF info cache hits: {etf_info.cache_hits}, misses: {etf_info.cache_misses}")
+    # Upserts and incremental lake writes merge each batch into the stored tables, so the pipeline can write the features
+    # of finished symbols while it downloads the rest; replace writes need every symbol at once
+    stream_features = pipelined and config.get("database").get("write_mode") == "upsert"
+    if pipelined:
+        logger.info("Download prices and calculate indicators in a streaming pipeline")
+        feature_batches = (
+            FeatureBatches(write=queue_features, batch_size=config.get("pipeline").get("write_batch", 50)) if stream_features else None
+        )
+        price_fetch = provider.price_history
+        if previous_price is not None and not previous_price.empty:
+            price_fetch = IncrementalPriceFetch(
+                full_fetch=provider.price_history,
+                incremental_fetch=incremental_provider.price_history,
+                diff=universe_diff,
+                previous_price=previous_price,
+            )
+        all_price = YahooFinanceBatchDownloader(
+            symbols=all_symbols,
+            path=output_folder,
+            fetch=price_fetch,
+            retry_time=retry_time,
+            lazy=True,
+            dtypes=dtype_plan("price"),
+        )
+        features = run_feature_pipeline(
+            downloader=all_price,
+            regression_config=config.get("regression"),
+            workers=config.get("pipeline").get("workers"),
+            queue_size=config.get("pipeline").get("queue_size"),
+            on_result=feature_batches,
+        )
+        if feature_batches is not None:
+            feature_batches.flush()
+        if isinstance(price_fetch, IncrementalPriceFetch):
+            logger.info(f"Prices: {len(price_fetch.incremental_symbols)} symbols incremental, {len(price_fetch.full_symbols)} in full")
+        all_price_df = all_price.data
+    else:
+        all_price_df = download_price_history(
+            symbols=all_symbols,
+            path=output_folder,
+            full_fetch=provider.price_history,
+            incremental_fetch=incremental_provider.price_history,
+            diff=universe_diff,
+            previous_price=previous_price,
+            retry_time=retry_time,
+        )
 
     logger.info("Save equity and etf info and price tables to temporary files")
     equity_info.data.to_parquet(output_folder / "equity_info.parquet", index=False)
     etf_info.data.to_parquet(output_folder / "etf_info.parquet", index=False)
-    all_price.data.to_parquet(output_folder / "yahoo_price.parquet", index=False)
-
-    price_df = all_price.data.copy(deep=True)
-
-    logger.info("Find best regression lines")
-    regression_df = run_all_regression(price_df=price_df, regression_config=config.get("regression"))
-    regression_df.to_parquet(output_folder / "regression_data.parquet", index=False)
-
-    logger.info("Calculate talib indicators")
-    talib__df = run_all_talib(data_df=price_df, functions=talib_functions, pattern_columns=pattern_columns)
-    talib__df.to_parquet(output_folder / "ta_talib.parquet")
-
-    logger.info("Calculate custom talib moving averages")
-    ta__ma_ratio__df = run_all_custom_ta(
-        data_df=price_df.merge(talib__df.rename(columns={"date": "Date"}), on=["symbol", "Date"], how="inner"),
-        functions=custom_ta_sets__ma_ratio,
-    )
-    ta__ma_ratio__df.to_parquet(output_folder / "ta__ma_ratio.parquet", index=False)
-
-    logger.info("Calculate price change values")
-    ta__change__df = run_all_custom_ta(data_df=price_df, functions=custom_ta_sets__change_ratio)
-    ta__change__df.to_parquet(output_folder / "ta__change.parquet", index=False)
-
-    logger.info("Calculate future price changes")
-    ma_future_df = run_all_custom_ta(data_df=price_df, functions=custom_ta_sets__future)
-    ma_future_df.to_parquet(output_folder / "ta__future.parquet", index=False)
-
-    logger.info("Calculate regression channel relative price positions")
-    regression_indicators_df = run_all_custom_ta(
-        data_df=price_df.merge(regression_df.rename(columns={"date": "Date"}), on=["symbol", "Date"], how="inner"),
-        functions=custom_ta_sets__regression_channel,
-    )
-    regression_indicators_df.to_parquet(output_folder / "regression_indicators.parquet")
-
-    logger.info("Calculate regression moving averages")
-    regression_indicators_ma_df = run_all_custom_ta(data_df=regression_indicators_df, functions=custom_ta_sets__regression_channel_ma)
-    regression_indicators_ma_df.to_parquet(output_folder / "regression_indicators_ma.parquet")
-
-    logger.info("Format columns for each dataframe to be added to database")
-    regression_indicators_ma_df = rename_and_select_columns(
-        df=regression_indicators_ma_df, mappings=column_mappings.get("regression_indicators_ma")
-    )
-    regression_indicators_df = rename_and_select_columns(df=regression_indicators_df, mappings=column_mappings.get("regression_indicators"))
-    ma_future_df = rename_and_select_columns(df=ma_future_df, mappings=column_mappings.get("ma_future"))
-    ta__change__df = rename_and_select_columns(df=ta__change__df, mappings=column_mappings.get("ta__change"))
-    ta__ma_ratio__df = rename_and_select_columns(df=ta__ma_ratio__df, mappings=column_mappings.get("ta__ma_ratio"))
-    talib__df = rename_and_select_columns(df=talib__df, mappings=column_mappings.get("ta__talib"))
-    regression_df = rename_and_select_columns(df=regression_df, mappings=column_mappings.get("regression"))
-    price_df = rename_and_select_columns(df=price_df, mappings=column_mappings.get("price"))
-    equity_info_df = rename_and_select_columns(df=equity_info.data, mappings=column_mappings.get("equity_info"))
-    etf_info_df = rename_and_select_columns(df=etf_info.data, mappings=column_mappings.get("etf_info"))
-
-    # Write to database
-    logger.info("Create database connection")
-    db = duckdb.connect(db_folder / f"{config.get('database').get('database_name')}.db")
-
-    logger.info("Write each dataframe to database")
-    write_table(db=db, df=nasdaq_symbols_df, table="nasdaq_symbols")
-    write_table(db=db, df=other_symbols_df, table="other_symbols")
-    write_table(db=db, df=index_symbols_df, table="indicies")
-    write_table(db=db, df=equity_info_schema.validate(equity_info_df), table="equity_info")
-    write_table(db=db, df=etf_info_schema.validate(etf_info_df), table="etf_info")
-    write_table(db=db, df=price_schema.validate(price_df), table="price")
-    write_table(db=db, df=talib_schema.validate(talib__df), table="talib")
-    write_table(db=db, df=ta__change_schema.validate(ta__change__df), table="ta__change")
-    write_table(db=db, df=ta__ma_ratio_schema.validate(ta__ma_ratio__df), table="ta__ma_ratio")
-    write_table(db=db, df=regression_schema.validate(regression_df), table="regression")
-    write_table(db=db, df=regression_indicators_schema.validate(regression_indicators_df), table="regression_indicators")
-    write_table(db=db, df=regression_indicators_ma_schema.validate(regression_indicators_ma_df), table="regression_indicators_ma")
-    write_table(db=db, df=ma_future_schema.validate(ma_future_df), table="ma_future")
-
-    logger.info("Close connection to database")
-    db.close()
+    all_price_df.to_parquet(output_folder / "yahoo_price.parquet", index=False)
+    queue_table(table="equity_info", schema="equity_info", df=equity_info.data)
+    queue_table(table="etf_info", schema="etf_info", df=etf_info.data)
+
+    price_df = all_price_df.copy(deep=True)
+    queue_table(table="price", schema="price", df=price_df)
+
+    if stream_features:
+        logger.info("The pipelined regression and indicator tables were written in batches as symbols finished")
+    elif pipelined:
+        logger.info("Save the pipelined regression and indicator tables to temporary files")
+        regression_df = features.get("regression")
+        talib__df = features.get("talib")
+        ta__ma_ratio__df = features.get("ta__ma_ratio")
+        ta__change__df = features.get("ta__change")
+        ma_future_df = features.get("ma_future")
+        regression_indicators_df = features.get("regression_indicators")
+        regression_indicators_ma_df = features.get("regression_indicators_ma")
+        regression_df.to_parquet(output_folder / "regression_data.parquet", index=False)
+        talib__df.to_parquet(output_folder / "ta_talib.parquet")
+        ta__ma_ratio__df.to_parquet(output_folder / "ta__ma_ratio.parquet", index=False)
+        ta__change__df.to_parquet(output_folder / "ta__change.parquet", index=False)
+        ma_future_df.to_parquet(output_folder / "ta__future.parquet", index=False)
+        regression_indicators_df.to_parquet(output_folder / "regression_indicators.parquet")
+        regression_indicators_ma_df.to_parquet(output_folder / "regression_indicators_ma.parquet")
+        queue_table(table="regression", schema="regression", df=regression_df)
+        queue_table(table="talib", schema="ta__talib", df=talib__df)
+        if not feature_views:
+            queue_table(table="ta__ma_ratio", schema="ta__ma_ratio", df=ta__ma_ratio__df)
+            queue_table(table="ta__change", schema="ta__change", df=ta__change__df)
+            queue_table(table="ma_future", schema="ma_future", df=ma_future_df)
+            queue_table(table="regression_indicators", schema="regression_indicators", df=regression_indicators_df)
+            queue_table(table="regression_indicators_ma", schema="regression_indicators_ma", df=regression_indicators_ma_df)
+    else:
+        logger.info("Find best regression lines")
+        regression_df = run_all_regression(price_df=price_df, regression_config=config.get("regression"))
+        regression_df.to_parquet(output_folder / "regression_data.parquet", index=False)
+        queue_table(table="regression", schema="regression", df=regression_df)
+
+        logger.info("Calculate talib indicators")
+        talib__df = run_all_talib(
+            data_df=price_df, functions=talib_functions, pattern_columns=pattern_columns, dtypes=dtype_plan("ta__talib")
+        )
+        talib__df.to_parquet(output_folder / "ta_talib.parquet")
+        queue_table(table="talib", schema="ta__talib", df=talib__df)
+
+        if feature_views:
+            logger.info("Skip the custom TA tables, they are computed by database views")
+        else:
+            logger.info("Calculate custom talib moving averages")
+            ta__ma_ratio__df = run_all_custom_ta(
+                data_df=price_df.merge(talib__df.rename(columns={"date": "Date"}), on=["symbol", "Date"], how="inner"),
+                functions=custom_ta_sets__ma_ratio,
+                dtypes=dtype_plan("ta__ma_ratio"),
+            )
+            ta__ma_ratio__df.to_parquet(output_folder / "ta__ma_ratio.parquet", index=False)
+            queue_table(table="ta__ma_ratio", schema="ta__ma_ratio", df=ta__ma_ratio__df)
+
+            logger.info("Calculate price change values")
+            ta__change__df = run_all_custom_ta(data_df=price_df, functions=custom_ta_sets__change_ratio, dtypes=dtype_plan("ta__change"))
+            ta__change__df.to_parquet(output_folder / "ta__change.parquet", index=False)
+            queue_table(table="ta__change", schema="ta__change", df=ta__change__df)
+
+            logger.info("Calculate future price changes")
+            ma_future_df = run_all_custom_ta(data_df=price_df, functions=custom_ta_sets__future, dtypes=dtype_plan("ma_future"))
+            ma_future_df.to_parquet(output_folder / "ta__future.parquet", index=False)
+            queue_table(table="ma_future", schema="ma_future", df=ma_future_df)
+
+            logger.info("Calculate regression channel relative price positions")
+            regression_indicators_df = run_all_custom_ta(
+                data_df=price_df.merge(regression_df.rename(columns={"date": "Date"}), on=["symbol", "Date"], how="inner"),
+                functions=custom_ta_sets__regression_channel,
+                dtypes=dtype_plan("regression_indicators"),
+            )
+            regression_indicators_df.to_parquet(output_folder / "regression_indicators.parquet")
+            queue_table(table="regression_indicators", schema="regression_indicators", df=regression_indicators_df)
+
+            logger.info("Calculate regression moving averages")
+            regression_indicators_ma_df = run_all_custom_ta(
+                data_df=regression_indicators_df,
+                functions=custom_ta_sets__regression_channel_ma,
+                dtypes=dtype_plan("regression_indicators_ma"),
+            )
+            regression_indicators_ma_df.to_parquet(output_folder / "regression_indicators_ma.parquet")
+            queue_table(table="regression_indicators_ma", schema="regression_indicators_ma", df=regression_indicators_ma_df)
+
+    logger.info("Wait for the database writer to finish")
+    latency = writer.close()
+    for table, seconds in latency.items():
+        logger.info(f"{table} written {seconds:.2f}s after it was ready")
+
+    if feature_views:
+        logger.info("Create the custom TA views")
+        create_feature_views(db=database.cursor(), column_mappings=column_mappings)
+        if config.get("database").get("latest_features", False):
+            refresh_latest_features(db=database.cursor(), tables=[(view, view, None) for view in FEATURE_VIEWS])
+
+    logger.info("Close the database connection")
+    database.close()
+
+    logger.info(f"HTTP connection metrics: {session.metrics_summary()}")
 
 
 if __name__ == "__main__":
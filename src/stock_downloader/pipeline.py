@@ -0,0 +1,171 @@
+from pandas import DataFrame, concat
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from queue import Queue
+from threading import Thread
+from typing import Callable
+
+from stock_downloader.data.yfinance_batch import YahooFinanceBatchDownloader
+from stock_downloader.technical_analysis.regression import run_regression_for_symbol
+from stock_downloader.technical_analysis.talib import run_talib_functions, run_custom_ta, concatenate_ta_results
+from stock_downloader.schemas.dtype_plans import apply_dtype_plan, dtype_plan
+from stock_downloader.technical_analysis.ta_definitions import (
+    talib_functions,
+    pattern_columns,
+    custom_ta_sets__ma_ratio,
+    custom_ta_sets__change_ratio,
+    custom_ta_sets__future,
+    custom_ta_sets__regression_channel,
+    custom_ta_sets__regression_channel_ma,
+)
+
+FEATURE_TABLES = [
+    "regression",
+    "talib",
+    "ta__ma_ratio",
+    "ta__change",
+    "ma_future",
+    "regression_indicators",
+    "regression_indicators_ma",
+]
+
+# Section in columns.toml, and so dtype plan, of each feature table
+FEATURE_MAPPINGS = {"talib": "ta__talib"}
+
+
+def compute_symbol_features(symbol: str, price_df: DataFrame, regression_config: dict) -> dict[str, DataFrame]:
+    """
+    Run the regression and TA stages for a single symbol, mirroring the run_all_* functions. The talib and regression
+    indicator frames are cast to their dtype plans before later stages read them, as the sequential run casts them
+    when it concatenates the symbols, so both compute on the same values.
+    """
+    regression_df = run_regression_for_symbol(
+        symbol=symbol,
+        df=price_df,
+        date_column=regression_config.get("date_column"),
+        price_column=regression_config.get("price_column"),
+        min_regression_days=regression_config.get("min_regression_days"),
+        max_regression_days=regression_config.get("max_regression_days"),
+    )
+    talib_df = run_talib_functions(df=price_df, functions=talib_functions, pattern_columns=pattern_columns)
+    regression_indicators_df = run_custom_ta(
+        df=price_df.merge(regression_df.rename(columns={"date": "Date"}), on=["symbol", "Date"], how="inner"),
+        functions=custom_ta_sets__regression_channel,
+    )
+    return {
+        "regression": regression_df,
+        "talib": talib_df,
+        "ta__ma_ratio": run_custom_ta(
+            df=price_df.merge(
+                apply_dtype_plan(talib_df.reset_index(drop=False), dtype_plan("ta__talib")), on=["symbol", "Date"], how="inner"
+            ),
+            functions=custom_ta_sets__ma_ratio,
+        ),
+        "ta__change": run_custom_ta(df=price_df, functions=custom_ta_sets__change_ratio),
+        "ma_future": run_custom_ta(df=price_df, functions=custom_ta_sets__future),
+        "regression_indicators": regression_indicators_df,
+        "regression_indicators_ma": run_custom_ta(
+            df=apply_dtype_plan(regression_indicators_df.reset_index(drop=False), dtype_plan("regression_indicators")).sort_values("Date"),
+            functions=custom_ta_sets__regression_channel_ma,
+        ),
+    }
+
+
+def combine_symbol_features(results: dict[str, dict[str, DataFrame]]) -> dict[str, DataFrame]:
+    """Concatenate per-symbol feature frames, in symbol order, into the tables the run_all_* functions produce."""
+    symbols = sorted(results)
+    combined = {"regression": concat([results[symbol]["regression"] for symbol in symbols])}
+    for table in FEATURE_TABLES[1:]:
+        combined[table] = concatenate_ta_results(
+            [results[symbol][table] for symbol in symbols], dtypes=dtype_plan(FEATURE_MAPPINGS.get(table, table))
+        )
+    return combined
+
+
+class FeatureBatches:
+    """
+    An on_result for run_feature_pipeline that hands the combined feature tables of every batch_size finished
+    symbols to write, so they are stored while later symbols are still downloading. flush writes the last batch.
+    """
+
+    def __init__(self, write: Callable[[dict[str, DataFrame]], None], batch_size: int = 50) -> None:
+        self.write = write
+        self.batch_size = batch_size
+        self.pending: dict[str, dict[str, DataFrame]] = {}
+
+    def __call__(self, symbol: str, features: dict[str, DataFrame]) -> None:
+        self.pending[symbol] = features
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending:
+            batch, self.pending = self.pending, {}
+            self.write(combine_symbol_features(batch))
+
+
+def run_feature_pipeline(
+    downloader: YahooFinanceBatchDownloader,
+    regression_config: dict,
+    workers: int = None,
+    queue_size: int = 16,
+    on_result: Callable[[str, dict[str, DataFrame]], None] = None,
+) -> dict[str, DataFrame]:
+    """
+    Overlap the price download with indicator computation. A producer thread streams each downloaded symbol into
+    a bounded queue and worker processes compute its features immediately. Without on_result every symbol's features
+    are kept and returned as combined tables. With on_result, finished symbols are handed to it as they complete
+    and not kept, so memory holds only the symbols in flight, and an empty dict is returned. The downloader must be
+    lazy; it is finalized once every symbol is processed.
+    """
+    symbols: Queue = Queue(maxsize=queue_size)
+    producer_errors: list = []
+
+    def produce() -> None:
+        try:
+            for symbol, records in downloader.stream():
+                if records:
+                    symbols.put((symbol, records))
+        except Exception as e:
+            producer_errors.append(e)
+        finally:
+            symbols.put(None)
+
+    results: dict[str, dict[str, DataFrame]] = {}
+
+    def collect(futures: set[Future]) -> None:
+        for future in futures:
+            symbol, features = future.result()
+            if on_result is None:
+                results[symbol] = features
+            else:
+                on_result(symbol, features)
+
+    producer = Thread(target=produce, name="price-download", daemon=True)
+    producer.start()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: set[Future] = set()
+        while (item := symbols.get()) is not None:
+            symbol, records = item
+            price_df = YahooFinanceBatchDownloader.records_to_frame(
+                [{"symbol": symbol, **record} for record in records], dtypes=downloader.dtypes
+            )
+            pending.add(executor.submit(_compute_symbol_task, symbol, price_df, regression_config))
+            # Hand over finished symbols and keep the number of in-flight symbols bounded
+            done, pending = wait(pending, timeout=0, return_when=FIRST_COMPLETED)
+            if len(pending) >= queue_size:
+                more_done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                done |= more_done
+            collect(done)
+        done, _ = wait(pending)
+        collect(done)
+    producer.join()
+
+    if producer_errors:
+        raise producer_errors[0]
+
+    downloader.finalize()
+    return combine_symbol_features(results) if on_result is None else {}
+
+
+def _compute_symbol_task(symbol: str, price_df: DataFrame, regression_config: dict) -> tuple[str, dict[str, DataFrame]]:
+    return symbol, compute_symbol_features(symbol=symbol, price_df=price_df, regression_config=regression_config)
@@ -0,0 +1,61 @@
+from pandas import DataFrame
+from pandera.pandas import DataFrameSchema
+from functools import lru_cache
+
+from stock_downloader.data.loaders import FrozenDict
+from stock_downloader.schemas.equity_info import equity_info_schema
+from stock_downloader.schemas.etf_info import etf_info_schema
+from stock_downloader.schemas.indicies import indicies_schema
+from stock_downloader.schemas.ma_future import ma_future_schema
+from stock_downloader.schemas.nasdaq_symbols import nasdaq_symbols_schema
+from stock_downloader.schemas.other_symbols import other_symbols_schema
+from stock_downloader.schemas.price import price_schema
+from stock_downloader.schemas.regression import regression_schema
+from stock_downloader.schemas.regression_indicators import regression_indicators_schema
+from stock_downloader.schemas.regression_indicators_ma import regression_indicators_ma_schema
+from stock_downloader.schemas.ta__change import ta__change_schema
+from stock_downloader.schemas.ta__ma_ratio import ta__ma_ratio_schema
+from stock_downloader.schemas.talib import talib_schema
+from stock_downloader.schemas.ta_layout import load_column_mappings
+
+# Schemas keyed by their section in columns.toml
+SCHEMAS: dict[str, DataFrameSchema] = {
+    "nasdaq_symbols": nasdaq_symbols_schema,
+    "other_symbols": other_symbols_schema,
+    "indicies": indicies_schema,
+    "price": price_schema,
+    "equity_info": equity_info_schema,
+    "etf_info": etf_info_schema,
+    "regression": regression_schema,
+    "regression_indicators": regression_indicators_schema,
+    "regression_indicators_ma": regression_indicators_ma_schema,
+    "ma_future": ma_future_schema,
+    "ta__change": ta__change_schema,
+    "ta__ma_ratio": ta__ma_ratio_schema,
+    "ta__talib": talib_schema,
+}
+
+
+@lru_cache(maxsize=None)
+def _dtype_plan(table: str, mappings: FrozenDict) -> FrozenDict:
+    schema = SCHEMAS[table]
+    return FrozenDict({raw: str(schema.columns[name].dtype) for raw, name in mappings.items() if name in schema.columns})
+
+
+def dtype_plan(table: str) -> FrozenDict:
+    """
+    Map each raw column of a table, named as it is before rename_and_select_columns, to the dtype its pandera
+    schema declares. The plan is rebuilt only when the column mappings change.
+    """
+    return _dtype_plan(table, load_column_mappings().get(table))
+
+
+def apply_dtype_plan(df: DataFrame, plan: dict) -> DataFrame:
+    """
+    Cast the planned columns in a single astype pass without copying the others. Columns the plan does not
+    cover, or whose values cannot be cast, keep their dtype for the schema validation to report.
+    """
+    casts = {col: dtype for col, dtype in plan.items() if col in df.columns and str(df[col].dtype) != dtype}
+    if not casts:
+        return df
+    return df.astype(casts, copy=False, errors="ignore")
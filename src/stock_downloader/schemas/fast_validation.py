@@ -0,0 +1,260 @@
+from pandas import DataFrame, Series, concat, notna
+from pandas.util import hash_pandas_object
+from pandera.pandas import DataFrameSchema
+from pandera.errors import SchemaError, SchemaWarning
+from pathlib import Path, PosixPath, WindowsPath
+from functools import lru_cache
+import json
+import warnings
+
+import numpy as np
+
+from stock_downloader.schemas.dtype_plans import SCHEMAS
+from stock_downloader.database.sql_schema import SQL_VALIDATION_MODES
+
+VALIDATION_MODES: list = ["full", "head", "tail", "sample"]
+
+# Checks the compiled validator evaluates itself; any other check falls back to pandera for its column
+BOUND_CHECKS: dict = {"greater_than_or_equal_to": np.greater_equal, "less_than_or_equal_to": np.less_equal}
+STRING_CHECKS: list = ["str_length"]
+
+
+class ValidationCache:
+    """Content digests of partitions that passed validation, stored as one JSON file per table."""
+
+    def __init__(self, path: str | PosixPath | WindowsPath) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _cache_file(self, name: str) -> Path:
+        return self.path / f"{name}.json"
+
+    def get(self, name: str) -> dict:
+        cache_file = self._cache_file(name)
+        if not cache_file.exists():
+            return {}
+        with cache_file.open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def put(self, name: str, digests: dict) -> None:
+        temp_file = self._cache_file(name).with_suffix(".tmp")
+        with temp_file.open("w", encoding="utf-8") as f:
+            json.dump(digests, f)
+        temp_file.replace(self._cache_file(name))
+
+
+def partition_digests(df: DataFrame, partition_column: str, columns: list = None) -> dict:
+    """Order-insensitive content digest of each partition, from one vectorized row-hash pass over the given columns."""
+    row_hashes = Series(hash_pandas_object(df if columns is None else df.loc[:, columns], index=False).to_numpy(), index=df.index)
+    grouped = row_hashes.groupby(df[partition_column].to_numpy(), sort=False)
+    return {str(key): f"{total:016x}-{count}" for (key, total), count in zip(grouped.sum().items(), grouped.size())}
+
+
+class CompiledSchema:
+    """
+    Validator compiled from a pandera DataFrameSchema. Identical checks are grouped so each group runs as one
+    NumPy comparison over a block of columns, and rows can be limited to a head, tail or sample.
+    """
+
+    def __init__(self, schema: DataFrameSchema, name: str = None) -> None:
+        self.schema = schema
+        self.name = name or schema.name
+        self.required = [col for col, column in schema.columns.items() if column.required]
+        self.coerce = {col: str(column.dtype) for col, column in schema.columns.items() if column.coerce or schema.coerce}
+        self.not_nullable = [col for col, column in schema.columns.items() if not column.nullable]
+        self.unique = [col for col, column in schema.columns.items() if column.unique]
+        # Combinations of columns that are unique together, as in DataFrameSchema(unique=...)
+        self.unique_rows = [schema.unique] if isinstance(schema.unique, str) else list(schema.unique or [])
+        self.add_missing_columns = schema.add_missing_columns
+        self.defaults = {col: column.default for col, column in schema.columns.items() if notna(column.default)}
+        self.groups: dict = {}
+        fallback: dict = {}
+        for col, column in schema.columns.items():
+            for check in column.checks:
+                if check.name in BOUND_CHECKS or check.name in STRING_CHECKS:
+                    key = (check.name, tuple(sorted(check.statistics.items())), check.ignore_na, check.raise_warning)
+                    self.groups.setdefault(key, []).append(col)
+                else:
+                    fallback[col] = column
+        self.fallback = DataFrameSchema(columns=fallback, coerce=False) if fallback else None
+        # Only these columns can make a row fail, so partition digests are computed over them alone
+        self.checked = sorted(
+            set(self.not_nullable) | set(self.unique) | set(fallback) | {col for columns in self.groups.values() for col in columns}
+        )
+
+    def _fail(self, df: DataFrame, message: str, raise_warning: bool = False, column: str = None) -> None:
+        if raise_warning:
+            warnings.warn(message, SchemaWarning)
+        else:
+            raise SchemaError(self.schema, df, message, column_name=column)
+
+    def add_missing(self, df: DataFrame) -> DataFrame:
+        """
+        As pandera does: fill nulls of columns with a default, and with add_missing_columns add the required columns
+        the frame lacks, with their default or null, at their position in the schema.
+        """
+        fills = {col: default for col, default in self.defaults.items() if col in df.columns and df[col].isna().any()}
+        if fills:
+            df = df.fillna(fills)
+        absent = [col for col in self.required if col not in df.columns]
+        if not absent or not self.add_missing_columns:
+            return df
+        no_default = [col for col in absent if col not in self.defaults and not self.schema.columns[col].nullable]
+        if no_default:
+            self._fail(df, f"{self.name}: missing non-nullable columns {no_default} have no default", column=no_default[0])
+        missing = DataFrame({col: self.defaults.get(col, np.nan) for col in absent}, index=df.index)
+        missing = missing.astype({col: str(self.schema.columns[col].dtype) for col in absent}, errors="ignore")
+        # Each absent column goes before the frame column that follows it in the schema, the rest at the end
+        pending = [col for col in self.schema.columns if col in df.columns or col in absent]
+        order = []
+        for col in df.columns:
+            while pending and pending[0] in absent:
+                order.append(pending.pop(0))
+            order.append(col)
+            if col in pending:
+                pending.remove(col)
+        order.extend(col for col in absent if col not in order)
+        return concat([df, missing], axis=1).loc[:, order]
+
+    def cast(self, df: DataFrame) -> DataFrame:
+        """Add missing columns (see add_missing) and coerce the coerced columns (and index) to their dtypes, without running any check."""
+        df = self.add_missing(df)
+        casts = {col: dtype for col, dtype in self.coerce.items() if col in df.columns and str(df[col].dtype) != dtype}
+        try:
+            if casts:
+                df = df.astype(casts, copy=False)
+            if self.schema.index is not None and self.schema.index.coerce and str(df.index.dtype) != str(self.schema.index.dtype):
+                df = df.set_axis(df.index.astype(str(self.schema.index.dtype)), axis=0, copy=False)
+        except (TypeError, ValueError) as e:
+            self._fail(df, f"Unable to coerce {self.name}: {e}")
+        return df
+
+    @staticmethod
+    def select_rows(df: DataFrame, mode: str = "full", rows: int = None, random_state: int = None) -> DataFrame:
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation mode {mode}, expected one of {VALIDATION_MODES}")
+        if mode == "full" or rows is None or rows >= len(df):
+            return df
+        if mode == "head":
+            return df.head(rows)
+        if mode == "tail":
+            return df.tail(rows)
+        return df.sample(n=rows, random_state=random_state)
+
+    def _check_block(self, df: DataFrame, key: tuple, columns: list) -> None:
+        check_name, statistics, ignore_na, raise_warning = key
+        block = df.loc[:, columns]
+        if check_name in BOUND_CHECKS:
+            bound = dict(statistics).get("min_value", dict(statistics).get("max_value"))
+            if isinstance(bound, np.datetime64) or hasattr(bound, "to_datetime64"):
+                values = block.to_numpy(dtype="datetime64[ns]")
+                bound = np.datetime64(bound, "ns")
+                missing = np.isnat(values)
+            else:
+                values = block.to_numpy(dtype="float64", na_value=np.nan)
+                missing = np.isnan(values)
+            with np.errstate(invalid="ignore"):
+                passed = BOUND_CHECKS[check_name](values, bound)
+        else:
+            min_value, max_value = dict(statistics).get("min_value"), dict(statistics).get("max_value")
+            lengths = np.column_stack([block[col].str.len().to_numpy(dtype="float64", na_value=np.nan) for col in columns])
+            missing = np.isnan(lengths)
+            passed = np.ones(lengths.shape, dtype=bool)
+            if min_value is not None:
+                passed &= lengths >= min_value
+            if max_value is not None:
+                passed &= lengths <= max_value
+        if ignore_na:
+            passed |= missing
+        failed = [col for col, ok in zip(columns, passed.all(axis=0)) if not ok]
+        if failed:
+            self._fail(df, f"{self.name}: {check_name}{dict(statistics)} failed for columns {failed}", raise_warning, failed[0])
+
+    def check_unique(self, df: DataFrame) -> None:
+        """Check the unique columns and column combinations, which only means something over the whole frame."""
+        duplicated_columns = [col for col in self.unique if col in df.columns and df[col].duplicated().any()]
+        if duplicated_columns:
+            self._fail(df, f"{self.name}: duplicate values in unique columns {duplicated_columns}", column=duplicated_columns[0])
+        for columns in self.unique_rows:
+            present = [col for col in columns if col in df.columns]
+            if present and df.duplicated(subset=present).any():
+                self._fail(df, f"{self.name}: duplicate rows of unique columns {present}", column=present[0])
+
+    def check(self, df: DataFrame, unique: bool = True) -> None:
+        """
+        Run every check on an already coerced frame, raising SchemaError on the first failure. Without unique, the
+        uniqueness checks are left to the caller, who runs check_unique on the whole frame.
+        """
+        missing_columns = [col for col in self.required if col not in df.columns]
+        if missing_columns:
+            self._fail(df, f"{self.name}: missing required columns {missing_columns}")
+        null_columns = [col for col in self.not_nullable if col in df.columns and df[col].isna().any()]
+        if null_columns:
+            self._fail(df, f"{self.name}: null values in non-nullable columns {null_columns}", column=null_columns[0])
+        if unique:
+            self.check_unique(df)
+        for key, columns in self.groups.items():
+            present = [col for col in columns if col in df.columns]
+            if present:
+                self._check_block(df, key, present)
+        if self.fallback is not None:
+            self.fallback.validate(df.loc[:, [col for col in self.fallback.columns if col in df.columns]])
+
+    def validate(
+        self,
+        df: DataFrame,
+        mode: str = "full",
+        rows: int = None,
+        random_state: int = None,
+        partition_column: str = None,
+        cache: ValidationCache = None,
+    ) -> DataFrame:
+        """
+        Coerce the whole frame, then check the selected rows. With a partition column and a cache, partitions
+        whose content digest matches the last successful validation are skipped. Uniqueness is always checked over
+        the whole frame, since a duplicate can span a skipped and a checked partition.
+        """
+        df = self.cast(df)
+        to_check = df
+        digests = {}
+        if partition_column is not None and cache is not None and partition_column in df.columns:
+            digests = partition_digests(
+                df, partition_column, columns=sorted({partition_column} | {col for col in self.checked if col in df.columns})
+            )
+            previous = cache.get(self.name)
+            changed = [key for key, digest in digests.items() if previous.get(key) != digest]
+            to_check = df.loc[df[partition_column].astype(str).isin(changed)]
+        self.check_unique(df)
+        self.check(self.select_rows(to_check, mode=mode, rows=rows, random_state=random_state), unique=False)
+        # Only a full pass proves a partition valid
+        if digests and mode == "full":
+            cache.put(self.name, digests)
+        return df
+
+
+@lru_cache(maxsize=None)
+def compiled_schema(table: str) -> CompiledSchema:
+    """Compiled validator for a table, keyed by its columns.toml section."""
+    return CompiledSchema(SCHEMAS[table], name=table)
+
+
+def validate_table(df: DataFrame, table: str, config: dict) -> DataFrame:
+    """
+    Validate a table with the compiled validator as configured in [validation], or with pandera if it is off. When the
+    engine is one of SQL_VALIDATION_MODES the checks are left to DuckDB, which runs them when write_table loads the
+    frame, but the frame is still coerced to the schema dtypes since it is used and saved before it is written.
+    """
+    validation_config = config.get("validation", {})
+    if validation_config.get("engine") in SQL_VALIDATION_MODES:
+        return compiled_schema(table).cast(df)
+    if not validation_config.get("fast", False):
+        return SCHEMAS[table].validate(df)
+    cache_folder = validation_config.get("cache_folder")
+    return compiled_schema(table).validate(
+        df,
+        mode=validation_config.get("mode", "full"),
+        rows=validation_config.get("rows"),
+        random_state=validation_config.get("seed"),
+        partition_column=validation_config.get("partition_column"),
+        cache=ValidationCache(cache_folder) if cache_folder else None,
+    )
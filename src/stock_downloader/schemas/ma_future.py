@@ -1,266 +1,4 @@
-from pandas import Timestamp
-from pandera.pandas import DataFrameSchema, Column, Check, Index
+from stock_downloader.schemas.ta_layout import ta_schema
 
-ma_future_schema = DataFrameSchema(
-    columns={
-        "date": Column(
-            dtype="datetime64[ns]",
-            checks=[
-                Check.greater_than_or_equal_to(
-                    min_value=Timestamp("1900-01-1 00:00:00"),
-                    raise_warning=False,
-                    ignore_na=True,
-                ),
-                Check.less_than_or_equal_to(
-                    max_value=Timestamp("2030-01-01 00:00:00"),
-                    raise_warning=False,
-                    ignore_na=True,
-                ),
-            ],
-            nullable=False,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "symbol": Column(
-            dtype="object",
-            checks=[
-                Check.str_length(
-                    min_value=1,
-                    max_value=5,
-                    raise_warning=True,
-                    ignore_na=True,
-                )
-            ],
-            nullable=False,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_END_CLOSE_5": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_END_CLOSE_10": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_END_CLOSE_15": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_END_CLOSE_20": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_END_CLOSE_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_END_CLOSE_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_CLOSE_5": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_CLOSE_10": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_CLOSE_15": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_CLOSE_20": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_CLOSE_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_CLOSE_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_HIGH_5": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_HIGH_10": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_HIGH_15": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_HIGH_20": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_HIGH_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "FUTURE_MAX_HIGH_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-    },
-    checks=None,
-    index=Index(
-        dtype="Int64",
-        checks=None,
-        nullable=False,
-        coerce=True,
-        name=None,
-        description=None,
-        title=None,
-    ),
-    dtype=None,
-    coerce=True,
-    strict=False,
-    name=None,
-    ordered=False,
-    unique=None,
-    report_duplicates="all",
-    unique_column_names=False,
-    add_missing_columns=False,
-    title=None,
-    description=None,
-)
+# Generated from the definitions in technical_analysis/ta_definitions.py
+ma_future_schema = ta_schema("ma_future")
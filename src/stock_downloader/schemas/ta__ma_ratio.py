@@ -1,651 +1,4 @@
-from pandas import Timestamp
-from pandera.pandas import DataFrameSchema, Column, Check, Index
+from stock_downloader.schemas.ta_layout import ta_schema
 
-ta__ma_ratio_schema = DataFrameSchema(
-    columns={
-        "date": Column(
-            dtype="datetime64[ns]",
-            checks=[
-                Check.greater_than_or_equal_to(
-                    min_value=Timestamp("1900-01-1 00:00:00"),
-                    raise_warning=False,
-                    ignore_na=True,
-                ),
-                Check.less_than_or_equal_to(
-                    max_value=Timestamp("2030-01-01 00:00:00"),
-                    raise_warning=False,
-                    ignore_na=True,
-                ),
-            ],
-            nullable=False,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "symbol": Column(
-            dtype="object",
-            checks=[
-                Check.str_length(
-                    min_value=1,
-                    max_value=5,
-                    raise_warning=True,
-                    ignore_na=True,
-                )
-            ],
-            nullable=False,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_7_14": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_7_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_7_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_7_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_7_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_14_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_14_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_14_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_14_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_30_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_30_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_30_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_50_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_50_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_RATIO_100_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_7_14": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_7_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_7_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_7_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_7_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_14_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_14_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_14_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_14_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_30_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_30_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_30_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_50_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_50_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_RATIO_100_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_20_ZSCORE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_50_ZSCORE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_100_ZSCORE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_200_ZSCORE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_400_ZSCORE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_OPEN_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_HIGH_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_LOW_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_SMA_7_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_SMA_14_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_SMA_30_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_SMA_50_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_SMA_100_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_SMA_200_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_EMA_7_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_EMA_14_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_EMA_30_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_EMA_50_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_EMA_100_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CLOSE_EMA_200_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "OPEN_HIGH_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "OPEN_LOW_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "HIGH_LOW_RATIO": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-    },
-    checks=None,
-    index=Index(
-        dtype="Int64",
-        checks=None,
-        nullable=False,
-        coerce=True,
-        name=None,
-        description=None,
-        title=None,
-    ),
-    dtype=None,
-    coerce=True,
-    strict=False,
-    name=None,
-    ordered=False,
-    unique=None,
-    report_duplicates="all",
-    unique_column_names=False,
-    add_missing_columns=True,
-    title=None,
-    description=None,
-)
+# Generated from the definitions in technical_analysis/ta_definitions.py
+ta__ma_ratio_schema = ta_schema("ta__ma_ratio")
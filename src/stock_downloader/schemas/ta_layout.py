@@ -0,0 +1,127 @@
+from pandas import Timestamp
+from pandera.pandas import DataFrameSchema, Column, Check, Index
+from functools import lru_cache
+import talib.abstract as ta_abstract
+
+from stock_downloader.data.loaders import FrozenDict, load_mappings
+from stock_downloader.technical_analysis.ta_definitions import (
+    talib_functions,
+    custom_ta_sets__ma_ratio,
+    custom_ta_sets__change_ratio,
+    custom_ta_sets__future,
+)
+
+# Names run_talib_functions passes price columns under; any other parameter is part of the output name
+TALIB_INPUTS: list = ["open", "high", "low", "close", "volume", "real"]
+
+# TA-Lib integer outputs by function group: candlestick patterns are -200 to 200, HT_TRENDMODE is 0 or 1
+INTEGER_OUTPUT_DTYPES: dict = {"Pattern Recognition": "Int16", "Cycle Indicators": "Int8"}
+DEFAULT_INTEGER_DTYPE: str = "Int32"
+REAL_OUTPUT_DTYPE: str = "float32"
+
+# Tables generated from ta_definitions, keyed by their columns.toml section
+TA_TABLES: dict = {
+    "ta__talib": {"functions": talib_functions, "talib": True, "nullable_keys": True, "add_missing_columns": True},
+    "ta__ma_ratio": {"functions": custom_ta_sets__ma_ratio, "talib": False, "nullable_keys": False, "add_missing_columns": True},
+    "ta__change": {"functions": custom_ta_sets__change_ratio, "talib": False, "nullable_keys": False, "add_missing_columns": True},
+    "ma_future": {"functions": custom_ta_sets__future, "talib": False, "nullable_keys": False, "add_missing_columns": False},
+}
+
+
+@lru_cache(maxsize=None)
+def talib_outputs(func_name: str) -> tuple:
+    """Output names TA-Lib declares for a function, such as ("real",) or ("macd", "macdsignal", "macdhist")."""
+    return tuple(ta_abstract.Function(func_name).output_names)
+
+
+def talib_output_names(func_name: str, params: dict) -> list:
+    """Column names of a TA-Lib function's outputs: the name, its non-input parameter values and an output number if there are several."""
+    param_values = [str(value) for name, value in params.items() if name not in TALIB_INPUTS]
+    prefix = "_".join([func_name] + param_values)
+    outputs = talib_outputs(func_name)
+    if len(outputs) == 1:
+        return [prefix]
+    return [f"{func_name}_{'_'.join(param_values)}__{i + 1}" for i in range(len(outputs))]
+
+
+def talib_output_columns(functions: list[dict]) -> dict:
+    """Output column name to dtype for each TA-Lib function set, in the order run_talib_functions produces them."""
+    columns = {}
+    for function_set in functions:
+        func_name = list(function_set.keys())[0]
+        try:
+            func = ta_abstract.Function(func_name)
+        except Exception as e:
+            print(f"Invalid talib function: {e}")
+            continue
+        integer_dtype = INTEGER_OUTPUT_DTYPES.get(func.info["group"], DEFAULT_INTEGER_DTYPE)
+        for name, output in zip(talib_output_names(func_name, function_set.get(func_name)), talib_outputs(func_name)):
+            columns[name] = integer_dtype if output == "integer" else REAL_OUTPUT_DTYPE
+    return columns
+
+
+def custom_output_columns(functions: list[dict]) -> dict:
+    return {function_set.get("output"): REAL_OUTPUT_DTYPE for function_set in functions}
+
+
+@lru_cache(maxsize=None)
+def ta_columns(table: str) -> FrozenDict:
+    """Output column name to dtype for a generated TA table."""
+    spec = TA_TABLES[table]
+    return FrozenDict(talib_output_columns(spec["functions"]) if spec["talib"] else custom_output_columns(spec["functions"]))
+
+
+def _key_columns(nullable: bool) -> dict:
+    return {
+        "date": Column(
+            dtype="datetime64[ns]",
+            checks=[
+                Check.greater_than_or_equal_to(min_value=Timestamp("1900-01-1 00:00:00"), raise_warning=False, ignore_na=True),
+                Check.less_than_or_equal_to(max_value=Timestamp("2030-01-01 00:00:00"), raise_warning=False, ignore_na=True),
+            ],
+            nullable=nullable,
+            unique=False,
+            coerce=True,
+            required=True,
+        ),
+        "symbol": Column(
+            dtype="object",
+            checks=[Check.str_length(min_value=1, max_value=5, raise_warning=True, ignore_na=True)],
+            nullable=nullable,
+            unique=False,
+            coerce=True,
+            required=True,
+        ),
+    }
+
+
+@lru_cache(maxsize=None)
+def ta_schema(table: str) -> DataFrameSchema:
+    """Pandera schema of a generated TA table: the date and symbol keys followed by one nullable column per indicator output."""
+    spec = TA_TABLES[table]
+    columns = _key_columns(nullable=spec["nullable_keys"])
+    for name, dtype in ta_columns(table).items():
+        columns[name] = Column(dtype=dtype, checks=None, nullable=True, unique=False, coerce=True, required=True)
+    return DataFrameSchema(
+        columns=columns,
+        index=Index(dtype="Int64", checks=None, nullable=True, coerce=True),
+        coerce=True,
+        strict=False,
+        add_missing_columns=spec["add_missing_columns"],
+    )
+
+
+@lru_cache(maxsize=None)
+def ta_mappings(table: str) -> FrozenDict:
+    """columns.toml style mapping of a generated TA table: Date is renamed to date, every other column keeps its name."""
+    return FrozenDict({"Date": "date", "symbol": "symbol", **{name: name for name in ta_columns(table)}})
+
+
+@lru_cache(maxsize=None)
+def _with_ta_mappings(mappings: FrozenDict) -> FrozenDict:
+    return FrozenDict({**mappings, **{table: ta_mappings(table) for table in TA_TABLES}})
+
+
+def load_column_mappings() -> FrozenDict:
+    """The columns.toml mappings with the generated TA sections added. Rebuilt only when columns.toml changes."""
+    return _with_ta_mappings(load_mappings(name="columns"))
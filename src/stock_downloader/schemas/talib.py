@@ -1,1905 +1,4 @@
-from pandera.pandas import DataFrameSchema, Column, Check, Index  # , MultiIndex
-from pandas import Timestamp
+from stock_downloader.schemas.ta_layout import ta_schema
 
-talib_schema = DataFrameSchema(
-    columns={
-        "date": Column(
-            dtype="datetime64[ns]",
-            checks=[
-                Check.greater_than_or_equal_to(
-                    min_value=Timestamp("1900-01-1 00:00:00"),
-                    raise_warning=False,
-                    ignore_na=True,
-                ),
-                Check.less_than_or_equal_to(
-                    max_value=Timestamp("2030-01-01 00:00:00"),
-                    raise_warning=False,
-                    ignore_na=True,
-                ),
-            ],
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "symbol": Column(
-            dtype="object",
-            checks=[
-                Check.str_length(
-                    min_value=1,
-                    max_value=5,
-                    raise_warning=True,
-                    ignore_na=True,
-                )
-            ],
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "HT_DCPERIOD": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "HT_DCPHASE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "HT_PHASOR___1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "HT_PHASOR___2": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "HT_SINE___1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "HT_SINE___2": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "HT_TRENDMODE": Column(
-            dtype="Int8",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "ADX_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "ADXR_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "APO_12_26_0": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "AROON_30__1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "AROON_30__2": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "AROONOSC_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "BOP": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CCI_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CMO_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "DX_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MACD_12_26_9__1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MACD_12_26_9__2": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MACD_12_26_9__3": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MACDEXT_12_0_26_0_9_0__1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MACDEXT_12_0_26_0_9_0__2": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MACDEXT_12_0_26_0_9_0__3": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MACDFIX_9__1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MACDFIX_9__2": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MACDFIX_9__3": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MFI_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MINUS_DI_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MINUS_DM_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MOM_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "PLUS_DI_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "PLUS_DM_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "PPO_12_26_0": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "ROC_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "ROCP_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "ROCR_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "ROCR100_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "RSI_14": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "RSI_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "STOCH_5_3_0_26_0__1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "STOCH_5_3_0_26_0__2": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "STOCHF_5_3_0__1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "STOCHF_5_3_0__2": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "STOCHRSI_30_5_3_0__1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "STOCHRSI_30_5_3_0__2": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "TRIX_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "ULTOSC_7_14_28": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "WILLR_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "BBANDS_30_2_2_0__1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "BBANDS_30_2_2_0__2": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "BBANDS_30_2_2_0__3": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "DEMA_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_7": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_14": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "EMA_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "HT_TRENDLINE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "KAMA_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MIDPOINT_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MIDPRICE_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SAR_0_0": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SAREXT_0_0_0_0_0_0_0_0": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-                "SMA_7": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_14": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "SMA_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "T3_30_0": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "TEMA_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "TRIMA_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "WMA_7": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "WMA_14": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "WMA_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "WMA_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "WMA_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "WMA_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDL2CROWS": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDL3BLACKCROWS": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDL3INSIDE": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDL3LINESTRIKE": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDL3OUTSIDE": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDL3STARSINSOUTH": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDL3WHITESOLDIERS": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLABANDONEDBABY_0": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLADVANCEBLOCK": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLBELTHOLD": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLBREAKAWAY": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLCLOSINGMARUBOZU": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLCONCEALBABYSWALL": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLCOUNTERATTACK": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLDARKCLOUDCOVER_0": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLDOJI": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLDOJISTAR": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLDRAGONFLYDOJI": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLENGULFING": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLEVENINGDOJISTAR_0": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLEVENINGSTAR_0": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLGAPSIDESIDEWHITE": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLGRAVESTONEDOJI": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLHAMMER": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLHANGINGMAN": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLHARAMI": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLHARAMICROSS": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLHIGHWAVE": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLHIKKAKE": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLHIKKAKEMOD": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLHOMINGPIGEON": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLIDENTICAL3CROWS": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLINNECK": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLINVERTEDHAMMER": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLKICKING": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLKICKINGBYLENGTH": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLLADDERBOTTOM": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLLONGLEGGEDDOJI": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLLONGLINE": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLMARUBOZU": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLMATCHINGLOW": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLMATHOLD_0": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLMORNINGDOJISTAR_0": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLMORNINGSTAR_0": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLONNECK": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLPIERCING": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLRICKSHAWMAN": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLRISEFALL3METHODS": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLSEPARATINGLINES": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLSHOOTINGSTAR": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLSHORTLINE": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLSPINNINGTOP": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLSTALLEDPATTERN": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLSTICKSANDWICH": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLTAKURI": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLTASUKIGAP": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLTHRUSTING": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLTRISTAR": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLUNIQUE3RIVER": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLUPSIDEGAP2CROWS": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "CDLXSIDEGAP3METHODS": Column(
-            dtype="Int16",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "AVGPRICE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "MEDPRICE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "TYPPRICE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "WCLPRICE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_20": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_400": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_SLOPE_20": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_SLOPE_50": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_SLOPE_100": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_SLOPE_200": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "LINEARREG_SLOPE_400": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "STDDEV_20_1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "STDDEV_50_1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "STDDEV_100_1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "STDDEV_200_1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "STDDEV_400_1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "TSF_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "VAR_30_1": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "ATR_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "NATR_30": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "TRANGE": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "AD": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "ADOSC_12_26": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-        "OBV": Column(
-            dtype="float32",
-            checks=None,
-            nullable=True,
-            unique=False,
-            coerce=True,
-            required=True,
-            regex=False,
-            description=None,
-            title=None,
-        ),
-    },
-    checks=None,
-    index=Index(
-        dtype="Int64",
-        checks=None,
-        nullable=True,
-        coerce=True,
-        name=None,
-        description=None,
-        title=None,
-    ),
-    dtype=None,
-    coerce=True,
-    strict=False,
-    name=None,
-    ordered=False,
-    unique=None,
-    report_duplicates="all",
-    unique_column_names=False,
-    add_missing_columns=True,
-    title=None,
-    description=None,
-)
+# Generated from the definitions in technical_analysis/ta_definitions.py
+talib_schema = ta_schema("ta__talib")
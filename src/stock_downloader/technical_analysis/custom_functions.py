@@ -0,0 +1,68 @@
+from pandas import Series
+from dataclasses import dataclass
+from typing import Callable
+
+# Named window every custom function's SQL is evaluated over: one symbol's rows in date order
+SQL_WINDOW: str = "symbol_dates"
+
+
+@dataclass(frozen=True)
+class CustomFunction:
+    """
+    A custom TA function: the pandas implementation run on one symbol's date-ordered rows, and a template of the
+    equivalent DuckDB expression. Template fields are the function's column arguments and {window}, the named window.
+    """
+
+    func: Callable
+    sql: str
+
+    def __call__(self, **columns: Series) -> Series:
+        return self.func(**columns)
+
+    def to_sql(self, columns: dict) -> str:
+        """The SQL expression, given the SQL expression of each column argument."""
+        return self.sql.format(window=SQL_WINDOW, **columns)
+
+
+def _full_window(expression: str, column: str, frame: str, periods: int) -> str:
+    # Pandas rolling windows are NaN until they hold `periods` values, SQL aggregates are not
+    return f"CASE WHEN COUNT({column}) OVER ({{window}} {frame}) = {periods} THEN {expression} OVER ({{window}} {frame}) END"
+
+
+def ratio() -> CustomFunction:
+    return CustomFunction(func=lambda col1, col2: col1 / col2, sql="{col1} / {col2}")
+
+
+def zscore() -> CustomFunction:
+    return CustomFunction(func=lambda col1, col2, col3: (col1 - col2) / col3, sql="({col1} - {col2}) / {col3}")
+
+
+def change_ratio(periods: int) -> CustomFunction:
+    """Value relative to the value `periods` rows earlier."""
+    return CustomFunction(func=lambda col1: col1 / col1.shift(periods), sql=f"{{col1}} / LAG({{col1}}, {periods}) OVER {{window}}")
+
+
+def future_ratio(periods: int) -> CustomFunction:
+    """Value `periods` rows later relative to the current value."""
+    return CustomFunction(func=lambda col1: col1.shift(-periods) / col1, sql=f"LEAD({{col1}}, {periods}) OVER {{window}} / {{col1}}")
+
+
+def future_max_ratio(periods: int, two_columns: bool = False) -> CustomFunction:
+    """Maximum of col2 (or col1) over the next `periods` rows relative to the current col1."""
+    frame = f"ROWS BETWEEN 1 FOLLOWING AND {periods} FOLLOWING"
+    if two_columns:
+        return CustomFunction(
+            func=lambda col1, col2: (col2[::-1].shift(1).rolling(window=periods).max() / col1[::-1])[::-1],
+            sql=f"{_full_window('MAX({col2})', '{col2}', frame, periods)} / {{col1}}",
+        )
+    return CustomFunction(
+        func=lambda col1: (col1[::-1].shift(1).rolling(window=periods).max() / col1[::-1])[::-1],
+        sql=f"{_full_window('MAX({col1})', '{col1}', frame, periods)} / {{col1}}",
+    )
+
+
+def rolling_mean(periods: int) -> CustomFunction:
+    return CustomFunction(
+        func=lambda col1: col1.rolling(window=periods).mean(),
+        sql=_full_window("AVG({col1})", "{col1}", f"ROWS BETWEEN {periods - 1} PRECEDING AND CURRENT ROW", periods),
+    )
@@ -1,4 +1,5 @@
 from pandas import DataFrame, to_datetime, Timestamp, Series, concat
+from pandas.api.types import is_datetime64_any_dtype
 
 # import json
 # import time
@@ -17,6 +18,8 @@ from datetime import timedelta
 
 from stock_downloader.models.data_classes import RegressionResult, RegressionLines, BestCorrelation, BestResults
 
+UNIX_EPOCH_ORDINAL: int = 719163  # Timestamp("1970-01-01").toordinal()
+
 
 def back_in_time(date: Timestamp, days: int = 200) -> Timestamp:
     """
@@ -33,10 +36,14 @@ def data_between_dates(
     date_column: str = "Date",
     ordinal_date_column: str = "Date_Ordinal",
 ) -> DataFrame:
-    df.loc[:, date_column] = to_datetime(df[date_column])
-    df = df.copy(deep=True).query(f"{date_column} >= @start_date").query(f"{date_column} <= @end_date")
-    df.loc[:, ordinal_date_column] = df[date_column].map(Timestamp.toordinal)
-    return df.sort_values(date_column).loc[:, [date_column, ordinal_date_column, price_column]].reset_index(drop=True)
+    dates = df[date_column]
+    if not is_datetime64_any_dtype(dates):
+        dates = to_datetime(dates)
+    in_range = (dates >= start_date) & (dates <= end_date)
+    df = DataFrame({date_column: dates[in_range], price_column: df.loc[in_range, price_column]})
+    # Proleptic Gregorian ordinal, as Timestamp.toordinal, computed from the day number in one pass
+    df.insert(1, ordinal_date_column, df[date_column].to_numpy(dtype="datetime64[D]").astype("int64") + UNIX_EPOCH_ORDINAL)
+    return df.sort_values(date_column).reset_index(drop=True)
 
 
 def calculate_std(x: Series, y: Series, regression_result: LinregressResult | RegressionResult) -> float:
@@ -1,3 +1,12 @@
+from stock_downloader.technical_analysis.custom_functions import (
+    ratio,
+    zscore,
+    change_ratio,
+    future_ratio,
+    future_max_ratio,
+    rolling_mean,
+)
+
 talib_functions = [
     {"HT_DCPERIOD": {"real": "close"}},
     {"HT_DCPHASE": {"real": "close"}},
@@ -220,424 +229,424 @@ talib_functions = [
 custom_ta_sets__ma_ratio = [
     {
         "output": "SMA_RATIO_7_14",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_14", "col2": "SMA_30"},
     },
     {
         "output": "SMA_RATIO_7_30",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_14", "col2": "SMA_30"},
     },
     {
         "output": "SMA_RATIO_7_50",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_14", "col2": "SMA_50"},
     },
     {
         "output": "SMA_RATIO_7_100",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_14", "col2": "SMA_100"},
     },
     {
         "output": "SMA_RATIO_7_200",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_14", "col2": "SMA_200"},
     },
     {
         "output": "SMA_RATIO_14_30",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_14", "col2": "SMA_30"},
     },
     {
         "output": "SMA_RATIO_14_50",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_14", "col2": "SMA_50"},
     },
     {
         "output": "SMA_RATIO_14_100",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_14", "col2": "SMA_100"},
     },
     {
         "output": "SMA_RATIO_14_200",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_14", "col2": "SMA_200"},
     },
     {
         "output": "SMA_RATIO_30_50",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_30", "col2": "SMA_50"},
     },
     {
         "output": "SMA_RATIO_30_100",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_30", "col2": "SMA_100"},
     },
     {
         "output": "SMA_RATIO_30_200",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_30", "col2": "SMA_200"},
     },
     {
         "output": "SMA_RATIO_50_100",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_50", "col2": "SMA_100"},
     },
     {
         "output": "SMA_RATIO_50_200",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_50", "col2": "SMA_200"},
     },
     {
         "output": "SMA_RATIO_100_200",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "SMA_100", "col2": "SMA_200"},
     },
     {
         "output": "EMA_RATIO_7_14",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_14", "col2": "EMA_30"},
     },
     {
         "output": "EMA_RATIO_7_30",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_14", "col2": "EMA_30"},
     },
     {
         "output": "EMA_RATIO_7_50",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_14", "col2": "EMA_50"},
     },
     {
         "output": "EMA_RATIO_7_100",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_14", "col2": "EMA_100"},
     },
     {
         "output": "EMA_RATIO_7_200",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_14", "col2": "EMA_200"},
     },
     {
         "output": "EMA_RATIO_14_30",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_14", "col2": "EMA_30"},
     },
     {
         "output": "EMA_RATIO_14_50",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_14", "col2": "EMA_50"},
     },
     {
         "output": "EMA_RATIO_14_100",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_14", "col2": "EMA_100"},
     },
     {
         "output": "EMA_RATIO_14_200",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_14", "col2": "EMA_200"},
     },
     {
         "output": "EMA_RATIO_30_50",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_30", "col2": "EMA_50"},
     },
     {
         "output": "EMA_RATIO_30_100",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_30", "col2": "EMA_100"},
     },
     {
         "output": "EMA_RATIO_30_200",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_30", "col2": "EMA_200"},
     },
     {
         "output": "EMA_RATIO_50_100",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_50", "col2": "EMA_100"},
     },
     {
         "output": "EMA_RATIO_50_200",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_50", "col2": "EMA_200"},
     },
     {
         "output": "EMA_RATIO_100_200",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "EMA_100", "col2": "EMA_200"},
     },
     {
         "output": "LINEARREG_20_ZSCORE",
-        "func": lambda col1, col2, col3: (col1 - col2) / col3,
+        "func": zscore(),
         "columns": {"col1": "Close", "col2": "LINEARREG_20", "col3": "STDDEV_20_1"},
     },
     {
         "output": "LINEARREG_50_ZSCORE",
-        "func": lambda col1, col2, col3: (col1 - col2) / col3,
+        "func": zscore(),
         "columns": {"col1": "Close", "col2": "LINEARREG_50", "col3": "STDDEV_50_1"},
     },
     {
         "output": "LINEARREG_100_ZSCORE",
-        "func": lambda col1, col2, col3: (col1 - col2) / col3,
+        "func": zscore(),
         "columns": {"col1": "Close", "col2": "LINEARREG_100", "col3": "STDDEV_100_1"},
     },
     {
         "output": "LINEARREG_200_ZSCORE",
-        "func": lambda col1, col2, col3: (col1 - col2) / col3,
+        "func": zscore(),
         "columns": {"col1": "Close", "col2": "LINEARREG_200", "col3": "STDDEV_200_1"},
     },
     {
         "output": "LINEARREG_400_ZSCORE",
-        "func": lambda col1, col2, col3: (col1 - col2) / col3,
+        "func": zscore(),
         "columns": {"col1": "Close", "col2": "LINEARREG_400", "col3": "STDDEV_400_1"},
     },
     {
         "output": "CLOSE_SMA_7_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "SMA_7"},
     },
     {
         "output": "CLOSE_SMA_14_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "SMA_14"},
     },
     {
         "output": "CLOSE_SMA_30_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "SMA_30"},
     },
     {
         "output": "CLOSE_SMA_50_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "SMA_50"},
     },
     {
         "output": "CLOSE_SMA_100_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "SMA_100"},
     },
     {
         "output": "CLOSE_SMA_200_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "SMA_200"},
     },
     {
         "output": "CLOSE_EMA_7_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "EMA_7"},
     },
     {
         "output": "CLOSE_EMA_14_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "EMA_14"},
     },
     {
         "output": "CLOSE_EMA_30_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "EMA_30"},
     },
     {
         "output": "CLOSE_EMA_50_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "EMA_50"},
     },
     {
         "output": "CLOSE_EMA_100_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "EMA_100"},
     },
     {
         "output": "CLOSE_EMA_200_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "EMA_200"},
     },
     {
         "output": "CLOSE_OPEN_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "Open"},
     },
     {
         "output": "CLOSE_HIGH_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "High"},
     },
     {
         "output": "CLOSE_LOW_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Close", "col2": "Low"},
     },
     {
         "output": "OPEN_HIGH_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Open", "col2": "High"},
     },
     {
         "output": "OPEN_LOW_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "Open", "col2": "Low"},
     },
     {
         "output": "HIGH_LOW_RATIO",
-        "func": lambda col1, col2: col1 / col2,
+        "func": ratio(),
         "columns": {"col1": "High", "col2": "Low"},
     },
 ]
 
 # Indicators derived from the raw price data
 custom_ta_sets__regression_channel = [
-    {"output": "CHANNEL_CLOSE_VS_LINE", "func": lambda col1, col2: col1 / col2, "columns": {"col1": "Close", "col2": "line_end_y"}},
-    {"output": "CHANNEL_CLOSE_VS_MINUS", "func": lambda col1, col2: col1 / col2, "columns": {"col1": "Close", "col2": "line_minus_end_y"}},
-    {"output": "CHANNEL_CLOSE_VS_PLUS", "func": lambda col1, col2: col1 / col2, "columns": {"col1": "Close", "col2": "line_plus_end_y"}},
-    {"output": "CHANNEL_LOW_VS_LINE", "func": lambda col1, col2: col1 / col2, "columns": {"col1": "Low", "col2": "line_end_y"}},
-    {"output": "CHANNEL_LOW_VS_MINUS", "func": lambda col1, col2: col1 / col2, "columns": {"col1": "Low", "col2": "line_minus_end_y"}},
-    {"output": "CHANNEL_LOW_VS_PLUS", "func": lambda col1, col2: col1 / col2, "columns": {"col1": "Low", "col2": "line_plus_end_y"}},
-    {"output": "CHANNEL_HIGH_VS_LINE", "func": lambda col1, col2: col1 / col2, "columns": {"col1": "High", "col2": "line_end_y"}},
-    {"output": "CHANNEL_HIGH_VS_MINUS", "func": lambda col1, col2: col1 / col2, "columns": {"col1": "High", "col2": "line_minus_end_y"}},
-    {"output": "CHANNEL_HIGH_VS_PLUS", "func": lambda col1, col2: col1 / col2, "columns": {"col1": "High", "col2": "line_plus_end_y"}},
+    {"output": "CHANNEL_CLOSE_VS_LINE", "func": ratio(), "columns": {"col1": "Close", "col2": "line_end_y"}},
+    {"output": "CHANNEL_CLOSE_VS_MINUS", "func": ratio(), "columns": {"col1": "Close", "col2": "line_minus_end_y"}},
+    {"output": "CHANNEL_CLOSE_VS_PLUS", "func": ratio(), "columns": {"col1": "Close", "col2": "line_plus_end_y"}},
+    {"output": "CHANNEL_LOW_VS_LINE", "func": ratio(), "columns": {"col1": "Low", "col2": "line_end_y"}},
+    {"output": "CHANNEL_LOW_VS_MINUS", "func": ratio(), "columns": {"col1": "Low", "col2": "line_minus_end_y"}},
+    {"output": "CHANNEL_LOW_VS_PLUS", "func": ratio(), "columns": {"col1": "Low", "col2": "line_plus_end_y"}},
+    {"output": "CHANNEL_HIGH_VS_LINE", "func": ratio(), "columns": {"col1": "High", "col2": "line_end_y"}},
+    {"output": "CHANNEL_HIGH_VS_MINUS", "func": ratio(), "columns": {"col1": "High", "col2": "line_minus_end_y"}},
+    {"output": "CHANNEL_HIGH_VS_PLUS", "func": ratio(), "columns": {"col1": "High", "col2": "line_plus_end_y"}},
 ]
 
 # Indicators derived from the raw price data
 custom_ta_sets__regression_channel_ma = [
     {
         "output": "CHANNEL_CLOSE_VS_MINUS_MA5",
-        "func": lambda col1: col1.rolling(window=5).mean(),
+        "func": rolling_mean(5),
         "columns": {"col1": "CHANNEL_CLOSE_VS_MINUS"},
     },
     {
         "output": "CHANNEL_CLOSE_VS_MINUS_MA10",
-        "func": lambda col1: col1.rolling(window=10).mean(),
+        "func": rolling_mean(10),
         "columns": {"col1": "CHANNEL_CLOSE_VS_MINUS"},
     },
     {
         "output": "CHANNEL_CLOSE_VS_MINUS_MA15",
-        "func": lambda col1: col1.rolling(window=15).mean(),
+        "func": rolling_mean(15),
         "columns": {"col1": "CHANNEL_CLOSE_VS_MINUS"},
     },
     {
         "output": "CHANNEL_CLOSE_VS_LINE_MA5",
-        "func": lambda col1: col1.rolling(window=5).mean(),
+        "func": rolling_mean(5),
         "columns": {"col1": "CHANNEL_CLOSE_VS_LINE"},
     },
     {
         "output": "CHANNEL_CLOSE_VS_LINE_MA10",
-        "func": lambda col1: col1.rolling(window=10).mean(),
+        "func": rolling_mean(10),
         "columns": {"col1": "CHANNEL_CLOSE_VS_LINE"},
     },
     {
         "output": "CHANNEL_CLOSE_VS_LINE_MA15",
-        "func": lambda col1: col1.rolling(window=15).mean(),
+        "func": rolling_mean(15),
         "columns": {"col1": "CHANNEL_CLOSE_VS_LINE"},
     },
     {
         "output": "CHANNEL_CLOSE_VS_PLUS_MA5",
-        "func": lambda col1: col1.rolling(window=5).mean(),
+        "func": rolling_mean(5),
         "columns": {"col1": "CHANNEL_CLOSE_VS_PLUS"},
     },
     {
         "output": "CHANNEL_CLOSE_VS_PLUS_MA10",
-        "func": lambda col1: col1.rolling(window=10).mean(),
+        "func": rolling_mean(10),
         "columns": {"col1": "CHANNEL_CLOSE_VS_PLUS"},
     },
     {
         "output": "CHANNEL_CLOSE_VS_PLUS_MA15",
-        "func": lambda col1: col1.rolling(window=15).mean(),
+        "func": rolling_mean(15),
         "columns": {"col1": "CHANNEL_CLOSE_VS_PLUS"},
     },
 ]
 
 # Indicators derived from the raw price data
 custom_ta_sets__change_ratio = [
-    {"output": "CHANGE_HIGH_1", "func": lambda col1: col1 / col1.shift(1), "columns": {"col1": "High"}},
-    {"output": "CHANGE_HIGH_2", "func": lambda col1: col1 / col1.shift(2), "columns": {"col1": "High"}},
-    {"output": "CHANGE_HIGH_3", "func": lambda col1: col1 / col1.shift(3), "columns": {"col1": "High"}},
-    {"output": "CHANGE_HIGH_4", "func": lambda col1: col1 / col1.shift(4), "columns": {"col1": "High"}},
-    {"output": "CHANGE_HIGH_5", "func": lambda col1: col1 / col1.shift(5), "columns": {"col1": "High"}},
-    {"output": "CHANGE_LOW_1", "func": lambda col1: col1 / col1.shift(1), "columns": {"col1": "Low"}},
-    {"output": "CHANGE_LOW_2", "func": lambda col1: col1 / col1.shift(2), "columns": {"col1": "Low"}},
-    {"output": "CHANGE_LOW_3", "func": lambda col1: col1 / col1.shift(3), "columns": {"col1": "Low"}},
-    {"output": "CHANGE_LOW_4", "func": lambda col1: col1 / col1.shift(4), "columns": {"col1": "Low"}},
-    {"output": "CHANGE_LOW_5", "func": lambda col1: col1 / col1.shift(5), "columns": {"col1": "Low"}},
-    {"output": "CHANGE_CLOSE_1", "func": lambda col1: col1 / col1.shift(1), "columns": {"col1": "Close"}},
-    {"output": "CHANGE_CLOSE_2", "func": lambda col1: col1 / col1.shift(2), "columns": {"col1": "Close"}},
-    {"output": "CHANGE_CLOSE_3", "func": lambda col1: col1 / col1.shift(3), "columns": {"col1": "Close"}},
-    {"output": "CHANGE_CLOSE_4", "func": lambda col1: col1 / col1.shift(4), "columns": {"col1": "Close"}},
-    {"output": "CHANGE_CLOSE_5", "func": lambda col1: col1 / col1.shift(5), "columns": {"col1": "Close"}},
-    {"output": "CHANGE_CLOSE_10", "func": lambda col1: col1 / col1.shift(10), "columns": {"col1": "Close"}},
-    {"output": "CHANGE_CLOSE_20", "func": lambda col1: col1 / col1.shift(20), "columns": {"col1": "Close"}},
-    {"output": "CHANGE_CLOSE_30", "func": lambda col1: col1 / col1.shift(30), "columns": {"col1": "Close"}},
-    {"output": "CHANGE_CLOSE_50", "func": lambda col1: col1 / col1.shift(50), "columns": {"col1": "Close"}},
-    {"output": "CHANGE_CLOSE_100", "func": lambda col1: col1 / col1.shift(100), "columns": {"col1": "Close"}},
-    {"output": "CHANGE_CLOSE_200", "func": lambda col1: col1 / col1.shift(200), "columns": {"col1": "Close"}},
+    {"output": "CHANGE_HIGH_1", "func": change_ratio(1), "columns": {"col1": "High"}},
+    {"output": "CHANGE_HIGH_2", "func": change_ratio(2), "columns": {"col1": "High"}},
+    {"output": "CHANGE_HIGH_3", "func": change_ratio(3), "columns": {"col1": "High"}},
+    {"output": "CHANGE_HIGH_4", "func": change_ratio(4), "columns": {"col1": "High"}},
+    {"output": "CHANGE_HIGH_5", "func": change_ratio(5), "columns": {"col1": "High"}},
+    {"output": "CHANGE_LOW_1", "func": change_ratio(1), "columns": {"col1": "Low"}},
+    {"output": "CHANGE_LOW_2", "func": change_ratio(2), "columns": {"col1": "Low"}},
+    {"output": "CHANGE_LOW_3", "func": change_ratio(3), "columns": {"col1": "Low"}},
+    {"output": "CHANGE_LOW_4", "func": change_ratio(4), "columns": {"col1": "Low"}},
+    {"output": "CHANGE_LOW_5", "func": change_ratio(5), "columns": {"col1": "Low"}},
+    {"output": "CHANGE_CLOSE_1", "func": change_ratio(1), "columns": {"col1": "Close"}},
+    {"output": "CHANGE_CLOSE_2", "func": change_ratio(2), "columns": {"col1": "Close"}},
+    {"output": "CHANGE_CLOSE_3", "func": change_ratio(3), "columns": {"col1": "Close"}},
+    {"output": "CHANGE_CLOSE_4", "func": change_ratio(4), "columns": {"col1": "Close"}},
+    {"output": "CHANGE_CLOSE_5", "func": change_ratio(5), "columns": {"col1": "Close"}},
+    {"output": "CHANGE_CLOSE_10", "func": change_ratio(10), "columns": {"col1": "Close"}},
+    {"output": "CHANGE_CLOSE_20", "func": change_ratio(20), "columns": {"col1": "Close"}},
+    {"output": "CHANGE_CLOSE_30", "func": change_ratio(30), "columns": {"col1": "Close"}},
+    {"output": "CHANGE_CLOSE_50", "func": change_ratio(50), "columns": {"col1": "Close"}},
+    {"output": "CHANGE_CLOSE_100", "func": change_ratio(100), "columns": {"col1": "Close"}},
+    {"output": "CHANGE_CLOSE_200", "func": change_ratio(200), "columns": {"col1": "Close"}},
 ]
 
 # Calculations of future price movements from the raw price data
 custom_ta_sets__future = [
-    {"output": "FUTURE_END_CLOSE_5", "func": lambda col1: col1.shift(-5) / col1, "columns": {"col1": "Close"}},
-    {"output": "FUTURE_END_CLOSE_10", "func": lambda col1: col1.shift(-10) / col1, "columns": {"col1": "Close"}},
-    {"output": "FUTURE_END_CLOSE_15", "func": lambda col1: col1.shift(-15) / col1, "columns": {"col1": "Close"}},
-    {"output": "FUTURE_END_CLOSE_20", "func": lambda col1: col1.shift(-20) / col1, "columns": {"col1": "Close"}},
-    {"output": "FUTURE_END_CLOSE_30", "func": lambda col1: col1.shift(-30) / col1, "columns": {"col1": "Close"}},
-    {"output": "FUTURE_END_CLOSE_50", "func": lambda col1: col1.shift(-50) / col1, "columns": {"col1": "Close"}},
+    {"output": "FUTURE_END_CLOSE_5", "func": future_ratio(5), "columns": {"col1": "Close"}},
+    {"output": "FUTURE_END_CLOSE_10", "func": future_ratio(10), "columns": {"col1": "Close"}},
+    {"output": "FUTURE_END_CLOSE_15", "func": future_ratio(15), "columns": {"col1": "Close"}},
+    {"output": "FUTURE_END_CLOSE_20", "func": future_ratio(20), "columns": {"col1": "Close"}},
+    {"output": "FUTURE_END_CLOSE_30", "func": future_ratio(30), "columns": {"col1": "Close"}},
+    {"output": "FUTURE_END_CLOSE_50", "func": future_ratio(50), "columns": {"col1": "Close"}},
     {
         "output": "FUTURE_MAX_CLOSE_5",
-        "func": lambda col1: (col1[::-1].shift(1).rolling(window=5).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(5),
         "columns": {"col1": "Close"},
     },
     {
         "output": "FUTURE_MAX_CLOSE_10",
-        "func": lambda col1: (col1[::-1].shift(1).rolling(window=10).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(10),
         "columns": {"col1": "Close"},
     },
     {
         "output": "FUTURE_MAX_CLOSE_15",
-        "func": lambda col1: (col1[::-1].shift(1).rolling(window=15).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(15),
         "columns": {"col1": "Close"},
     },
     {
         "output": "FUTURE_MAX_CLOSE_20",
-        "func": lambda col1: (col1[::-1].shift(1).rolling(window=20).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(20),
         "columns": {"col1": "Close"},
     },
     {
         "output": "FUTURE_MAX_CLOSE_30",
-        "func": lambda col1: (col1[::-1].shift(1).rolling(window=30).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(30),
         "columns": {"col1": "Close"},
     },
     {
         "output": "FUTURE_MAX_CLOSE_50",
-        "func": lambda col1: (col1[::-1].shift(1).rolling(window=50).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(50),
         "columns": {"col1": "Close"},
     },
     {
         "output": "FUTURE_MAX_HIGH_5",
-        "func": lambda col1, col2: (col2[::-1].shift(1).rolling(window=5).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(5, two_columns=True),
         "columns": {"col1": "Close", "col2": "High"},
     },
     {
         "output": "FUTURE_MAX_HIGH_10",
-        "func": lambda col1, col2: (col2[::-1].shift(1).rolling(window=10).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(10, two_columns=True),
         "columns": {"col1": "Close", "col2": "High"},
     },
     {
         "output": "FUTURE_MAX_HIGH_15",
-        "func": lambda col1, col2: (col2[::-1].shift(1).rolling(window=15).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(15, two_columns=True),
         "columns": {"col1": "Close", "col2": "High"},
     },
     {
         "output": "FUTURE_MAX_HIGH_20",
-        "func": lambda col1, col2: (col2[::-1].shift(1).rolling(window=20).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(20, two_columns=True),
         "columns": {"col1": "Close", "col2": "High"},
     },
     {
         "output": "FUTURE_MAX_HIGH_30",
-        "func": lambda col1, col2: (col2[::-1].shift(1).rolling(window=30).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(30, two_columns=True),
         "columns": {"col1": "Close", "col2": "High"},
     },
     {
         "output": "FUTURE_MAX_HIGH_50",
-        "func": lambda col1, col2: (col2[::-1].shift(1).rolling(window=50).max() / col1[::-1])[::-1],
+        "func": future_max_ratio(50, two_columns=True),
         "columns": {"col1": "Close", "col2": "High"},
     },
 ]
@@ -3,7 +3,8 @@ from functools import reduce
 import talib as ta
 from tqdm.auto import tqdm
 
-from stock_downloader.utilities import downcast_numeric_columns
+from stock_downloader.schemas.dtype_plans import apply_dtype_plan
+from stock_downloader.schemas.ta_layout import talib_output_names
 
 
 def run_talib_functions(df: DataFrame, functions: list[dict], pattern_columns: list[str], pattern_col_scaler: float = 1) -> DataFrame:
@@ -29,38 +30,18 @@ def run_talib_functions(df: DataFrame, functions: list[dict], pattern_columns: l
         except AttributeError as e:
             print(f"Invalid talib function: {e}")
             continue
-        # sig = inspect.signature(func)
-        # params = sig.parameters
-        param_value_list = []
         try:
             # Build argument list for this TA-Lib function
-            args = {}
-            # print(func, params)
-            for pname in params.keys():
-                if pname in input_map:
-                    args[pname] = input_map[pname]
-                else:
-                    args[pname] = params.get(pname)
-                    param_value_list.append(str(params.get(pname)))
-                # elif sig.parameters[pname].default != inspect.Parameter.empty:
-                #     args[pname] = sig.parameters[pname].default
-                # else:
-                #     raise ValueError(f"Missing required input: {pname}")
+            args = {pname: input_map[pname] if pname in input_map else params.get(pname) for pname in params.keys()}
 
             # Call the function
             output = func(**args)
 
-            # Handle single or multiple outputs
-            if isinstance(output, Series) and len(param_value_list) == 0:
-                df_out = output.rename(f"{func_name}").to_frame()
-            elif isinstance(output, Series):
-                df_out = output.rename(f"{func_name}_{'_'.join(param_value_list)}").to_frame()
-            elif isinstance(output, tuple):
-                df_out = concat([s.rename(f"{func_name}_{'_'.join(param_value_list)}__{i + 1}") for i, s in enumerate(output)], axis=1)
-            elif isinstance(output, DataFrame):
-                df_out = output.rename(columns=lambda c: f"{func_name}_{c}")
-            else:
+            # Name single or multiple outputs the same way the generated schemas do
+            outputs = output if isinstance(output, tuple) else (output,)
+            if not all(isinstance(s, Series) for s in outputs):
                 continue  # skip unsupported outputs
+            df_out = concat([s.rename(name) for s, name in zip(outputs, talib_output_names(func_name, params))], axis=1)
 
             # Add Date and symbol
             df_out["Date"] = df["Date"]
@@ -94,9 +75,11 @@ def run_custom_ta(df: DataFrame, functions: list[dict]) -> DataFrame:
     for function_set in functions:
         output_name = function_set.get("output")
         func = function_set.get("func")
-        args = {k: df[v] for k, v in function_set.get("columns").items()}
 
         try:
+            # Inputs can be missing for a single symbol when an upstream column was all-NaN and dropped
+            args = {k: df[v] for k, v in function_set.get("columns").items()}
+
             # Call the function
             output = func(**args)
             df_out = output.rename(output_name).to_frame()
@@ -121,19 +104,20 @@ def run_custom_ta(df: DataFrame, functions: list[dict]) -> DataFrame:
     return final_df.dropna(how="all", axis=1)  # .dropna(how='any', axis=0)
 
 
-def concatenate_ta_results(dfs: list[DataFrame], symbol_col: str = "symbol", date_col: str = "Date") -> DataFrame:
+def concatenate_ta_results(dfs: list[DataFrame], symbol_col: str = "symbol", date_col: str = "Date", dtypes: dict = None) -> DataFrame:
     df = concat(dfs, axis=0).sort_values([symbol_col, date_col]).reset_index(drop=False)
-    df = downcast_numeric_columns(df)
+    if dtypes:
+        df = apply_dtype_plan(df, dtypes)
     return df
 
 
-def run_all_talib(data_df: DataFrame, functions: list[dict], pattern_columns: list[str]) -> DataFrame:
+def run_all_talib(data_df: DataFrame, functions: list[dict], pattern_columns: list[str], dtypes: dict = None) -> DataFrame:
     results = [
         run_talib_functions(df=df[1], functions=functions, pattern_columns=pattern_columns) for df in tqdm(data_df.groupby("symbol"))
     ]
-    return concatenate_ta_results([i for i in results if i is not None])
+    return concatenate_ta_results([i for i in results if i is not None], dtypes=dtypes)
 
 
-def run_all_custom_ta(data_df: DataFrame, functions: list[dict]) -> DataFrame:
+def run_all_custom_ta(data_df: DataFrame, functions: list[dict], dtypes: dict = None) -> DataFrame:
     results = [run_custom_ta(df=df[1], functions=functions) for df in tqdm(data_df.groupby("symbol"))]
-    return concatenate_ta_results([i for i in results if i is not None])
+    return concatenate_ta_results([i for i in results if i is not None], dtypes=dtypes)
@@ -1,20 +1,13 @@
-from pandas import to_numeric, DataFrame
+from pandas import to_datetime, DataFrame, Series
+from pandas.api.types import is_integer_dtype
 from pathlib import Path
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable
+from loguru import logger
+import pyarrow as pa
 
-
-def downcast_numeric_columns(df):
-    """
-    Downcast numeric columns in a DataFrame to the smallest possible numeric dtype.
-    Returns a new DataFrame with optimized dtypes.
-    """
-    df_optimized = df.copy()
-    for col in df_optimized.select_dtypes(include=["int", "float"]).columns:
-        col_type = df_optimized[col].dtype
-        if "int" in str(col_type):
-            df_optimized[col] = to_numeric(df_optimized[col], downcast="integer")
-        elif "float" in str(col_type):
-            df_optimized[col] = to_numeric(df_optimized[col], downcast="float")
-    return df_optimized
+from stock_downloader.data.loaders import FrozenDict
 
 
 def camel_to_snake(text):
@@ -35,5 +28,87 @@ def validate_folder(path: str, exist_ok: bool = True, parents: bool = True) -> P
     return path_
 
 
-def rename_and_select_columns(df: DataFrame, mappings: dict) -> DataFrame:
-    return df.loc[:, [col for col in df.columns if col in mappings.keys()]].rename(columns=mappings)
+@dataclass(frozen=True, eq=False)
+class ProjectionPlan:
+    """Positional selection and renaming of one input schema through a column mapping."""
+
+    positions: tuple
+    names: tuple
+    unmapped: tuple
+
+    def apply(self, df: DataFrame | pa.Table) -> DataFrame | pa.Table:
+        """
+        Project a DataFrame or Arrow table. With copy-on-write, which the package enables, the projected DataFrame
+        shares the input's columns until either frame is modified, so no column is copied.
+        """
+        if isinstance(df, pa.Table):
+            return df.select(list(self.positions)).rename_columns(list(self.names))
+        return df.iloc[:, list(self.positions)].set_axis(list(self.names), axis=1)
+
+
+@dataclass(frozen=True, eq=False)
+class ColumnMapping:
+    """A column mapping compiled once, with a projection plan cached for each input schema it is applied to."""
+
+    rename: dict
+    _plans: dict = field(default_factory=dict, repr=False)
+
+    def plan(self, columns: Iterable) -> ProjectionPlan:
+        columns = tuple(columns)
+        plan = self._plans.get(columns)
+        if plan is None:
+            positions = tuple(i for i, col in enumerate(columns) if col in self.rename)
+            plan = ProjectionPlan(
+                positions=positions,
+                names=tuple(self.rename[columns[i]] for i in positions),
+                unmapped=tuple(col for col in columns if col not in self.rename),
+            )
+            if plan.unmapped:
+                logger.warning(f"Dropping {len(plan.unmapped)} unmapped columns: {', '.join(map(str, plan.unmapped[:10]))}")
+            self._plans[columns] = plan
+        return plan
+
+    def apply(self, df: DataFrame | pa.Table) -> DataFrame | pa.Table:
+        return self.plan(df.column_names if isinstance(df, pa.Table) else df.columns).apply(df)
+
+
+@lru_cache(maxsize=None)
+def _compile_column_mapping(mappings: FrozenDict) -> ColumnMapping:
+    return ColumnMapping(rename=dict(mappings))
+
+
+def compile_column_mapping(mappings: dict | ColumnMapping) -> ColumnMapping:
+    """Compile a mapping once per process; plain dicts are frozen first so they share the cache."""
+    if isinstance(mappings, ColumnMapping):
+        return mappings
+    return _compile_column_mapping(mappings if isinstance(mappings, FrozenDict) else FrozenDict(mappings))
+
+
+def rename_and_select_columns(df: DataFrame | pa.Table, mappings: dict | ColumnMapping) -> DataFrame | pa.Table:
+    return compile_column_mapping(mappings).apply(df)
+
+
+def to_arrow(df: DataFrame | pa.Table, dictionary_columns: Iterable[str] = ("symbol",)) -> pa.Table:
+    """
+    Convert a frame to an Arrow table once: the given string columns are dictionary encoded and nanosecond
+    timestamps become microsecond timestamps, the resolution of a DuckDB TIMESTAMP.
+    """
+    table = df if isinstance(df, pa.Table) else pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if field.name in dictionary_columns and (pa.types.is_string(field.type) or pa.types.is_large_string(field.type)):
+            table = table.set_column(i, field.name, table.column(i).dictionary_encode())
+        elif pa.types.is_timestamp(field.type) and field.type.unit == "ns":
+            table = table.set_column(i, field.name, table.column(i).cast(pa.timestamp("us", tz=field.type.tz), safe=False))
+    return table
+
+
+def date_to_day_number(dates: Series) -> Series:
+    """Convert datetime64 values to int32 days since the epoch."""
+    return Series(dates.to_numpy(dtype="datetime64[D]").astype("int32"), index=dates.index, name=dates.name)
+
+
+def day_number_to_date(values: Series) -> Series:
+    """Convert int day numbers back to datetime64[ns]; other values are parsed with to_datetime."""
+    if is_integer_dtype(values):
+        return to_datetime(values, unit="D")
+    return to_datetime(values)
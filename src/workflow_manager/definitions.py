@@ -9,12 +9,14 @@ from workflow_manager.defs.assets import (
     technical_etfs_asset,
     indicies_asset,
     select_symbols_asset,
+    universe_diff_asset,
     equity_info_asset,
     etf_info_asset,
     price_asset,
     price_validation_asset,
     run_regression_asset,
-    write_to_database,
+    write_table_assets,
+    feature_views_asset,
     run_talib_asset,
     talib_validation_asset,
     run_talib_ma_ratio_asset,
@@ -27,11 +29,9 @@ from workflow_manager.defs.assets import (
 )
 
 # from pathlib import Path
-from dagster_duckdb import DuckDBResource
+from workflow_manager.defs.resources import StockDatabaseResource
 from dagster import Definitions
 
-database_resource = DuckDBResource(database="/tmp/jaffle_platform.duckdb")
-
 defs = Definitions(
     assets=[
         config_asset,
@@ -44,13 +44,13 @@ defs = Definitions(
         technical_etfs_asset,
         indicies_asset,
         select_symbols_asset,
+        universe_diff_asset,
         equity_info_asset,
         etf_info_asset,
         price_asset,
         price_validation_asset,
         run_regression_asset,
         regression_validation_asset,
-        write_to_database,
         run_talib_asset,
         talib_validation_asset,
         run_talib_ma_ratio_asset,
@@ -59,9 +59,11 @@ defs = Definitions(
         run_regression_indicators_asset,
         regression_indicators_validation_asset,
         run_regression_indicators_ma_asset,
+        *write_table_assets,
+        feature_views_asset,
     ],
     resources={
-        "duckdb": database_resource,
+        "database": StockDatabaseResource(),
     },
 )
 
@@ -4,25 +4,20 @@ from stock_downloader.data.nasdaq import NasdaqDownloader
 from stock_downloader.data.index_symbols import GetIndexSymbols
 from stock_downloader.data.listed_symbols import StockSymbolDownloader
 from stock_downloader.data.yfinance_batch import YahooFinanceBatchDownloader
-from stock_downloader.data.yfinance_info import YahooFinanceTickerInfo
-from stock_downloader.data.yfinance_price import YahooFinancePriceHistory
+from stock_downloader.data.info_cache import load_info_cache
+from stock_downloader.data.providers import load_provider
+from stock_downloader.data.http_session import get_session
+from stock_downloader.data.http_cache import load_http_cache
+from stock_downloader.data.universe import UniverseDiff, UniverseSnapshotStore, load_universe_store, download_price_history
 from stock_downloader.utilities import rename_and_select_columns
 from stock_downloader.technical_analysis.regression import run_all_regression
-from stock_downloader.database.db import write_table
-from stock_downloader.schemas.indicies import indicies_schema
-from stock_downloader.schemas.equity_info import equity_info_schema
-from stock_downloader.schemas.etf_info import etf_info_schema
-from stock_downloader.schemas.price import price_schema
-from stock_downloader.schemas.nasdaq_symbols import nasdaq_symbols_schema
-from stock_downloader.schemas.other_symbols import other_symbols_schema
-from stock_downloader.schemas.talib import talib_schema
-from stock_downloader.schemas.ta__change import ta__change_schema
-from stock_downloader.schemas.ta__ma_ratio import ta__ma_ratio_schema
-from stock_downloader.schemas.regression import regression_schema
-from stock_downloader.schemas.regression_indicators import regression_indicators_schema
-from stock_downloader.schemas.regression_indicators_ma import regression_indicators_ma_schema
-from stock_downloader.schemas.ma_future import ma_future_schema
+from stock_downloader.database.lake import write_to_store
+from stock_downloader.database.feature_views import FEATURE_VIEWS, create_feature_views
+from stock_downloader.database.latest import refresh_latest_features
 from stock_downloader.data.select_symbols import select_symbols, symbolLists
+from stock_downloader.schemas.dtype_plans import dtype_plan
+from stock_downloader.schemas.fast_validation import validate_table
+from stock_downloader.schemas.ta_layout import load_column_mappings
 from stock_downloader.technical_analysis.talib import (
     run_all_talib,
     run_all_custom_ta,
@@ -36,12 +31,12 @@ from stock_downloader.technical_analysis.ta_definitions import (
     custom_ta_sets__regression_channel,
     custom_ta_sets__regression_channel_ma,
 )
+from workflow_manager.defs.resources import StockDatabaseResource
 from pathlib import Path
+from typing import Optional
 
-# from dagster_duckdb import DuckDBResource
 import dagster as dg
-from pandas import DataFrame
-import duckdb
+from pandas import DataFrame, read_parquet
 
 
 @dg.asset(tags={"domain": "config"})
@@ -51,26 +46,44 @@ def config_asset() -> dict:
 
 @dg.asset(tags={"domain": "schemas"})
 def column_mappings_asset() -> dict:
-    return load_mappings(name="columns")
+    return load_column_mappings()
 
 
 @dg.asset(tags={"domain": "symbols"})
-def nasdaq_symbols_asset(column_mappings_asset: dict) -> DataFrame:
-    return nasdaq_symbols_schema.validate(
-        rename_and_select_columns(df=NasdaqDownloader().df, mappings=column_mappings_asset.get("nasdaq_symbols"))
+def nasdaq_symbols_asset(config_asset: dict, column_mappings_asset: dict) -> DataFrame:
+    session = get_session(config=config_asset)
+    cache = load_http_cache(config=config_asset, session=session)
+    return validate_table(
+        config=config_asset,
+        table="nasdaq_symbols",
+        df=rename_and_select_columns(
+            df=NasdaqDownloader(session=session, cache=cache).df, mappings=column_mappings_asset.get("nasdaq_symbols")
+        ),
     )
 
 
 @dg.asset(tags={"domain": "symbols"})
-def other_stock_symbols_asset(column_mappings_asset: dict) -> DataFrame:
-    return other_symbols_schema.validate(
-        rename_and_select_columns(df=StockSymbolDownloader().df, mappings=column_mappings_asset.get("other_symbols"))
+def other_stock_symbols_asset(config_asset: dict, column_mappings_asset: dict) -> DataFrame:
+    session = get_session(config=config_asset)
+    cache = load_http_cache(config=config_asset, session=session)
+    return validate_table(
+        config=config_asset,
+        table="other_symbols",
+        df=rename_and_select_columns(
+            df=StockSymbolDownloader(session=session, cache=cache).df, mappings=column_mappings_asset.get("other_symbols")
+        ),
     )
 
 
 @dg.asset(tags={"domain": "symbols"})
-def index_symbols_asset(column_mappings_asset: dict) -> DataFrame:
-    return indicies_schema.validate(rename_and_select_columns(df=GetIndexSymbols().df, mappings=column_mappings_asset.get("indicies")))
+def index_symbols_asset(config_asset: dict, column_mappings_asset: dict) -> DataFrame:
+    session = get_session(config=config_asset)
+    cache = load_http_cache(config=config_asset, session=session)
+    return validate_table(
+        config=config_asset,
+        table="indicies",
+        df=rename_and_select_columns(df=GetIndexSymbols(session=session, cache=cache).df, mappings=column_mappings_asset.get("indicies")),
+    )
 
 
 @dg.asset(tags={"domain": "symbols"})
@@ -121,36 +134,110 @@ def select_symbols_asset(
         get_nasdaq100=config_asset.get("symbols").get("get_nasdaq100"),
         get_sp500=config_asset.get("symbols").get("get_sp500"),
         sample=None,
+        sample_seed=config_asset.get("symbols").get("sample_seed"),
     )
 
 
 @dg.asset(tags={"domain": "yfinance"})
-def equity_info_asset(select_symbols_asset: symbolLists, config_asset: dict, column_mappings_asset: dict) -> DataFrame:
+def equity_info_asset(
+    context: dg.AssetExecutionContext, select_symbols_asset: symbolLists, config_asset: dict, column_mappings_asset: dict
+) -> DataFrame:
     equity_info = YahooFinanceBatchDownloader(
-        symbols=select_symbols_asset.equity, path=config_asset.get("data").get("temp_folder"), cls=YahooFinanceTickerInfo
+        symbols=select_symbols_asset.equity,
+        path=config_asset.get("data").get("temp_folder"),
+        fetch=load_provider(config=config_asset, session=get_session(config=config_asset)).ticker_info,
+        cache=load_info_cache(config=config_asset),
+        retry_time=config_asset.get("provider").get("retry_time"),
+        dtypes=dtype_plan("equity_info"),
+    )
+    context.add_output_metadata(
+        {
+            "cache_hits": equity_info.cache_hits,
+            "cache_misses": equity_info.cache_misses,
+            "http_connections": get_session(config=config_asset).metrics_summary(),
+        }
+    )
+    return validate_table(
+        config=config_asset,
+        table="equity_info",
+        df=rename_and_select_columns(df=equity_info.data, mappings=column_mappings_asset.get("equity_info")),
     )
-    return equity_info_schema.validate(rename_and_select_columns(df=equity_info.data, mappings=column_mappings_asset.get("equity_info")))
 
 
 @dg.asset(tags={"domain": "yfinance"})
-def etf_info_asset(select_symbols_asset: symbolLists, config_asset: dict, column_mappings_asset: dict) -> DataFrame:
+def etf_info_asset(
+    context: dg.AssetExecutionContext, select_symbols_asset: symbolLists, config_asset: dict, column_mappings_asset: dict
+) -> DataFrame:
     etf_info = YahooFinanceBatchDownloader(
-        symbols=select_symbols_asset.etf, path=config_asset.get("data").get("temp_folder"), cls=YahooFinanceTickerInfo
+        symbols=select_symbols_asset.etf,
+        path=config_asset.get("data").get("temp_folder"),
+        fetch=load_provider(config=config_asset, session=get_session(config=config_asset)).ticker_info,
+        cache=load_info_cache(config=config_asset),
+        retry_time=config_asset.get("provider").get("retry_time"),
+        dtypes=dtype_plan("etf_info"),
+    )
+    context.add_output_metadata(
+        {
+            "cache_hits": etf_info.cache_hits,
+            "cache_misses": etf_info.cache_misses,
+            "http_connections": get_session(config=config_asset).metrics_summary(),
+        }
+    )
+    return validate_table(
+        config=config_asset,
+        table="etf_info",
+        df=rename_and_select_columns(df=etf_info.data, mappings=column_mappings_asset.get("etf_info")),
+    )
+
+
+@dg.asset(tags={"domain": "symbols"})
+def universe_diff_asset(
+    context: dg.AssetExecutionContext, select_symbols_asset: symbolLists, index_symbols_asset: DataFrame, config_asset: dict
+) -> Optional[UniverseDiff]:
+    universe_store = load_universe_store(config=config_asset)
+    if universe_store is None:
+        return None
+    universe_diff = universe_store.save(
+        UniverseSnapshotStore.build_snapshot(symbol_lists=select_symbols_asset, index_symbols_df=index_symbols_asset),
+        index_symbols_df=index_symbols_asset,
+    )
+    context.add_output_metadata(
+        {
+            "version": universe_diff.version,
+            "added": len(universe_diff.added),
+            "removed": len(universe_diff.removed),
+            "unchanged": len(universe_diff.unchanged),
+            "membership_changes": len(universe_diff.membership_changes),
+        }
     )
-    return etf_info_schema.validate(rename_and_select_columns(df=etf_info.data, mappings=column_mappings_asset.get("etf_info")))
+    return universe_diff
 
 
 @dg.asset(tags={"domain": "yfinance"})
-def price_asset(select_symbols_asset: symbolLists, config_asset: dict) -> DataFrame:
+def price_asset(select_symbols_asset: symbolLists, universe_diff_asset: Optional[UniverseDiff], config_asset: dict) -> DataFrame:
     all_symbols = sorted(set(select_symbols_asset.etf + select_symbols_asset.equity))
-    return YahooFinanceBatchDownloader(
-        symbols=all_symbols, path=config_asset.get("data").get("temp_folder"), cls=YahooFinancePriceHistory
-    ).data
+    session = get_session(config=config_asset)
+    previous_price_file = Path(config_asset.get("data").get("output_folder")) / "yahoo_price.parquet"
+    price_df = download_price_history(
+        symbols=all_symbols,
+        path=config_asset.get("data").get("temp_folder"),
+        full_fetch=load_provider(config=config_asset, session=session).price_history,
+        incremental_fetch=load_provider(
+            config=config_asset, session=session, period=config_asset.get("universe").get("incremental_period")
+        ).price_history,
+        diff=universe_diff_asset,
+        previous_price=read_parquet(previous_price_file) if universe_diff_asset is not None and previous_price_file.exists() else None,
+        retry_time=config_asset.get("provider").get("retry_time"),
+    )
+    price_df.to_parquet(previous_price_file, index=False)
+    return price_df
 
 
 @dg.asset(tags={"domain": "validation"})
-def price_validation_asset(price_asset: DataFrame, column_mappings_asset: dict) -> DataFrame:
-    return price_schema.validate(rename_and_select_columns(df=price_asset, mappings=column_mappings_asset.get("price")))
+def price_validation_asset(price_asset: DataFrame, column_mappings_asset: dict, config_asset: dict) -> DataFrame:
+    return validate_table(
+        config=config_asset, table="price", df=rename_and_select_columns(df=price_asset, mappings=column_mappings_asset.get("price"))
+    )
 
 
 @dg.asset(tags={"domain": "regression"})
@@ -159,96 +246,119 @@ def run_regression_asset(price_asset: DataFrame, config_asset: dict) -> DataFram
 
 
 @dg.asset(tags={"domain": "validation"})
-def regression_validation_asset(run_regression_asset: DataFrame, column_mappings_asset: dict) -> DataFrame:
-    return regression_schema.validate(rename_and_select_columns(df=run_regression_asset, mappings=column_mappings_asset.get("regression")))
+def regression_validation_asset(run_regression_asset: DataFrame, column_mappings_asset: dict, config_asset: dict) -> DataFrame:
+    return validate_table(
+        config=config_asset,
+        table="regression",
+        df=rename_and_select_columns(df=run_regression_asset, mappings=column_mappings_asset.get("regression")),
+    )
 
 
 @dg.asset(tags={"domain": "talib"})
 def run_talib_asset(price_asset: DataFrame) -> DataFrame:
-    return run_all_talib(data_df=price_asset, functions=talib_functions, pattern_columns=pattern_columns)
+    return run_all_talib(data_df=price_asset, functions=talib_functions, pattern_columns=pattern_columns, dtypes=dtype_plan("ta__talib"))
 
 
 @dg.asset(tags={"domain": "validation"})
-def talib_validation_asset(run_talib_asset: DataFrame, column_mappings_asset: dict) -> DataFrame:
-    return talib_schema.validate(rename_and_select_columns(df=run_talib_asset, mappings=column_mappings_asset.get("ta__talib")))
+def talib_validation_asset(run_talib_asset: DataFrame, column_mappings_asset: dict, config_asset: dict) -> DataFrame:
+    return validate_table(
+        config=config_asset,
+        table="ta__talib",
+        df=rename_and_select_columns(df=run_talib_asset, mappings=column_mappings_asset.get("ta__talib")),
+    )
 
 
 @dg.asset
-def run_talib_ma_ratio_asset(price_asset: DataFrame, run_talib_asset: DataFrame, column_mappings_asset: dict) -> DataFrame:
+def run_talib_ma_ratio_asset(
+    price_asset: DataFrame, run_talib_asset: DataFrame, column_mappings_asset: dict, config_asset: dict
+) -> DataFrame:
     df = price_asset.merge(run_talib_asset.rename(columns={"date": "Date"}), on=["symbol", "Date"], how="inner")
-    df = run_all_custom_ta(data_df=df, functions=custom_ta_sets__ma_ratio)
+    df = run_all_custom_ta(data_df=df, functions=custom_ta_sets__ma_ratio, dtypes=dtype_plan("ta__ma_ratio"))
     df = rename_and_select_columns(df=df, mappings=column_mappings_asset.get("ta__ma_ratio"))
-    return ta__ma_ratio_schema.validate(df)
+    return validate_table(config=config_asset, table="ta__ma_ratio", df=df)
 
 
 @dg.asset
-def run_talib_change_asset(price_asset: DataFrame, column_mappings_asset: dict) -> DataFrame:
-    df = run_all_custom_ta(data_df=price_asset, functions=custom_ta_sets__change_ratio)
+def run_talib_change_asset(price_asset: DataFrame, column_mappings_asset: dict, config_asset: dict) -> DataFrame:
+    df = run_all_custom_ta(data_df=price_asset, functions=custom_ta_sets__change_ratio, dtypes=dtype_plan("ta__change"))
     df = rename_and_select_columns(df=df, mappings=column_mappings_asset.get("ta__change"))
-    return ta__change_schema.validate(df)
+    return validate_table(config=config_asset, table="ta__change", df=df)
 
 
 @dg.asset
-def run_ma_future_asset(price_asset: DataFrame, column_mappings_asset: dict) -> DataFrame:
-    df = run_all_custom_ta(data_df=price_asset, functions=custom_ta_sets__future)
+def run_ma_future_asset(price_asset: DataFrame, column_mappings_asset: dict, config_asset: dict) -> DataFrame:
+    df = run_all_custom_ta(data_df=price_asset, functions=custom_ta_sets__future, dtypes=dtype_plan("ma_future"))
     df = rename_and_select_columns(df=df, mappings=column_mappings_asset.get("ma_future"))
-    return ma_future_schema.validate(df)
+    return validate_table(config=config_asset, table="ma_future", df=df)
 
 
 @dg.asset
 def run_regression_indicators_asset(price_asset: DataFrame, run_regression_asset: DataFrame) -> DataFrame:
     df = price_asset.merge(run_regression_asset.rename(columns={"date": "Date"}), on=["symbol", "Date"], how="inner")
-    df = run_all_custom_ta(data_df=df, functions=custom_ta_sets__regression_channel)
+    df = run_all_custom_ta(data_df=df, functions=custom_ta_sets__regression_channel, dtypes=dtype_plan("regression_indicators"))
     return df
 
 
 @dg.asset(tags={"domain": "validation"})
-def regression_indicators_validation_asset(run_regression_indicators_asset: DataFrame, column_mappings_asset: dict) -> DataFrame:
-    return regression_indicators_schema.validate(
-        rename_and_select_columns(df=run_regression_indicators_asset, mappings=column_mappings_asset.get("regression_indicators"))
+def regression_indicators_validation_asset(
+    run_regression_indicators_asset: DataFrame, column_mappings_asset: dict, config_asset: dict
+) -> DataFrame:
+    return validate_table(
+        config=config_asset,
+        table="regression_indicators",
+        df=rename_and_select_columns(df=run_regression_indicators_asset, mappings=column_mappings_asset.get("regression_indicators")),
     )
 
 
 @dg.asset
-def run_regression_indicators_ma_asset(run_regression_indicators_asset: DataFrame, column_mappings_asset: dict) -> DataFrame:
-    df = run_all_custom_ta(data_df=run_regression_indicators_asset, functions=custom_ta_sets__regression_channel_ma)
+def run_regression_indicators_ma_asset(
+    run_regression_indicators_asset: DataFrame, column_mappings_asset: dict, config_asset: dict
+) -> DataFrame:
+    df = run_all_custom_ta(
+        data_df=run_regression_indicators_asset,
+        functions=custom_ta_sets__regression_channel_ma,
+        dtypes=dtype_plan("regression_indicators_ma"),
+    )
     df = rename_and_select_columns(df=df, mappings=column_mappings_asset.get("regression_indicators_ma"))
-    return regression_indicators_ma_schema.validate(df)
-
-
-@dg.asset
-def write_to_database(
-    config_asset: dict,
-    regression_validation_asset: DataFrame,
-    nasdaq_symbols_asset: DataFrame,
-    other_stock_symbols_asset: DataFrame,
-    index_symbols_asset: DataFrame,
-    equity_info_asset: DataFrame,
-    etf_info_asset: DataFrame,
-    price_validation_asset: DataFrame,
-    talib_validation_asset: DataFrame,
-    run_talib_ma_ratio_asset: DataFrame,
-    run_talib_change_asset: DataFrame,
-    run_ma_future_asset: DataFrame,
-    regression_indicators_validation_asset: DataFrame,
-    run_regression_indicators_ma_asset: DataFrame,
-) -> None:
-    db = duckdb.connect(
-        Path(config_asset.get("database").get("database_folder")) / f"{config_asset.get('database').get('database_name')}.db"
-    )
-
-    write_table(db=db, df=nasdaq_symbols_asset, table="nasdaq_symbols")
-    write_table(db=db, df=other_stock_symbols_asset, table="other_symbols")
-    write_table(db=db, df=index_symbols_asset, table="indicies")
-    write_table(db=db, df=equity_info_asset, table="equity_info")
-    write_table(db=db, df=etf_info_asset, table="etf_info")
-    write_table(db=db, df=price_validation_asset, table="price")
-    write_table(db=db, df=talib_validation_asset, table="talib")
-    write_table(db=db, df=run_talib_change_asset, table="ta__change")
-    write_table(db=db, df=run_talib_ma_ratio_asset, table="ta__ma_ratio")
-    write_table(db=db, df=regression_validation_asset, table="regression")
-    write_table(db=db, df=run_ma_future_asset, table="ma_future")
-    write_table(db=db, df=regression_indicators_validation_asset, table="regression_indicators")
-    write_table(db=db, df=run_regression_indicators_ma_asset, table="regression_indicators_ma")
-
-    db.close()
+    return validate_table(config=config_asset, table="regression_indicators_ma", df=df)
+
+
+def table_write_asset(table: str, schema: str, upstream: str) -> dg.AssetsDefinition:
+    """
+    An asset writing one table as soon as its upstream frame is ready, through the database resource. Steps of a
+    multiprocess run each hold their process's connection, waiting for the database lock.
+    """
+
+    @dg.asset(name=f"write_{table}_table", ins={"df": dg.AssetIn(key=upstream)})
+    def _write_table(config_asset: dict, df: DataFrame, database: StockDatabaseResource) -> None:
+        if table in FEATURE_VIEWS and config_asset.get("feature_views", {}).get("enabled", False):
+            return
+        write_to_store(db=database.get_cursor(), tables=[(table, schema, df)], config=config_asset)
+
+    return _write_table
+
+
+write_table_assets = [
+    table_write_asset(table="nasdaq_symbols", schema="nasdaq_symbols", upstream="nasdaq_symbols_asset"),
+    table_write_asset(table="other_symbols", schema="other_symbols", upstream="other_stock_symbols_asset"),
+    table_write_asset(table="indicies", schema="indicies", upstream="index_symbols_asset"),
+    table_write_asset(table="equity_info", schema="equity_info", upstream="equity_info_asset"),
+    table_write_asset(table="etf_info", schema="etf_info", upstream="etf_info_asset"),
+    table_write_asset(table="price", schema="price", upstream="price_validation_asset"),
+    table_write_asset(table="talib", schema="ta__talib", upstream="talib_validation_asset"),
+    table_write_asset(table="ta__change", schema="ta__change", upstream="run_talib_change_asset"),
+    table_write_asset(table="ta__ma_ratio", schema="ta__ma_ratio", upstream="run_talib_ma_ratio_asset"),
+    table_write_asset(table="regression", schema="regression", upstream="regression_validation_asset"),
+    table_write_asset(table="ma_future", schema="ma_future", upstream="run_ma_future_asset"),
+    table_write_asset(table="regression_indicators", schema="regression_indicators", upstream="regression_indicators_validation_asset"),
+    table_write_asset(table="regression_indicators_ma", schema="regression_indicators_ma", upstream="run_regression_indicators_ma_asset"),
+]
+
+
+@dg.asset(deps=["write_price_table", "write_talib_table", "write_regression_table"])
+def feature_views_asset(config_asset: dict, column_mappings_asset: dict, database: StockDatabaseResource) -> None:
+    if not config_asset.get("feature_views", {}).get("enabled", False):
+        return
+    create_feature_views(db=database.get_cursor(), column_mappings=column_mappings_asset)
+    if config_asset.get("database").get("latest_features", False):
+        refresh_latest_features(db=database.get_cursor(), tables=[(view, view, None) for view in FEATURE_VIEWS])
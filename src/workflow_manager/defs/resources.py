@@ -0,0 +1,17 @@
+from stock_downloader.data.loaders import load_config
+from stock_downloader.database.connection import DatabaseManager, get_database
+
+import dagster as dg
+
+
+class StockDatabaseResource(dg.ConfigurableResource):
+    """
+    The stock database configured by the [database] section of config.toml, through the same per-process
+    DatabaseManager the CLI uses. Steps in one process share a connection; each thread gets its own cursor.
+    """
+
+    def get_database(self) -> DatabaseManager:
+        return get_database(config=load_config())
+
+    def get_cursor(self):
+        return self.get_database().cursor()
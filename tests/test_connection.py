@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pandas import DataFrame
+
+from stock_downloader.database.connection import DatabaseManager
+from stock_downloader.database.db import write_tables
+
+
+def test_repeated_group_upserts_through_manager(tmp_path):
+    """Deleting and reinserting the same keys through a manager cursor must not conflict with the root connection."""
+    database = DatabaseManager(tmp_path / "stocks.db", row_group_size=122880)
+    try:
+        for run in range(5):
+            officers = DataFrame({"symbol": ["AAA", "AAA"], "position": [0, 1], "name": [f"P{run}", "Q"]})
+            info = DataFrame({"symbol": ["AAA"], "sector": [f"S{run}"]})
+            write_tables(
+                db=database.cursor(),
+                tables=[("equity_info", None, info), ("equity_info__company_officers", None, officers)],
+                mode="upsert",
+            )
+        cursor = database.cursor()
+        assert cursor.execute("SELECT name FROM equity_info__company_officers ORDER BY position").fetchall() == [("P4",), ("Q",)]
+        assert cursor.execute("SELECT sector FROM equity_info").fetchall() == [("S4",)]
+    finally:
+        database.close()
+
+
+def test_threads_share_one_database_through_their_own_cursors(tmp_path):
+    database = DatabaseManager(tmp_path / "stocks.db", row_group_size=122880, settings={"threads": 2})
+    try:
+        database.cursor().execute("CREATE TABLE symbols (symbol VARCHAR)")
+
+        def insert(symbol: str) -> int:
+            cursor = database.cursor()
+            cursor.execute("INSERT INTO symbols VALUES (?)", [symbol])
+            return id(cursor)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            cursors = set(pool.map(insert, ["AAA", "BBB", "CCC", "DDD"]))
+        assert 1 <= len(cursors) <= 2
+        assert database.cursor().execute("SELECT count(*) FROM symbols").fetchall() == [(4,)]
+        assert database.cursor().execute("SELECT current_setting('threads')").fetchall() == [(2,)]
+    finally:
+        database.close()
+
+    # The next use after close reconnects to the same file
+    assert database.cursor().execute("SELECT count(*) FROM symbols").fetchall() == [(4,)]
+    database.close()
@@ -0,0 +1,47 @@
+from pandas import DataFrame, Series, Timestamp, bdate_range, date_range
+
+from stock_downloader.data import yfinance_price
+from stock_downloader.data.yfinance_batch import YahooFinanceBatchDownloader
+from stock_downloader.data.yfinance_price import YahooFinancePriceHistory
+from stock_downloader.technical_analysis.regression import data_between_dates
+from stock_downloader.utilities import date_to_day_number, day_number_to_date
+
+
+class FakeTicker:
+    """Two sessions of an exchange ahead of UTC, as yfinance returns them: midnight local time."""
+
+    def __init__(self, symbol: str, session=None) -> None:
+        self.symbol = symbol
+
+    def history(self, **kwargs) -> DataFrame:
+        dates = date_range("2024-01-02", periods=2, freq="D", tz="Asia/Tokyo", name="Date")
+        prices = {"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": 1.5, "Volume": 100, "Dividends": 0.0, "Stock Splits": 0.0}
+        return DataFrame(prices, index=dates)
+
+
+def test_day_numbers_round_trip():
+    dates = Series(bdate_range("1999-12-30", periods=5), name="Date")
+    days = date_to_day_number(dates)
+    assert str(days.dtype) == "int32" and days.iloc[0] == 10955
+    assert day_number_to_date(days).equals(dates)
+    assert day_number_to_date(dates.dt.strftime("%Y-%m-%d")).equals(dates)
+
+
+def test_price_keeps_the_local_trading_date(tmp_path):
+    ticker = yfinance_price.yf.Ticker
+    yfinance_price.yf.Ticker = FakeTicker
+    try:
+        history = YahooFinancePriceHistory("7203.T", session=object())
+    finally:
+        yfinance_price.yf.Ticker = ticker
+
+    assert history.data["Date"].tolist() == [Timestamp("2024-01-02"), Timestamp("2024-01-03")]
+    price = YahooFinanceBatchDownloader(symbols=["7203.T"], path=tmp_path, fetch=lambda symbol: history(), retry_time=0).data
+    assert price["Date"].tolist() == history.data["Date"].tolist()
+
+
+def test_ordinals_match_timestamp_toordinal():
+    df = DataFrame({"Date": bdate_range("2024-01-01", periods=10)[::-1], "Close": range(10)})
+    window = data_between_dates(df, start_date=Timestamp("2024-01-03"), end_date=Timestamp("2024-01-10"))
+    assert window["Date"].is_monotonic_increasing and len(window) == 6
+    assert window["Date_Ordinal"].tolist() == [date.toordinal() for date in window["Date"]]
@@ -0,0 +1,81 @@
+from duckdb import connect
+from pandas import DataFrame, Timestamp, date_range
+
+from stock_downloader.database.db import CLUSTERING_TABLE, compact_tables, primary_key, table_columns, write_table, write_tables
+
+
+def _price(symbols: list, days: int, close: float = 1.0) -> DataFrame:
+    dates = date_range("2024-01-01", periods=days)
+    return DataFrame([{"symbol": symbol, "date": date, "close": close} for symbol in symbols for date in dates])
+
+
+def _unsorted_rows(db, table: str) -> int:
+    if not table_columns(db=db, table=CLUSTERING_TABLE):
+        return 0
+    rows = db.execute(f"SELECT unsorted_rows FROM {CLUSTERING_TABLE} WHERE table_name = ?", [table]).fetchall()
+    return rows[0][0] if rows else 0
+
+
+def test_upsert_writes_only_new_and_changed_rows(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    write_table(db=db, df=_price(["AAA", "BBB"], days=3), table="price", mode="upsert")
+    df = _price(["AAA", "BBB"], days=4)
+    df.loc[(df["symbol"] == "BBB") & (df["date"] == Timestamp("2024-01-02")), "close"] = 9.0
+
+    write_table(db=db, df=df, table="price", mode="upsert")
+
+    assert db.execute("SELECT count(*) FROM price").fetchall() == [(8,)]
+    assert db.execute("SELECT close FROM price WHERE symbol = 'BBB' AND date = '2024-01-02'").fetchall() == [(9.0,)]
+    # One new day for each symbol and one changed row
+    assert _unsorted_rows(db, "price") == 3
+
+
+def test_upsert_deletes_missing_keys_of_snapshot_tables(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    write_table(db=db, df=DataFrame({"symbol": ["AAA", "BBB"], "name": ["A", "B"]}), table="nasdaq_symbols", mode="upsert")
+    write_table(db=db, df=DataFrame({"symbol": ["BBB", "CCC"], "name": ["B", "C"]}), table="nasdaq_symbols", mode="upsert")
+    assert db.execute("SELECT symbol FROM nasdaq_symbols ORDER BY symbol").fetchall() == [("BBB",), ("CCC",)]
+
+
+def test_upsert_keeps_rows_of_time_series_tables(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    write_table(db=db, df=_price(["AAA", "BBB"], days=2), table="price", mode="upsert")
+    write_table(db=db, df=_price(["BBB"], days=3), table="price", mode="upsert")
+    assert db.execute("SELECT symbol, count(*) FROM price GROUP BY symbol ORDER BY symbol").fetchall() == [("AAA", 2), ("BBB", 3)]
+
+
+def test_failed_write_rolls_back_every_table(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    write_table(db=db, df=_price(["AAA"], days=2), table="price", mode="upsert")
+    write_table(db=db, df=DataFrame({"value": [1]}), table="unkeyed", mode="upsert")
+    try:
+        write_tables(db=db, tables=[("price", None, _price(["AAA"], days=3)), ("unkeyed", None, DataFrame({"value": [2]}))], mode="upsert")
+    except ValueError as e:
+        assert "needs a primary key" in str(e)
+    else:
+        raise AssertionError("an upsert without keys must fail")
+    assert db.execute("SELECT count(*) FROM price").fetchall() == [(2,)]
+
+
+def test_identical_upsert_does_not_compact(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    write_table(db=db, df=_price(["AAA", "BBB"], days=4), table="price", mode="upsert", compact_ratio=0.25)
+    write_table(db=db, df=_price(["AAA", "BBB"], days=4), table="price", mode="upsert", compact_ratio=0.25)
+    assert _unsorted_rows(db, "price") == 0
+    assert compact_tables(db=db, compact_ratio=0.25) == []
+
+
+def test_compaction_sorts_and_keeps_the_primary_key(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    write_table(db=db, df=_price(["AAA", "BBB"], days=4), table="price", mode="upsert")
+    write_table(db=db, df=_price(["AAA", "BBB"], days=6), table="price", mode="upsert")
+    assert _unsorted_rows(db, "price") == 4
+
+    assert compact_tables(db=db, compact_ratio=0.25) == ["price"]
+
+    assert _unsorted_rows(db, "price") == 0
+    assert (
+        db.execute("SELECT symbol, date FROM price").fetchall()
+        == db.execute("SELECT symbol, date FROM price ORDER BY symbol, date").fetchall()
+    )
+    assert primary_key(db=db, table="price") == ["symbol", "date"]
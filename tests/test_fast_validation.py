@@ -0,0 +1,62 @@
+from pandas import DataFrame, Timestamp
+from pandas.testing import assert_frame_equal
+from pandera.errors import SchemaError
+from pandera.pandas import Column, DataFrameSchema
+
+from stock_downloader.schemas.fast_validation import CompiledSchema, ValidationCache
+from stock_downloader.schemas.dtype_plans import SCHEMAS
+
+SCHEMA = DataFrameSchema(
+    {
+        "symbol": Column(str),
+        "a": Column(float, nullable=True, required=False),
+        "b": Column(float, nullable=True, default=0.0),
+        "c": Column(float, nullable=True),
+        "d": Column("Int64", nullable=True),
+    },
+    add_missing_columns=True,
+    coerce=True,
+)
+
+
+def _raises(validate, df: DataFrame) -> bool:
+    try:
+        validate(df)
+    except SchemaError:
+        return True
+    return False
+
+
+def test_missing_columns_and_defaults_match_pandera():
+    frames = [
+        DataFrame({"symbol": ["AAA", "BBB"], "c": [1.0, None]}),
+        DataFrame({"c": [1.0, 2.0], "symbol": ["AAA", "BBB"], "extra": [1, 2]}),
+        DataFrame({"symbol": ["AAA", "BBB"], "b": [None, 2.0], "a": [3.0, None]}),
+    ]
+    compiled = CompiledSchema(SCHEMA, name="test")
+    for df in frames:
+        assert_frame_equal(compiled.validate(df.copy()), SCHEMA.validate(df.copy()))
+
+
+def test_missing_non_nullable_column_without_default_fails_like_pandera():
+    df = DataFrame({"d": [1, 2]})
+    assert _raises(SCHEMA.validate, df) and _raises(CompiledSchema(SCHEMA, name="test").validate, df)
+
+
+def test_ta_schema_adds_missing_indicator_columns():
+    """A feature batch can lack indicators that are all null for its symbols; both validators add them back."""
+    schema = SCHEMAS["ta__talib"]
+    df = DataFrame({"date": [Timestamp("2024-01-02")], "symbol": ["AAA"], "HT_DCPHASE": [1.0], "extra": [0], "RSI_14": [50.0]})
+    assert_frame_equal(CompiledSchema(schema, name="ta__talib").validate(df.copy()), schema.validate(df.copy()))
+
+
+def test_unique_checked_across_skipped_partitions(tmp_path):
+    schema = DataFrameSchema({"symbol": Column(str), "id": Column(int, unique=True)})
+    compiled = CompiledSchema(schema, name="unique")
+    cache = ValidationCache(tmp_path)
+    compiled.validate(DataFrame({"symbol": ["AAA", "BBB"], "id": [1, 2]}), partition_column="symbol", cache=cache)
+
+    # AAA is unchanged and skipped, but BBB's new id collides with it
+    df = DataFrame({"symbol": ["AAA", "BBB"], "id": [1, 1]})
+    assert _raises(lambda df: compiled.validate(df, partition_column="symbol", cache=cache), df)
+    assert _raises(schema.validate, df)
@@ -0,0 +1,54 @@
+from duckdb import connect
+import numpy as np
+from pandas import DataFrame
+
+from stock_downloader.data.providers import LocalReplayProvider
+from stock_downloader.data.yfinance_batch import YahooFinanceBatchDownloader
+from stock_downloader.database.db import write_table
+from stock_downloader.database.feature_views import create_feature_views
+from stock_downloader.schemas.dtype_plans import dtype_plan
+from stock_downloader.schemas.ta_layout import load_column_mappings
+from stock_downloader.technical_analysis.talib import run_all_custom_ta
+from stock_downloader.technical_analysis.ta_definitions import custom_ta_sets__change_ratio, custom_ta_sets__future
+from stock_downloader.utilities import rename_and_select_columns
+
+
+def synthetic_price(days: int = 120) -> DataFrame:
+    provider = LocalReplayProvider(synthetic=True)
+    provider.SYNTHETIC_DAYS = days
+    records = [{"symbol": symbol, **record} for symbol in ["AAA", "BBB"] for record in provider.price_history(symbol)]
+    return YahooFinanceBatchDownloader.records_to_frame(records, dtypes=dtype_plan("price"))
+
+
+def test_views_match_the_pandas_tables(tmp_path):
+    mappings = load_column_mappings()
+    price_df = synthetic_price()
+    db = connect(str(tmp_path / "stocks.db"))
+    write_table(db=db, df=rename_and_select_columns(df=price_df, mappings=mappings["price"]), table="price")
+
+    create_feature_views(db=db, column_mappings=mappings, views=["ta__change", "ma_future"])
+
+    for view, functions in [("ta__change", custom_ta_sets__change_ratio), ("ma_future", custom_ta_sets__future)]:
+        expected = rename_and_select_columns(
+            df=run_all_custom_ta(data_df=price_df, functions=functions, dtypes=dtype_plan(view)), mappings=mappings[view]
+        )
+        computed = db.execute(f"SELECT * FROM {view} ORDER BY symbol, date").df()
+        # The pandas path drops outputs that are all null for a short history; schema validation adds them back as nulls
+        assert set(expected.columns) <= set(computed.columns)
+        assert computed[computed.columns.difference(expected.columns)].isna().all(axis=None)
+        for col in expected.columns.drop(["symbol", "date"]):
+            assert np.allclose(computed[col], expected[col], rtol=1e-5, equal_nan=True), col
+
+
+def test_views_replace_stored_tables_and_follow_new_rows(tmp_path):
+    mappings = load_column_mappings()
+    price = rename_and_select_columns(df=synthetic_price(days=30), mappings=mappings["price"])
+    db = connect(str(tmp_path / "stocks.db"))
+    write_table(db=db, df=price.loc[price["date"] < price["date"].max()], table="price")
+    write_table(db=db, df=DataFrame({"symbol": ["AAA"]}), table="ta__change")
+
+    create_feature_views(db=db, column_mappings=mappings, views=["ta__change"])
+    write_table(db=db, df=price, table="price")
+
+    assert db.execute("SELECT table_type FROM information_schema.tables WHERE table_name = 'ta__change'").fetchall() == [("VIEW",)]
+    assert db.execute("SELECT count(*) FROM ta__change").fetchall() == [(len(price),)]
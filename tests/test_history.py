@@ -0,0 +1,68 @@
+from duckdb import connect
+from pandas import DataFrame, Timestamp
+
+from stock_downloader.database.history import history_table, write_history
+from stock_downloader.database.lake import write_to_store
+
+INFO = DataFrame(
+    {
+        "symbol": ["AAA", "BBB"],
+        "sector": ["Tech", "Energy"],
+        "regular_market_price": [10.0, 20.0],
+        "market_cap": [100, 200],
+        "fifty_two_week_high": [12.0, 25.0],
+    }
+)
+PRICE = DataFrame({"symbol": ["AAA"], "date": [Timestamp("2024-01-01")], "close": [1.0]})
+
+
+def test_view_has_every_column_written(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    write_history(db=db, df=INFO, table="equity_info", as_of=Timestamp("2024-01-01"))
+    assert [row[0] for row in db.execute("DESCRIBE equity_info").fetchall()] == list(INFO.columns)
+
+
+def test_quote_changes_update_the_current_version(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    write_history(db=db, df=INFO, table="equity_info", as_of=Timestamp("2024-01-01"))
+
+    changed = write_history(db=db, df=INFO.assign(regular_market_price=[11.0, 21.0]), table="equity_info", as_of=Timestamp("2024-01-02"))
+
+    assert changed == 0
+    assert db.execute(f"SELECT count(*) FROM {history_table('equity_info')}").fetchall() == [(2,)]
+    assert db.execute("SELECT symbol, regular_market_price FROM equity_info ORDER BY symbol").fetchall() == [("AAA", 11.0), ("BBB", 21.0)]
+
+
+def test_changes_add_versions_and_departed_symbols_close(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    write_history(db=db, df=INFO, table="equity_info", as_of=Timestamp("2024-01-01"))
+
+    changed = write_history(
+        db=db, df=INFO.iloc[:1].assign(sector="Software", market_cap=150), table="equity_info", as_of=Timestamp("2024-01-02")
+    )
+
+    assert changed == 1
+    versions = db.execute(
+        f"SELECT symbol, sector, market_cap, valid_from, valid_to FROM {history_table('equity_info')} ORDER BY symbol, valid_from"
+    ).fetchall()
+    first, second = Timestamp("2024-01-01").to_pydatetime(), Timestamp("2024-01-02").to_pydatetime()
+    assert versions == [
+        ("AAA", "Tech", 100, first, second),
+        ("AAA", "Software", 150, second, None),
+        ("BBB", "Energy", 200, first, second),
+    ]
+    assert db.execute("SELECT symbol, sector FROM equity_info").fetchall() == [("AAA", "Software")]
+
+
+def test_turning_history_off_replaces_the_view(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    config = {"database": {"info_history": True, "write_mode": "upsert"}}
+    write_to_store(db=db, tables=[("equity_info", None, INFO), ("price", None, PRICE)], config=config)
+    assert db.execute("SELECT table_type FROM information_schema.tables WHERE table_name = 'equity_info'").fetchall() == [("VIEW",)]
+
+    config["database"]["info_history"] = False
+    write_to_store(db=db, tables=[("equity_info", None, INFO.iloc[:1])], config=config)
+
+    assert db.execute("SELECT table_type FROM information_schema.tables WHERE table_name = 'equity_info'").fetchall() == [("BASE TABLE",)]
+    assert db.execute("SELECT symbol FROM equity_info").fetchall() == [("AAA",)]
+    assert db.execute("SELECT count(*) FROM price").fetchall() == [(1,)]
@@ -0,0 +1,69 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from threading import Thread
+
+from pandas import DataFrame, read_csv
+
+from stock_downloader.data.http_cache import HttpCache, fetch_and_parse
+from stock_downloader.data.http_session import PooledSession
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b"symbol,name\nAAA,A Corp\n"
+    etag = '"v1"'
+    statuses = []
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == Handler.etag:
+            Handler.statuses.append(304)
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        Handler.statuses.append(200)
+        self.send_response(200)
+        self.send_header("ETag", Handler.etag)
+        self.send_header("Content-Length", str(len(Handler.body)))
+        self.end_headers()
+        self.wfile.write(Handler.body)
+
+    def log_message(self, *args):
+        pass
+
+
+PARSED = []
+
+
+def parse(content: bytes) -> DataFrame:
+    PARSED.append(content)
+    return read_csv(BytesIO(content))
+
+
+def test_unchanged_listing_is_revalidated_and_not_reparsed(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/listing.csv"
+    session = PooledSession()
+    try:
+        fresh = HttpCache(tmp_path, session=session, ttl_hours=24)
+        first = fetch_and_parse(url, parse=parse, session=session, cache=fresh)
+        # Still fresh: no request at all
+        assert fetch_and_parse(url, parse=parse, session=session, cache=fresh).equals(first)
+        assert Handler.statuses == [200] and len(PARSED) == 1
+
+        # Expired: revalidated with the ETag, and the parsed table is reused
+        expired = HttpCache(tmp_path, session=session, ttl_hours=0)
+        assert fetch_and_parse(url, parse=parse, session=session, cache=expired).equals(first)
+        assert Handler.statuses == [200, 304] and len(PARSED) == 1
+
+        # A new parser version parses the same body again
+        fetch_and_parse(url, parse=parse, session=session, cache=expired, version=2)
+        assert len(PARSED) == 2
+
+        Handler.body, Handler.etag = b"symbol,name\nBBB,B Corp\n", '"v2"'
+        changed = fetch_and_parse(url, parse=parse, session=session, cache=expired, version=2)
+        assert Handler.statuses[-1] == 200 and changed["symbol"].tolist() == ["BBB"]
+    finally:
+        session.close()
+        server.shutdown()
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+import time
+
+from stock_downloader.data.http_session import PooledSession, get_session
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        with Handler.lock:
+            Handler.active += 1
+            Handler.peak = max(Handler.peak, Handler.active)
+        time.sleep(0.05)
+        with Handler.lock:
+            Handler.active -= 1
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_session_reuses_connections_and_caps_each_host():
+    server = serve()
+    host = f"127.0.0.1:{server.server_address[1]}"
+    session = PooledSession(max_connections=4, per_host_limit=2)
+    try:
+        for _ in range(3):
+            assert session.get(f"http://{host}/").text == "ok"
+        assert session.metrics_summary()[host] == {"requests": 3, "new_connections": 1, "reused_connections": 2}
+
+        Handler.peak = 0
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(lambda _: session.get(f"http://{host}/"), range(6)))
+        assert Handler.peak == 2
+        assert session.metrics_summary()[host]["requests"] == 9
+    finally:
+        session.close()
+        server.shutdown()
+
+
+def test_one_session_per_process():
+    assert get_session({"http": {"per_host_limit": 3}}) is get_session()
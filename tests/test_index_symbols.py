@@ -0,0 +1,27 @@
+from io import BytesIO
+
+from pandas import read_html
+
+from stock_downloader.data.index_benchmark import FixtureSession, synthetic_page
+from stock_downloader.data.index_symbols import GetIndexSymbols, extract_table
+
+
+def test_extract_table_matches_read_html():
+    content = synthetic_page(tables=6, rows=20, target=3)
+    expected = read_html(BytesIO(content))[3]
+
+    assert extract_table(content, selector={"id": "constituents"}).equals(expected)
+    assert extract_table(content, selector={"match": "Company Name"}).equals(expected)
+    assert extract_table(content, selector={"id": "missing"}) is None
+
+
+def test_nested_table_is_found_inside_its_outer_table():
+    inner = "<table id='constituents'><tr><th>Symbol</th></tr><tr><td>AAA</td></tr></table>"
+    content = f"<html><body><table><tr><td>{inner}</td></tr></table></body></html>".encode()
+    assert extract_table(content, selector={"id": "constituents"})["Symbol"].tolist() == ["AAA"]
+
+
+def test_index_symbols_from_local_pages():
+    index_symbols = GetIndexSymbols(session=FixtureSession(content=synthetic_page(tables=4, rows=3, target=2), latency=0))
+    assert index_symbols.df["symbol"].tolist() == ["S000", "S001", "S002"]
+    assert index_symbols.df[["dowjones", "nasdaq100", "sp500"]].all(axis=None)
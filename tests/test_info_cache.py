@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+
+from stock_downloader.data.info_cache import TickerInfoCache
+from stock_downloader.data.yfinance_batch import YahooFinanceBatchDownloader
+
+FIELD_GROUPS = {"profile": {"fields": ["sector"]}, "quote": {"fields": ["currentPrice"]}}
+
+
+class CountingFetch:
+    def __init__(self) -> None:
+        self.symbols = []
+
+    def __call__(self, symbol: str) -> list:
+        self.symbols.append(symbol)
+        return [{"sector": f"{symbol} sector", "currentPrice": 1.0}]
+
+
+def test_second_download_is_served_from_the_cache(tmp_path):
+    cache = TickerInfoCache(path=tmp_path / "cache", ttl_days={"profile": 30, "quote": 1}, field_groups=FIELD_GROUPS)
+    fetch = CountingFetch()
+    first = YahooFinanceBatchDownloader(symbols=["AAA", "BBB"], path=tmp_path, fetch=fetch, cache=cache, retry_time=0)
+    second = YahooFinanceBatchDownloader(symbols=["AAA", "BBB"], path=tmp_path, fetch=fetch, cache=cache, retry_time=0)
+
+    assert fetch.symbols == ["AAA", "BBB"]
+    assert (second.cache_hits, second.cache_misses) == (2, 0)
+    assert second.data.equals(first.data)
+
+
+def test_stale_groups_follow_each_group_ttl(tmp_path):
+    cache = TickerInfoCache(path=tmp_path, ttl_days={"profile": 30, "quote": 1}, field_groups=FIELD_GROUPS)
+    fetched_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    entry = {"fetched_at": fetched_at.isoformat(), "records": [{"sector": "x", "currentPrice": 1.0, "unlisted": 0}]}
+
+    assert cache.stale_groups(entry, now=fetched_at + timedelta(hours=6)) == []
+    assert cache.stale_groups(entry, now=fetched_at + timedelta(days=0.75)) == ["other"]
+    assert cache.stale_groups(entry, now=fetched_at + timedelta(days=2)) == ["other", "quote"]
+    assert cache.stale_groups(entry, now=fetched_at + timedelta(days=31)) == ["other", "profile", "quote"]
+
+
+def test_empty_records_are_refetched(tmp_path):
+    cache = TickerInfoCache(path=tmp_path, ttl_days={}, field_groups=FIELD_GROUPS)
+    cache.put("AAA", [])
+    cache.put("BBB", [{"sector": "x"}])
+
+    assert cache.get("AAA") is None
+    assert cache.get("bbb") == [{"sector": "x"}]
@@ -0,0 +1,45 @@
+from duckdb import connect
+from pandas import DataFrame
+
+from stock_downloader.data.info_tables import split_info
+from stock_downloader.database.lake import write_to_store
+
+CONFIG = {"database": {"split_info": True, "write_mode": "upsert"}}
+
+
+def _info(officers: dict, summaries: dict) -> DataFrame:
+    return DataFrame(
+        {
+            "symbol": list(officers),
+            "sector": "Technology",
+            "market_cap": 1.0,
+            "company_officers": [[{"name": name, "totalPay": 1} for name in names] for names in officers.values()],
+            "long_business_summary": [summaries.get(symbol) for symbol in officers],
+        }
+    )
+
+
+def test_split_info_parts():
+    parts = {table: df for table, _, df in split_info(_info({"AAA": ["Ann", "Bob"], "BBB": []}, {"AAA": "Makes things"}), "equity_info")}
+
+    assert list(parts) == ["equity_info", "equity_info__company_officers", "equity_info__text", "equity_info__core"]
+    assert list(parts["equity_info"].columns) == ["symbol", "sector", "market_cap"]
+    assert str(parts["equity_info"]["sector"].dtype) == "category"
+    assert parts["equity_info__company_officers"].values.tolist() == [["AAA", 0, "Ann", 1], ["AAA", 1, "Bob", 1]]
+    assert list(parts["equity_info__company_officers"].columns) == ["symbol", "position", "name", "total_pay"]
+    assert parts["equity_info__text"]["symbol"].tolist() == ["AAA"]
+
+
+def test_child_and_text_rows_that_disappear_are_deleted(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    write_to_store(
+        db=db, tables=[("equity_info", None, _info({"AAA": ["Ann", "Bob"], "BBB": ["Cy"]}, {"AAA": "Makes things"}))], config=CONFIG
+    )
+    write_to_store(db=db, tables=[("equity_info", None, _info({"AAA": ["Ann"], "BBB": []}, {}))], config=CONFIG)
+
+    assert db.execute("SELECT symbol, position, name FROM equity_info__company_officers").fetchall() == [("AAA", 0, "Ann")]
+    assert db.execute("SELECT count(*) FROM equity_info__text").fetchall() == [(0,)]
+    assert db.execute("SELECT symbol FROM equity_info__core ORDER BY symbol").fetchall() == [("AAA",), ("BBB",)]
+
+    write_to_store(db=db, tables=[("equity_info", None, _info({"AAA": [], "BBB": []}, {}))], config=CONFIG)
+    assert db.execute("SELECT count(*) FROM equity_info__company_officers").fetchall() == [(0,)]
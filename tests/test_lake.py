@@ -0,0 +1,50 @@
+from duckdb import connect
+from pandas import DataFrame, date_range
+
+from stock_downloader.database.lake import ParquetLake
+
+
+def _price(symbols: list, start: str, days: int, close: float = 1.0) -> DataFrame:
+    dates = date_range(start, periods=days)
+    return DataFrame([{"symbol": symbol, "date": date, "close": close} for symbol in symbols for date in dates])
+
+
+def _files(lake: ParquetLake, table: str) -> set:
+    return {file.relative_to(lake.table_path(table)).as_posix() for file in lake.table_path(table).glob("**/*.parquet")}
+
+
+def test_incremental_write_replaces_only_touched_partitions(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    lake = ParquetLake(tmp_path / "lake", buckets=4)
+    lake.write_tables(db=db, tables=[("price", None, _price(["AAA", "BBB"], "2023-12-30", days=3))])
+    before = _files(lake, "price")
+
+    lake.write_tables(db=db, tables=[("price", None, _price(["AAA"], "2024-01-01", days=2, close=2.0))])
+
+    bucket = db.execute("SELECT symbol_bucket('AAA')").fetchall()[0][0]
+    touched = f"bucket={bucket}/year=2024/"
+    after = _files(lake, "price")
+    assert {file for file in before if not file.startswith(touched)} <= after
+    assert not any(file in after for file in before if file.startswith(touched))
+    assert db.execute("SELECT symbol, date::DATE::VARCHAR, close FROM price ORDER BY ALL").fetchall() == [
+        ("AAA", "2023-12-30", 1.0),
+        ("AAA", "2023-12-31", 1.0),
+        ("AAA", "2024-01-01", 2.0),
+        ("AAA", "2024-01-02", 2.0),
+        ("BBB", "2023-12-30", 1.0),
+        ("BBB", "2023-12-31", 1.0),
+        ("BBB", "2024-01-01", 1.0),
+    ]
+
+
+def test_views_hide_partition_columns_and_snapshots_are_rewritten(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    lake = ParquetLake(tmp_path / "lake", buckets=4)
+    lake.write_tables(db=db, tables=[("price", None, _price(["AAA"], "2024-01-01", days=2))])
+    lake.write_tables(db=db, tables=[("nasdaq_symbols", None, DataFrame({"symbol": ["AAA", "BBB"], "name": ["A", "B"]}))])
+    lake.write_tables(db=db, tables=[("nasdaq_symbols", None, DataFrame({"symbol": ["CCC"], "name": ["C"]}))])
+
+    assert [row[0] for row in db.execute("DESCRIBE price").fetchall()] == ["symbol", "date", "close"]
+    assert [row[0] for row in db.execute("DESCRIBE price__partitioned").fetchall()] == ["symbol", "date", "close", "bucket", "year"]
+    assert db.execute("SELECT count(*) FROM price__partitioned WHERE bucket = symbol_bucket('AAA') AND year = 2024").fetchall() == [(2,)]
+    assert db.execute("SELECT symbol FROM nasdaq_symbols").fetchall() == [("CCC",)]
@@ -0,0 +1,36 @@
+from duckdb import connect
+from pandas import DataFrame, Timestamp
+
+from stock_downloader.database.latest import LATEST_TABLE, refresh_latest_features
+
+
+def _source(db, table: str, column: str, values: dict) -> None:
+    df = DataFrame([{"symbol": symbol, "date": Timestamp(date), column: value} for symbol, rows in values.items() for date, value in rows])
+    db.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM df")
+
+
+def test_refresh_two_sources_with_new_columns(tmp_path):
+    """Two sources that each add columns to a populated latest_features are refreshed in one call."""
+    db = connect(str(tmp_path / "stocks.db"))
+    _source(db, "price", "close", {"AAA": [("2024-01-01", 1.0), ("2024-01-02", 2.0)], "BBB": [("2024-01-01", 5.0)]})
+    refresh_latest_features(db=db, tables=[("price", "price", None)])
+    _source(db, "ta__ma_ratio", "ratio", {"AAA": [("2024-01-02", 0.5)], "BBB": [("2024-01-01", 0.7)]})
+    _source(db, "regression_indicators", "position", {"AAA": [("2024-01-01", 0.1), ("2024-01-02", 0.2)]})
+
+    refresh_latest_features(
+        db=db, tables=[("ta__ma_ratio", "ta__ma_ratio", None), ("regression_indicators", "regression_indicators", None)]
+    )
+
+    rows = db.execute(f"SELECT symbol, close, ratio, position, regression_indicators_date FROM {LATEST_TABLE} ORDER BY symbol").fetchall()
+    assert rows == [("AAA", 2.0, 0.5, 0.2, Timestamp("2024-01-02").to_pydatetime()), ("BBB", 5.0, 0.7, None, None)]
+
+
+def test_refresh_only_written_symbols(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    _source(db, "price", "close", {"AAA": [("2024-01-01", 1.0)], "BBB": [("2024-01-01", 5.0)]})
+    refresh_latest_features(db=db, tables=[("price", "price", None)])
+    _source(db, "price", "close", {"AAA": [("2024-01-02", 3.0)], "BBB": [("2024-01-02", 6.0)]})
+
+    refresh_latest_features(db=db, tables=[("price", "price", DataFrame({"symbol": ["AAA"]}))])
+
+    assert db.execute(f"SELECT symbol, close FROM {LATEST_TABLE} ORDER BY symbol").fetchall() == [("AAA", 3.0), ("BBB", 5.0)]
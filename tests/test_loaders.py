@@ -0,0 +1,30 @@
+import os
+import pickle
+
+from stock_downloader.data.loaders import FrozenDict, load_config, load_mappings, load_toml
+
+
+def test_files_are_parsed_once_until_modified(tmp_path):
+    path = tmp_path / "settings.toml"
+    path.write_text('[run]\nsymbols = ["AAA"]\n')
+    first = load_toml(path)
+    assert load_toml(path) is first
+
+    path.write_text('[run]\nsymbols = ["AAA", "BBB"]\n')
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+    assert load_toml(path)["run"]["symbols"] == ("AAA", "BBB")
+
+
+def test_loaded_config_is_read_only_and_picklable():
+    config = load_config()
+    assert load_config() is config and isinstance(config, dict)
+    for mutate in (lambda: config.update(a=1), lambda: config.__setitem__("a", 1), lambda: config.pop("run", None)):
+        try:
+            mutate()
+        except TypeError:
+            continue
+        raise AssertionError("the loaded config was modified")
+
+    restored = pickle.loads(pickle.dumps(load_mappings(name="columns")))
+    assert isinstance(restored, FrozenDict) and restored == load_mappings(name="columns")
+    assert hash(FrozenDict({"a": (1, 2)})) == hash(FrozenDict({"a": (1, 2)}))
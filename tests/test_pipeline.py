@@ -0,0 +1,96 @@
+from pandas import DataFrame, concat
+from pandas.testing import assert_frame_equal
+
+from stock_downloader.data.providers import LocalReplayProvider
+from stock_downloader.data.yfinance_batch import YahooFinanceBatchDownloader
+from stock_downloader.pipeline import FeatureBatches, combine_symbol_features, compute_symbol_features, run_feature_pipeline
+from stock_downloader.schemas.dtype_plans import dtype_plan
+from stock_downloader.technical_analysis.regression import run_all_regression
+from stock_downloader.technical_analysis.talib import run_all_custom_ta, run_all_talib
+from stock_downloader.technical_analysis.ta_definitions import (
+    talib_functions,
+    pattern_columns,
+    custom_ta_sets__ma_ratio,
+    custom_ta_sets__change_ratio,
+    custom_ta_sets__future,
+    custom_ta_sets__regression_channel,
+    custom_ta_sets__regression_channel_ma,
+)
+
+SYMBOLS = ["AAA", "BBB"]
+REGRESSION_CONFIG = {"max_regression_days": 730, "min_regression_days": 10, "date_column": "Date", "price_column": "Close"}
+
+
+def synthetic_price(days: int = 300) -> DataFrame:
+    provider = LocalReplayProvider(synthetic=True)
+    provider.SYNTHETIC_DAYS = days
+    records = [{"symbol": symbol, **record} for symbol in SYMBOLS for record in provider.price_history(symbol)]
+    return YahooFinanceBatchDownloader.records_to_frame(records, dtypes=dtype_plan("price"))
+
+
+def sequential_features(price_df: DataFrame) -> dict:
+    """The feature tables as main computes them without the pipeline."""
+    regression_df = run_all_regression(price_df=price_df, regression_config=REGRESSION_CONFIG)
+    talib_df = run_all_talib(data_df=price_df, functions=talib_functions, pattern_columns=pattern_columns, dtypes=dtype_plan("ta__talib"))
+    regression_indicators_df = run_all_custom_ta(
+        data_df=price_df.merge(regression_df.rename(columns={"date": "Date"}), on=["symbol", "Date"], how="inner"),
+        functions=custom_ta_sets__regression_channel,
+        dtypes=dtype_plan("regression_indicators"),
+    )
+    return {
+        "regression": regression_df,
+        "talib": talib_df,
+        "ta__ma_ratio": run_all_custom_ta(
+            data_df=price_df.merge(talib_df.rename(columns={"date": "Date"}), on=["symbol", "Date"], how="inner"),
+            functions=custom_ta_sets__ma_ratio,
+            dtypes=dtype_plan("ta__ma_ratio"),
+        ),
+        "ta__change": run_all_custom_ta(data_df=price_df, functions=custom_ta_sets__change_ratio, dtypes=dtype_plan("ta__change")),
+        "ma_future": run_all_custom_ta(data_df=price_df, functions=custom_ta_sets__future, dtypes=dtype_plan("ma_future")),
+        "regression_indicators": regression_indicators_df,
+        "regression_indicators_ma": run_all_custom_ta(
+            data_df=regression_indicators_df, functions=custom_ta_sets__regression_channel_ma, dtypes=dtype_plan("regression_indicators_ma")
+        ),
+    }
+
+
+def test_pipelined_features_match_sequential():
+    price_df = synthetic_price()
+    expected = sequential_features(price_df)
+    pipelined = combine_symbol_features(
+        {
+            symbol: compute_symbol_features(
+                symbol=symbol, price_df=price_df[price_df["symbol"] == symbol], regression_config=REGRESSION_CONFIG
+            )
+            for symbol in SYMBOLS
+        }
+    )
+    assert sorted(pipelined) == sorted(expected)
+    for table, df in expected.items():
+        assert_frame_equal(pipelined[table].reset_index(drop=True), df.reset_index(drop=True), check_exact=True)
+
+
+def lazy_price_downloader(path, days: int = 300) -> YahooFinanceBatchDownloader:
+    provider = LocalReplayProvider(synthetic=True)
+    provider.SYNTHETIC_DAYS = days
+    return YahooFinanceBatchDownloader(
+        symbols=SYMBOLS + ["CCC"], path=path, fetch=provider.price_history, lazy=True, dtypes=dtype_plan("price")
+    )
+
+
+def test_pipeline_writes_batches_as_symbols_finish(tmp_path):
+    expected = run_feature_pipeline(downloader=lazy_price_downloader(tmp_path), regression_config=REGRESSION_CONFIG, workers=2)
+    batches = []
+    feature_batches = FeatureBatches(write=batches.append, batch_size=2)
+
+    returned = run_feature_pipeline(
+        downloader=lazy_price_downloader(tmp_path), regression_config=REGRESSION_CONFIG, workers=2, on_result=feature_batches
+    )
+    assert len(batches) == 1
+    feature_batches.flush()
+
+    assert returned == {}
+    assert sorted(len(batch["talib"]["symbol"].unique()) for batch in batches) == [1, 2]
+    for table, df in expected.items():
+        streamed = concat([batch[table] for batch in batches]).sort_values("symbol", kind="stable")
+        assert_frame_equal(streamed.reset_index(drop=True), df.reset_index(drop=True), check_exact=True)
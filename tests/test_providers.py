@@ -0,0 +1,51 @@
+from stock_downloader.data.info_cache import load_info_cache
+from stock_downloader.data.providers import (
+    InjectedProviderError,
+    LocalReplayProvider,
+    MarketDataProvider,
+    load_provider,
+    provider_name,
+    record_fixtures,
+)
+
+
+def test_recorded_fixtures_replay_the_provider(tmp_path):
+    synthetic = LocalReplayProvider(synthetic=True)
+    synthetic.SYNTHETIC_DAYS = 30
+    record_fixtures(["AAA"], path=tmp_path, provider=synthetic)
+    replay = load_provider({"provider": {"name": "replay", "replay_folder": str(tmp_path)}})
+
+    assert isinstance(replay, MarketDataProvider)
+    assert replay.price_history("aaa") == synthetic.price_history("AAA")
+    assert replay.ticker_info("AAA") == synthetic.ticker_info("AAA")
+    assert replay.price_history("MISSING") == [] and replay.ticker_info("MISSING") == []
+
+
+def test_injected_errors_are_reproducible():
+    def failures(seed: int) -> list:
+        provider = LocalReplayProvider(synthetic=True, error_rate=0.5, seed=seed)
+        provider.SYNTHETIC_DAYS = 5
+        outcomes = []
+        for _ in range(20):
+            try:
+                provider.ticker_info("AAA")
+                outcomes.append(False)
+            except InjectedProviderError:
+                outcomes.append(True)
+        return outcomes
+
+    assert failures(seed=1) == failures(seed=1)
+    assert 0 < sum(failures(seed=1)) < 20
+
+
+def test_each_provider_has_its_own_info_cache(tmp_path):
+    def config(**provider) -> dict:
+        return {"provider": provider, "info_cache": {"enabled": True, "cache_folder": str(tmp_path)}}
+
+    assert provider_name(config()) == "yfinance"
+    assert provider_name(config(name="replay", synthetic=True)) == "replay_synthetic"
+    load_info_cache(config(name="replay", synthetic=True)).put("AAA", [{"sector": "Synthetic"}])
+
+    assert load_info_cache(config(name="replay", synthetic=True)).get("AAA") == [{"sector": "Synthetic"}]
+    assert load_info_cache(config()).get("AAA") is None
+    assert load_info_cache({"provider": {}}) is None
@@ -0,0 +1,40 @@
+from pandas import DataFrame
+
+from stock_downloader.data.select_symbols import sample_symbols, select_symbols
+
+NASDAQ = DataFrame({"symbol": ["AAA", "BBB", "QQQ"], "etf": ["N", "N", "Y"]})
+OTHER = DataFrame({"symbol": ["CCC", "XLK", "SPY"], "etf": ["N", "Y", "Y"]})
+INDEX_SYMBOLS = DataFrame(
+    {"symbol": ["AAA", "BBB", "CCC"], "sp500": [True, False, False], "dowjones": [False, True, False], "nasdaq100": [True, False, True]}
+)
+
+
+def _select(**flags):
+    return select_symbols(
+        nasdaq_df=NASDAQ,
+        other_df=OTHER,
+        sector_etfs={"technology": "XLK"},
+        market_etfs={"sp500": "SPY"},
+        technical_etfs={},
+        indicies={"vix": "^VIX"},
+        index_symbols_df=INDEX_SYMBOLS,
+        **flags,
+    )
+
+
+def test_flags_select_equities_and_etfs():
+    assert _select().equity == [] and _select().etf == []
+    assert _select(get_sp500=True, get_dowjones=True).equity == ["AAA", "BBB"]
+    assert _select(get_nasdaq100=True).equity == ["AAA", "CCC"]
+    assert _select(get_sector_etfs=True, get_indicies=True).etf == ["XLK", "^VIX"]
+    assert _select(get_etfs=True).etf == ["QQQ", "SPY", "XLK"]
+    # Equity flags never add to the ETF list
+    assert _select(get_market_etfs=True, get_sp500=True).etf == ["SPY"]
+
+
+def test_samples_are_reproducible():
+    symbols = [f"S{i:02d}" for i in range(20)]
+    assert sample_symbols(symbols, sample=5, seed=1) == sample_symbols(symbols, sample=5, seed=1)
+    assert len(sample_symbols(symbols, sample=0.25, seed=1)) == 5
+    assert sample_symbols(symbols, sample=50, seed=1) == symbols
+    assert sample_symbols(symbols) is symbols
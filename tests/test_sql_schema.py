@@ -0,0 +1,56 @@
+import warnings
+
+from duckdb import ConstraintException, connect
+from pandas import DataFrame, date_range
+from pandera.errors import SchemaError, SchemaWarning
+
+from stock_downloader.database.db import write_table
+from stock_downloader.database.sql_schema import SQL_VALIDATION_MODES
+
+
+def _price(close: float = 1.0, symbol: str = "AAA") -> DataFrame:
+    prices = {"open": 1.0, "high": 1.0, "low": 1.0, "close": close, "volume": 10, "dividends": 0.0, "stock_splits": 0.0}
+    return DataFrame({"symbol": symbol, "date": date_range("2024-01-01", periods=3), **prices})
+
+
+def _fails(db, df: DataFrame, validation: str, mode: str = "replace") -> bool:
+    """Whether the write was rejected: by the validation query, or by DuckDB's constraints on a table created here."""
+    try:
+        write_table(db=db, df=df, table="price", schema="price", validation=validation, mode=mode)
+    except (SchemaError, ConstraintException):
+        return True
+    return False
+
+
+def test_failed_checks_write_nothing(tmp_path):
+    for validation in SQL_VALIDATION_MODES:
+        db = connect(str(tmp_path / f"{validation}.db"))
+        write_table(db=db, df=_price(), table="price", schema="price", validation=validation)
+
+        assert _fails(db, _price(close=-1.0), validation=validation)
+        assert _fails(db, _price().assign(open=None), validation=validation, mode="upsert")
+        assert db.execute("SELECT DISTINCT close FROM price").fetchall() == [(1.0,)]
+
+
+def test_columns_are_typed_and_warning_checks_only_warn(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        write_table(db=db, df=_price(symbol="TOOLONG").astype({"volume": "float64"}), table="price", schema="price", validation="query")
+
+    assert [warning.category for warning in caught] == [SchemaWarning]
+    types = dict(db.execute("SELECT column_name, data_type FROM duckdb_columns() WHERE table_name = 'price'").fetchall())
+    assert (types["volume"], types["date"], types["symbol"]) == ("BIGINT", "TIMESTAMP", "VARCHAR")
+
+
+def test_constraints_keep_guarding_later_inserts(tmp_path):
+    db = connect(str(tmp_path / "stocks.db"))
+    write_table(db=db, df=_price(), table="price", schema="price", validation="constraints")
+    try:
+        db.execute(
+            "INSERT INTO price (symbol, date, open, high, low, close, volume, dividends) VALUES ('BBB', '2024-01-01', 1, 1, 1, -1, 1, 0)"
+        )
+    except ConstraintException as e:
+        assert "CHECK" in str(e)
+    else:
+        raise AssertionError("the CHECK constraint did not reject a negative close")
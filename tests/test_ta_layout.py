@@ -0,0 +1,36 @@
+from pandas import DataFrame
+
+from stock_downloader.data.providers import LocalReplayProvider
+from stock_downloader.data.yfinance_batch import YahooFinanceBatchDownloader
+from stock_downloader.schemas.dtype_plans import SCHEMAS, dtype_plan
+from stock_downloader.schemas.ta_layout import TA_TABLES, load_column_mappings, ta_columns
+from stock_downloader.technical_analysis.ta_definitions import pattern_columns, talib_functions
+from stock_downloader.technical_analysis.talib import run_all_talib
+
+
+def synthetic_price(days: int = 300) -> DataFrame:
+    provider = LocalReplayProvider(synthetic=True)
+    provider.SYNTHETIC_DAYS = days
+    records = [{"symbol": "AAA", **record} for record in provider.price_history("AAA")]
+    return YahooFinanceBatchDownloader.records_to_frame(records, dtypes=dtype_plan("price"))
+
+
+def test_talib_output_matches_the_generated_schema():
+    talib_df = run_all_talib(data_df=synthetic_price(), functions=talib_functions, pattern_columns=pattern_columns)
+    outputs = [col for col in talib_df.columns if col not in ("Date", "symbol")]
+    columns = ta_columns("ta__talib")
+
+    assert outputs and set(outputs) <= set(columns)
+    # Columns typed as integers (candlestick patterns, HT_TRENDMODE) only hold whole numbers
+    assert all(talib_df[col].dropna().mod(1).eq(0).all() for col in outputs if columns[col].startswith("Int"))
+
+    mapped = talib_df.rename(columns=load_column_mappings()["ta__talib"])
+    validated = SCHEMAS["ta__talib"].validate(mapped)
+    assert list(validated.columns[: len(columns) + 2]) == ["date", "symbol", *columns]
+
+
+def test_every_generated_table_has_schema_and_mappings():
+    mappings = load_column_mappings()
+    for table in TA_TABLES:
+        assert list(SCHEMAS[table].columns) == ["date", "symbol", *ta_columns(table)]
+        assert set(mappings[table].values()) == set(SCHEMAS[table].columns)
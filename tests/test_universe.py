@@ -0,0 +1,90 @@
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+from stock_downloader.data.providers import LocalReplayProvider
+from stock_downloader.data.universe import IncrementalPriceFetch, UniverseDiff, UniverseSnapshotStore, download_price_history
+from stock_downloader.data.yfinance_batch import YahooFinanceBatchDownloader
+from stock_downloader.schemas.dtype_plans import dtype_plan
+
+DIFF = UniverseDiff(version=2, added=["CCC"], removed=["OLD"], unchanged=["AAA", "BBB"])
+
+
+class RecordingFetch:
+    """Synthetic price history, or its last `window` rows, recording the symbols fetched."""
+
+    def __init__(self, window: int = None) -> None:
+        self.provider = LocalReplayProvider(synthetic=True)
+        self.provider.SYNTHETIC_DAYS = 120
+        self.window = window
+        self.symbols = []
+
+    def __call__(self, symbol: str) -> list:
+        self.symbols.append(symbol)
+        records = self.provider.price_history(symbol)
+        return records[-self.window :] if self.window else records
+
+
+def stored_price() -> DataFrame:
+    """Stored history missing the last 5 days of AAA, and the last 40 days of BBB, more than the 20 day window."""
+    fetch = RecordingFetch()
+    records = [{"symbol": symbol, **record} for symbol, drop in [("AAA", 5), ("BBB", 40)] for record in fetch(symbol)[:-drop]]
+    return YahooFinanceBatchDownloader.records_to_frame(records, dtypes=dtype_plan("price"))
+
+
+def full_price(symbols: list) -> DataFrame:
+    fetch = RecordingFetch()
+    records = [{"symbol": symbol, **record} for symbol in symbols for record in fetch(symbol)]
+    return YahooFinanceBatchDownloader.records_to_frame(records, dtypes=dtype_plan("price"))
+
+
+def test_download_merges_the_window_of_unchanged_symbols(tmp_path):
+    full, incremental = RecordingFetch(), RecordingFetch(window=20)
+    price = download_price_history(
+        symbols=["AAA", "BBB", "CCC"],
+        path=tmp_path,
+        full_fetch=full,
+        incremental_fetch=incremental,
+        diff=DIFF,
+        previous_price=stored_price(),
+        retry_time=0,
+    )
+    assert incremental.symbols == ["AAA", "BBB"]
+    # BBB's window leaves a gap after its stored history, so it is downloaded in full
+    assert sorted(full.symbols) == ["BBB", "CCC"]
+    assert_frame_equal(price, full_price(["AAA", "BBB", "CCC"]), check_exact=True)
+
+
+def test_streaming_fetch_matches_download(tmp_path):
+    expected = download_price_history(
+        symbols=["AAA", "BBB", "CCC"],
+        path=tmp_path,
+        full_fetch=RecordingFetch(),
+        incremental_fetch=RecordingFetch(window=20),
+        diff=DIFF,
+        previous_price=stored_price(),
+        retry_time=0,
+    )
+    fetch = IncrementalPriceFetch(
+        full_fetch=RecordingFetch(), incremental_fetch=RecordingFetch(window=20), diff=DIFF, previous_price=stored_price()
+    )
+
+    price = YahooFinanceBatchDownloader(
+        symbols=["AAA", "BBB", "CCC"], path=tmp_path, fetch=fetch, retry_time=0, dtypes=dtype_plan("price")
+    ).data
+
+    assert fetch.incremental_symbols == ["AAA"]
+    assert fetch.full_symbols == ["BBB", "CCC"]
+    assert_frame_equal(price.sort_values(["symbol", "Date"]).reset_index(drop=True), expected, check_exact=True)
+
+
+def test_snapshot_diff(tmp_path):
+    store = UniverseSnapshotStore(path=tmp_path)
+    memberships = DataFrame({"symbol": ["AAA", "BBB"], "sp500": [True, False], "dowjones": [False, False], "nasdaq100": [False, False]})
+    first = store.save(memberships.assign(asset_type="equity"), index_symbols_df=memberships)
+    second = store.save(
+        DataFrame({"symbol": ["BBB", "CCC"], "asset_type": "equity", "sp500": False, "dowjones": False, "nasdaq100": False}),
+        index_symbols_df=memberships.assign(sp500=False),
+    )
+    assert first.is_initial and first.added == ["AAA", "BBB"]
+    assert (second.version, second.added, second.removed, second.unchanged) == (2, ["CCC"], ["AAA"], ["BBB"])
+    assert second.membership_changes[["symbol", "index", "member"]].values.tolist() == [["AAA", "sp500", False]]
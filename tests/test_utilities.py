@@ -0,0 +1,48 @@
+from duckdb import connect
+import numpy as np
+from pandas import DataFrame, date_range
+import pyarrow as pa
+
+from stock_downloader.database.db import write_table
+from stock_downloader.utilities import compile_column_mapping, rename_and_select_columns, to_arrow
+
+
+def test_projection_renames_selects_and_shares_columns():
+    df = DataFrame({"Date": [1, 2], "Close": [1.0, 2.0], "Extra": ["a", "b"]})
+    projected = rename_and_select_columns(df=df, mappings={"Date": "date", "Close": "close"})
+
+    assert list(projected.columns) == ["date", "close"]
+    assert np.shares_memory(projected["close"].to_numpy(), df["Close"].to_numpy())
+    projected.loc[0, "close"] = 9.0
+    assert df.loc[0, "Close"] == 1.0
+
+
+def test_projection_plan_is_cached_per_input_schema():
+    mapping = compile_column_mapping({"Date": "date", "Close": "close"})
+    df = DataFrame({"Date": [1], "Close": [1.0]})
+    assert mapping.plan(df.columns) is mapping.plan(DataFrame({"Date": [2], "Close": [3.0]}).columns)
+    assert mapping.plan(df.columns) is not mapping.plan(["Close", "Date"])
+
+
+def test_arrow_writes_match_dataframe_writes(tmp_path):
+    df = DataFrame({"symbol": ["AAA", "BBB", "AAA"], "date": date_range("2024-01-01", periods=3), "close": [1.0, 2.0, 3.0]})
+    table = to_arrow(df)
+    assert pa.types.is_dictionary(table.schema.field("symbol").type)
+    assert table.schema.field("date").type == pa.timestamp("us")
+
+    db = connect(str(tmp_path / "stocks.db"))
+    write_table(db=db, df=df, table="price", arrow=False)
+    frame_rows = db.execute("SELECT * FROM price ORDER BY ALL").fetchall()
+    # Categoricals are registered as ENUMs and stored as VARCHAR like the dictionary-encoded Arrow column
+    write_table(db=db, df=df.astype({"symbol": "category"}), table="price", arrow=True)
+
+    assert db.execute("SELECT * FROM price ORDER BY ALL").fetchall() == frame_rows
+    types = db.execute("SELECT data_type FROM duckdb_columns() WHERE table_name = 'price' ORDER BY column_index").fetchall()
+    assert types == [("VARCHAR",), ("TIMESTAMP",), ("DOUBLE",)]
+
+
+def test_arrow_conversion_failure_falls_back_to_the_frame(tmp_path):
+    df = DataFrame({"symbol": ["AAA", "BBB"], "mixed": [1, "a"]})
+    db = connect(str(tmp_path / "stocks.db"))
+    write_table(db=db, df=df, table="other_symbols", arrow=True)
+    assert db.execute("SELECT mixed FROM other_symbols ORDER BY symbol").fetchall() == [("1",), ("a",)]
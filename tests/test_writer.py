@@ -0,0 +1,45 @@
+from pandas import DataFrame, date_range
+from pandera.errors import SchemaError
+
+from stock_downloader.database.connection import DatabaseManager
+from stock_downloader.database.writer import TableWriter
+
+CONFIG = {"database": {"write_mode": "replace", "arrow": True}, "validation": {"engine": "query"}}
+
+
+def _price(close: float) -> DataFrame:
+    prices = {"open": 1.0, "high": 1.0, "low": 1.0, "close": close, "volume": 10, "dividends": 0.0, "stock_splits": 0.0}
+    return DataFrame({"symbol": "AAA", "date": date_range("2024-01-01", periods=3), **prices})
+
+
+def test_tables_are_queryable_once_their_future_resolves(tmp_path):
+    database = DatabaseManager(tmp_path / "stocks.db")
+    try:
+        with TableWriter(database=database, config=CONFIG) as writer:
+            symbols = writer.submit("nasdaq_symbols", None, DataFrame({"symbol": ["AAA", "BBB"]}))
+            assert symbols.result(timeout=30) == "nasdaq_symbols"
+            assert database.cursor().execute("SELECT count(*) FROM nasdaq_symbols").fetchall() == [(2,)]
+            writer.submit("price", "price", _price(close=1.0))
+        assert set(writer.latency) == {"nasdaq_symbols", "price"}
+        assert database.cursor().execute("SELECT count(*) FROM price").fetchall() == [(3,)]
+    finally:
+        database.close()
+
+
+def test_a_failed_table_does_not_fail_the_others(tmp_path):
+    database = DatabaseManager(tmp_path / "stocks.db")
+    try:
+        writer = TableWriter(database=database, config=CONFIG)
+        failed = writer.submit("price", "price", _price(close=-1.0))
+        written = writer.submit("other_symbols", None, DataFrame({"symbol": ["CCC"]}))
+        try:
+            writer.close()
+        except SchemaError:
+            pass
+        else:
+            raise AssertionError("close did not raise the failed table's error")
+
+        assert isinstance(failed.exception(), SchemaError) and written.result() == "other_symbols"
+        assert database.cursor().execute("SELECT symbol FROM other_symbols").fetchall() == [("CCC",)]
+    finally:
+        database.close()